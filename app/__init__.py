@@ -24,8 +24,30 @@ def create_app(config_class=Config):
 
     db.init_app(app)
     migrate.init_app(app, db)
+
+    from app.sqlite_profile import init_sqlite_profile
+    init_sqlite_profile(app)
+
+    from app.json_provider import init_json_provider
+    init_json_provider(app)
+
+    # after_request は登録の逆順に実行されるため、圧縮は他のヘッダー付与より先に登録して最後に実行させる
+    from app.compression import init_compression
+    init_compression(app)
+
+    from app.sql_timing import init_sql_timing
+    init_sql_timing(app)
     login_manager.init_app(app)
 
+    from app.commands import register_commands
+    register_commands(app)
+
+    from app.status_registry import init_status_registry
+    init_status_registry(app)
+
+    from app.permissions import clear_request_permission_cache
+    app.teardown_request(clear_request_permission_cache)
+
     # Swagger/OpenAPI用設定
     app.config['API_TITLE'] = 'Task Progress API'
     app.config['API_VERSION'] = 'v1'
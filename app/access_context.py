@@ -0,0 +1,110 @@
+# app/access_context.py
+"""
+タスク配下のリソース（タスク・オブジェクティブ・進捗）と、現在のユーザーのアクセス権を1クエリで読み込む
+
+対象の行から親タスクまでを外部結合し、同じ文でそのタスクに対するユーザー本人・所属組織への付与
+（TaskAccessUser / TaskAccessOrganization）も結合して取得する。
+「オブジェクティブ取得 → タスク取得 → 権限読み込み」を個別に発行せず、認可の確認は1往復で済む。
+
+判定は check_task_access（PermissionResolver.has_level）と同じく、作成者は OWNER、
+それ以外は付与のうち最も高いアクセスレベルとする。
+"""
+
+from dataclasses import dataclass
+from sqlalchemy import and_, select
+from .models import db, Task, Objective, ProgressUpdate, TaskAccessUser, TaskAccessOrganization
+from .constants import TaskAccessLevelEnum, TASK_ACCESS_PRIORITY
+from .service_errors import ServiceNotFoundError
+
+
+@dataclass(slots=True)
+class TaskAccessContext:
+    task: Task
+    objective: Objective | None = None
+    progress: ProgressUpdate | None = None
+    access_level: TaskAccessLevelEnum | None = None
+
+    def has_level(self, required_level):
+        """``required_level`` 以上のアクセスレベルを持つかどうか"""
+        if self.access_level is None:
+            return False
+        if not isinstance(required_level, TaskAccessLevelEnum):
+            required_level = TaskAccessLevelEnum(required_level)
+        return TASK_ACCESS_PRIORITY[self.access_level] >= TASK_ACCESS_PRIORITY[required_level]
+
+
+def load_task_context(task_id, user):
+    """削除されていないタスクとアクセス権を読み込む（見つからなければ ServiceNotFoundError）"""
+    stmt = select(Task).where(Task.id == task_id, Task.is_deleted == False)
+    rows = _execute(stmt, user)
+    if not rows:
+        raise ServiceNotFoundError('タスクが見つかりません')
+    return _build(rows, user, task_index=0)
+
+
+def load_objective_context(objective_id, user):
+    """削除されていないオブジェクティブ・親タスクとアクセス権を読み込む"""
+    stmt = (
+        select(Objective, Task)
+        .outerjoin(Task, and_(Task.id == Objective.task_id, Task.is_deleted == False))
+        .where(Objective.id == objective_id, Objective.is_deleted == False)
+    )
+    rows = _execute(stmt, user)
+    if not rows:
+        raise ServiceNotFoundError('オブジェクティブが見つかりません')
+    context = _build(rows, user, task_index=1)
+    context.objective = rows[0][0]
+    return context
+
+
+def load_progress_context(progress_id, user):
+    """削除されていない進捗・オブジェクティブ・親タスクとアクセス権を読み込む"""
+    stmt = (
+        select(ProgressUpdate, Objective, Task)
+        .outerjoin(Objective, and_(Objective.id == ProgressUpdate.objective_id, Objective.is_deleted == False))
+        .outerjoin(Task, and_(Task.id == Objective.task_id, Task.is_deleted == False))
+        .where(ProgressUpdate.id == progress_id, ProgressUpdate.is_deleted == False)
+    )
+    rows = _execute(stmt, user)
+    if not rows:
+        raise ServiceNotFoundError('進捗が見つかりません')
+    if rows[0][1] is None:
+        raise ServiceNotFoundError('オブジェクティブが見つかりません')
+    context = _build(rows, user, task_index=2)
+    context.progress, context.objective = rows[0][0], rows[0][1]
+    return context
+
+
+def _execute(stmt, user):
+    # 付与が複数行あると結合結果も複数行になる（エンティティは identity map で同一オブジェクトになる）
+    stmt = (
+        stmt.add_columns(
+            TaskAccessUser.access_level.label('user_level'),
+            TaskAccessOrganization.access_level.label('organization_level'),
+        )
+        .outerjoin(TaskAccessUser, and_(
+            TaskAccessUser.task_id == Task.id,
+            TaskAccessUser.user_id == user.id,
+        ))
+        .outerjoin(TaskAccessOrganization, and_(
+            TaskAccessOrganization.task_id == Task.id,
+            TaskAccessOrganization.organization_id == user.organization_id,
+        ))
+    )
+    return db.session.execute(stmt).all()
+
+
+def _build(rows, user, task_index):
+    task = rows[0][task_index]
+    if task is None:
+        raise ServiceNotFoundError('タスクが見つかりません')
+
+    if task.created_by == user.id:
+        level = TaskAccessLevelEnum.OWNER
+    else:
+        level = None
+        for row in rows:
+            for granted in (row.user_level, row.organization_level):
+                if granted is not None and (level is None or TASK_ACCESS_PRIORITY[granted] > TASK_ACCESS_PRIORITY[level]):
+                    level = granted
+    return TaskAccessContext(task=task, access_level=level)
@@ -0,0 +1,101 @@
+# app/commands.py
+import click
+from flask.cli import with_appcontext
+
+
+@click.command("rebuild-org-closure")
+@with_appcontext
+def rebuild_org_closure_command():
+    """組織閉包テーブルを organization.parent_id から再構築する"""
+    from app.services import organization_service
+
+    count = organization_service.rebuild_organization_closure()
+    click.echo(f"organization_closure を再構築しました（{count} 行）")
+
+
+@click.command("sqlite-maintenance")
+@click.option("--checkpoint-mode", default="TRUNCATE",
+              type=click.Choice(["PASSIVE", "FULL", "RESTART", "TRUNCATE"], case_sensitive=False),
+              help="wal_checkpoint のモード")
+@with_appcontext
+def sqlite_maintenance_command(checkpoint_mode):
+    """SQLite の WAL チェックポイントと PRAGMA optimize を実行する（cron 等で定期実行）"""
+    from app.extensions import db
+    from app.sqlite_profile import run_sqlite_maintenance
+
+    if db.engine.dialect.name != "sqlite":
+        click.echo("SQLite 以外のデータベースでは何もしません")
+        return
+    result = run_sqlite_maintenance(checkpoint_mode.upper())
+    click.echo(
+        f"wal_checkpoint({checkpoint_mode.upper()}): busy={result['busy']} "
+        f"log={result['log_frames']} checkpointed={result['checkpointed_frames']}"
+    )
+
+
+@click.command("seed-scale")
+@click.option("--companies", default=1, show_default=True, help="会社数")
+@click.option("--org-depth", default=3, show_default=True, help="組織ツリーの深さ")
+@click.option("--org-fanout", default=3, show_default=True, help="組織ごとの子組織数")
+@click.option("--users-per-org", default=5, show_default=True, help="組織ごとのユーザー数")
+@click.option("--tasks-per-user", default=5, show_default=True, help="ユーザーごとのタスク数")
+@click.option("--objectives-per-task", default=3, show_default=True, help="タスクごとのオブジェクティブ数")
+@click.option("--progress-per-objective", default=3, show_default=True, help="オブジェクティブごとの進捗数")
+@click.option("--acl-density", default=0.2, show_default=True, type=click.FloatRange(0, 1),
+              help="タスクが他ユーザー／他組織に共有される確率")
+@click.option("--seed", default=42, show_default=True, help="乱数シード（同じ値なら同じデータ）")
+@click.option("--password", default="password", show_default=True, help="生成ユーザー共通のパスワード")
+@with_appcontext
+def seed_scale_command(**kwargs):
+    """性能検証用の大規模な合成データを一括挿入する"""
+    from app.seed_scale import SeedScaleOptions, seed_scale_dataset
+
+    result = seed_scale_dataset(SeedScaleOptions(**kwargs))
+    for table, count in result["counts"].items():
+        click.echo(f"{table}: {count}")
+    click.echo(f"合計 {sum(result['counts'].values())} 行を {result['seconds']:.1f} 秒で挿入しました")
+
+
+@click.command("backfill-latest-progress")
+@with_appcontext
+def backfill_latest_progress_command():
+    """全オブジェクティブの最新進捗ポインタ（latest_progress_id / latest_report_date）を再計算する"""
+    from app.extensions import db
+    from app.services import progress_updates_service
+
+    count = progress_updates_service.refresh_latest_progress()
+    db.session.commit()
+    click.echo(f"objective の最新進捗を再計算しました（{count} 件）")
+
+
+@click.command("rebalance-task-ranks")
+@click.option("--min-length", type=int, default=None,
+              help="この文字数を超えるランクを持つユーザーを再採番する（既定は TASK_RANK_REBALANCE_LENGTH）")
+@with_appcontext
+def rebalance_task_ranks_command(min_length):
+    """タスク表示順のランクが長くなったユーザーの並び順を等間隔のランクに振り直す"""
+    from app.services import task_order_service
+
+    count = task_order_service.rebalance_long_ranks(min_length)
+    click.echo(f"{count} ユーザーのタスク表示順を再採番しました")
+
+
+@click.command("cleanup-exports")
+@click.option("--max-age", type=int, default=None,
+              help="この秒数より古いファイルを削除する（既定は EXPORT_RETENTION_SECONDS）")
+@with_appcontext
+def cleanup_exports_command(max_age):
+    """保持期間を過ぎた非同期エクスポートのジョブ・成果物を削除する（cron 等で定期実行）"""
+    from app.services import export_job_service
+
+    count = export_job_service.cleanup_expired_exports(max_age)
+    click.echo(f"期限切れのエクスポートファイルを削除しました（{count} 件）")
+
+
+def register_commands(app):
+    app.cli.add_command(rebuild_org_closure_command)
+    app.cli.add_command(sqlite_maintenance_command)
+    app.cli.add_command(seed_scale_command)
+    app.cli.add_command(backfill_latest_progress_command)
+    app.cli.add_command(rebalance_task_ranks_command)
+    app.cli.add_command(cleanup_exports_command)
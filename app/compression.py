@@ -0,0 +1,191 @@
+# app/compression.py
+"""
+レスポンス圧縮（Accept-Encoding によるコンテントネゴシエーション）
+
+JSON・YAML・NDJSON 等のテキスト系レスポンスを gzip で圧縮する。brotli / zstandard パッケージが
+インストールされていれば br / zstd も使う（いずれも任意の依存。requirements には含めない）。
+
+- COMPRESSION_MIN_SIZE 未満の本文は圧縮しない（ストリーミングは長さが分からないため常に圧縮する）
+- ストリーミング（チャンク転送・send_file）は本文をバッファせず、チャンクごとに逐次圧縮する
+  （COMPRESSION_STREAM_FLUSH_BYTES ごとにフラッシュし、受信側が途中まで展開できるようにする）
+- Accept-Encoding で表現が変わるレスポンスの ETag は、実際に圧縮したかどうか（本文サイズ・Accept-Encoding）に
+  よらず常に弱い ETag にする（200 と 304 で強弱が入れ替わらないようにする。If-None-Match は弱い比較で判定する）
+"""
+
+import zlib
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # brotli は任意の依存
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard は任意の依存
+    zstandard = None
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/x-yaml",
+    "application/yaml",
+    "application/xml",
+    "application/javascript",
+}
+
+
+class GzipEncoder:
+    name = "gzip"
+
+    def __init__(self, level):
+        # wbits=31: gzip ヘッダー付きの deflate
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliEncoder:
+    name = "br"
+
+    def __init__(self, level):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class ZstdEncoder:
+    name = "zstd"
+
+    def __init__(self, level):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+def available_encoders():
+    """このプロセスで使える Content-Encoding 名と (エンコーダ, 圧縮レベルの設定キー, 既定レベル) の対応"""
+    encoders = {"gzip": (GzipEncoder, "COMPRESSION_GZIP_LEVEL", 6)}
+    if brotli is not None:
+        encoders["br"] = (BrotliEncoder, "COMPRESSION_BROTLI_QUALITY", 4)
+    if zstandard is not None:
+        encoders["zstd"] = (ZstdEncoder, "COMPRESSION_ZSTD_LEVEL", 3)
+    return encoders
+
+
+def init_compression(app):
+    """
+    テキスト系レスポンスを Accept-Encoding に応じて圧縮する after_request を登録する
+    COMPRESSION_ENABLED が False なら何もしない
+    """
+    if not app.config.get("COMPRESSION_ENABLED", True):
+        return
+    app.after_request(compress_response)
+
+
+def negotiate_encoding(accept_encodings, preference):
+    """Accept-Encoding の q 値が最も高いエンコーディングを返す（同値なら preference の順、候補がなければ None）"""
+    encoders = available_encoders()
+    best, best_quality = None, 0
+    for name in preference:
+        if name not in encoders:
+            continue
+        quality = accept_encodings[name]
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+def compress_response(response):
+    if not _varies_on_encoding(response):
+        return response
+    # 304 を含め、同じリソースの応答は Vary と弱い ETag を揃える
+    response.vary.add("Accept-Encoding")
+    _weaken_etag(response)
+    if not _is_compressible(response):
+        return response
+
+    config = current_app.config
+    preference = [name.strip() for name in config.get("COMPRESSION_ALGORITHMS", "br,zstd,gzip").split(",")]
+    encoding = negotiate_encoding(request.accept_encodings, preference)
+    if encoding is None:
+        return response
+
+    streamed = response.is_streamed or response.direct_passthrough
+    if not streamed and (response.content_length or 0) < config.get("COMPRESSION_MIN_SIZE", 1024):
+        return response
+
+    encoder_class, level_key, default_level = available_encoders()[encoding]
+    encoder = encoder_class(config.get(level_key, default_level))
+    if streamed:
+        flush_bytes = config.get("COMPRESSION_STREAM_FLUSH_BYTES", 64 * 1024)
+        response.response = _compress_chunks(response.response, encoder, flush_bytes)
+        response.direct_passthrough = False
+        response.headers.pop("Content-Length", None)
+        response.headers.pop("Accept-Ranges", None)
+    else:
+        response.set_data(encoder.compress(response.get_data()) + encoder.finish())
+
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def _weaken_etag(response):
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+
+def _varies_on_encoding(response):
+    """Accept-Encoding によって表現（圧縮の有無）が変わりうるレスポンスか"""
+    if "Content-Encoding" in response.headers or "Content-Range" in response.headers:
+        return False
+    mimetype = response.mimetype or ""
+    return mimetype.startswith("text/") or mimetype in COMPRESSIBLE_MIMETYPES
+
+
+def _is_compressible(response):
+    """本文を圧縮できるレスポンスか（HEAD・本文のないステータスは対象外）"""
+    return request.method != "HEAD" and response.status_code >= 200 and response.status_code not in (204, 206, 304)
+
+
+def _compress_chunks(chunks, encoder, flush_bytes):
+    """チャンクを逐次圧縮する（flush_bytes 分の入力ごとに、それまでの圧縮結果を送り出す）"""
+    pending = 0
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            data = encoder.compress(chunk)
+            pending += len(chunk)
+            if pending >= flush_bytes:
+                data += encoder.flush()
+                pending = 0
+            if data:
+                yield data
+        yield encoder.finish()
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
@@ -0,0 +1,22 @@
+# app/export/export_tasks.py
+from celery.utils.log import get_task_logger
+
+from celery_app import celery, app_context
+
+logger = get_task_logger(__name__)
+
+
+@celery.task(bind=True)
+def run_task_export(self, user_id: int, export_format: str) -> dict:
+    from app.services import export_job_service
+
+    logger.info("export started: user_id=%s format=%s job_id=%s", user_id, export_format, self.request.id)
+    with app_context():
+        filename = export_job_service.write_export_artifact(self.request.id, user_id, export_format)
+
+    return {
+        "status": "success",
+        "format": export_format,
+        "user_id": user_id,
+        "filename": filename,
+    }
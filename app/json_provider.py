@@ -0,0 +1,82 @@
+# app/json_provider.py
+"""
+JSON プロバイダの切り替え
+
+JSON_BACKEND で app.json（jsonify・コンパイル済みシリアライザのレスポンス生成に使う）を選ぶ。
+
+- "auto"   : orjson がインストールされていれば orjson、なければ標準 json の高速設定
+- "orjson" : orjson（未インストールなら起動時にエラー）
+- "stdlib" : 標準 json（キーのソートと ASCII エスケープを行わない）
+- "flask"  : Flask 既定の DefaultJSONProvider（キーをソートし ASCII エスケープする）
+
+日付・dataclass 等の変換は Flask 既定と同じ default() を使うため、どのバックエンドでも出力される値は変わらない
+（キーの順序と非 ASCII 文字のエスケープ有無のみ異なる）。
+"""
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson は任意の依存（requirements には含めない）
+    orjson = None
+
+JSON_BACKENDS = ("auto", "orjson", "stdlib", "flask")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """標準 json でキーのソートと ASCII エスケープを省いたプロバイダ"""
+
+    sort_keys = False
+    ensure_ascii = False
+
+
+class OrjsonProvider(FastJSONProvider):
+    """orjson でエンコード・デコードするプロバイダ（インデント指定時などは標準 json に任せる）"""
+
+    # 日付・dataclass は Flask 既定の default() で変換し、標準 json と同じ出力にする
+    _options = 0 if orjson is None else (
+        orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS
+    )
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(obj)
+        body = orjson.dumps(obj, default=self.default, option=self._options | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def init_json_provider(app):
+    """JSON_BACKEND に応じて app.json を差し替える"""
+    backend = app.config.get("JSON_BACKEND", "auto")
+    if backend not in JSON_BACKENDS:
+        raise RuntimeError(f"JSON_BACKEND は {', '.join(JSON_BACKENDS)} のいずれかを指定してください: {backend}")
+    if backend == "orjson" and orjson is None:
+        raise RuntimeError("JSON_BACKEND=orjson には orjson のインストールが必要です")
+
+    if backend == "flask":
+        return
+    if backend == "orjson" or (backend == "auto" and orjson is not None):
+        app.json = OrjsonProvider(app)
+    else:
+        app.json = FastJSONProvider(app)
+
+
+def json_backend_name(app):
+    """現在の app.json のバックエンド名を返す（ベンチマーク・ログ用）"""
+    if isinstance(app.json, OrjsonProvider):
+        return "orjson"
+    if isinstance(app.json, FastJSONProvider):
+        return "stdlib"
+    return "flask"
+
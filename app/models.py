@@ -1,7 +1,7 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
-from sqlalchemy import event, Column, Boolean, UniqueConstraint, select
+from sqlalchemy import event, Column, Boolean, UniqueConstraint, Index, select, text
 from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.ext.hybrid import hybrid_property
@@ -22,6 +22,18 @@ def set_sqlite_pragma(dbapi_connection, connection_record):
         cursor.close()
 
 
+def active_rows_index(name, *columns):
+    """
+    論理削除されていない行（is_deleted = 0）のみを対象とする部分インデックス
+    部分インデックスに対応しないDB（MySQL）では is_deleted を含む通常の複合インデックスになる
+    """
+    return Index(
+        name, *columns,
+        sqlite_where=text('is_deleted = 0'),
+        postgresql_where=text('is_deleted = false'),
+    )
+
+
 # 論理削除対応
 class SoftDeleteMixin:
     """Mixin providing an ``is_deleted`` flag and helper methods."""
@@ -42,6 +54,8 @@ class Company(db.Model, SoftDeleteMixin):
     __tablename__ = 'company'
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(255), nullable=False) 
+    # 組織構成のバージョン（ETag 用。app/resource_versions.py がコミット時に加算する）
+    org_tree_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     organizations = db.relationship('Organization', backref='company', cascade="all, delete-orphan")
 
@@ -61,7 +75,7 @@ class Organization(db.Model):
     name = db.Column(db.String(255), nullable=False)
     company_id = db.Column(db.Integer, db.ForeignKey('company.id'), nullable=False)
     org_code = db.Column(db.String(50), nullable=False)
-    parent_id = db.Column(db.Integer, db.ForeignKey('organization.id'), nullable=True)
+    parent_id = db.Column(db.Integer, db.ForeignKey('organization.id'), nullable=True, index=True)
     level = db.Column(db.Integer, default=1)
 
     def to_dict(self):
@@ -76,17 +90,35 @@ class Organization(db.Model):
         }
 
 
+# 組織階層（閉包テーブル）
+class OrganizationClosure(db.Model):
+    """Ancestor/descendant pairs of the organization tree, including self (depth 0)."""
+    __tablename__ = 'organization_closure'
+    ancestor_id = db.Column(db.Integer, db.ForeignKey('organization.id', ondelete='CASCADE'), primary_key=True)
+    descendant_id = db.Column(db.Integer, db.ForeignKey('organization.id', ondelete='CASCADE'), primary_key=True, index=True)
+    depth = db.Column(db.Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            'ancestor_id': self.ancestor_id,
+            'descendant_id': self.descendant_id,
+            'depth': self.depth
+        }
+
+
 # ユーザー
 class User(db.Model, UserMixin):
     __table_args__ = {'sqlite_autoincrement': True}
     id = db.Column(db.Integer, primary_key=True)
     wp_user_id = db.Column(db.Integer, unique=True, nullable=True)
     name = db.Column(db.String(100), nullable=False)
-    email = db.Column(db.String(255), unique=False, nullable=False)
+    email = db.Column(db.String(255), unique=False, nullable=False, index=True)
     password_hash = db.Column(db.String(255), nullable=True)
     is_superuser = db.Column(db.Boolean, default=False)
+    # ユーザーから見えるタスク一覧・組織の可視範囲のバージョン（ETag 用。app/resource_versions.py がコミット時に加算する）
+    view_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
-    organization_id = db.Column(db.Integer, db.ForeignKey('organization.id'), nullable=True)
+    organization_id = db.Column(db.Integer, db.ForeignKey('organization.id'), nullable=True, index=True)
     organization = db.relationship('Organization', backref='users')
 
     access_scopes = db.relationship('AccessScope', lazy='select', overlaps='user')
@@ -156,6 +188,8 @@ class Task(db.Model, SoftDeleteMixin):
     created_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(UTC)) 
     display_order = db.Column(db.Integer, nullable=True)
     organization_id = db.Column(db.Integer, db.ForeignKey('organization.id'))
+    # タスク本体・オブジェクティブ・進捗のバージョン（ETag 用。app/resource_versions.py がコミット時に加算する）
+    version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     creator = db.relationship('User', foreign_keys=[created_by], backref='created_tasks')
 
@@ -176,6 +210,9 @@ class Task(db.Model, SoftDeleteMixin):
 
 # オブジェクティブ
 class Objective(db.Model, SoftDeleteMixin):
+    __table_args__ = (
+        active_rows_index('ix_objective_task_active', 'task_id', 'is_deleted', 'display_order'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     task_id = db.Column(db.Integer, db.ForeignKey('task.id'))
     title = db.Column(db.String(255))
@@ -185,6 +222,10 @@ class Objective(db.Model, SoftDeleteMixin):
     status_id = db.Column(db.Integer, db.ForeignKey('status.id'), default=1)
     created_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
     created_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(UTC))
+    # 最新の進捗（報告日 → 登録日時の降順で先頭）への非正規化ポインタ。進捗の追加・削除時に同一トランザクションで更新する
+    # （progress_update との循環参照になるため外部キー制約は付けない）
+    latest_progress_id = db.Column(db.Integer, nullable=True)
+    latest_report_date = db.Column(db.Date, nullable=True)
 
     def to_dict(self):
         return {
@@ -222,6 +263,9 @@ def insert_default_statuses(*args, **kwargs):
 
 # 進捗
 class ProgressUpdate(db.Model, SoftDeleteMixin):
+    __table_args__ = (
+        active_rows_index('ix_progress_update_objective_active', 'objective_id', 'is_deleted', 'report_date'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     objective_id = db.Column(db.Integer, db.ForeignKey('objective.id'))
     status_id = db.Column(db.Integer, db.ForeignKey('status.id'))
@@ -245,6 +289,10 @@ class ProgressUpdate(db.Model, SoftDeleteMixin):
 # タスクアクセス（ユーザー単位）
 class TaskAccessUser(db.Model):
     __tablename__ = 'task_access_user'
+    __table_args__ = (
+        Index('ix_task_access_user_task_user', 'task_id', 'user_id'),
+        Index('ix_task_access_user_user_task', 'user_id', 'task_id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     task_id = db.Column(db.Integer, db.ForeignKey('task.id'), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
@@ -265,6 +313,10 @@ class TaskAccessUser(db.Model):
 # タスクアクセス（組織単位）
 class TaskAccessOrganization(db.Model):
     __tablename__ = 'task_access_organization'
+    __table_args__ = (
+        Index('ix_task_access_organization_task_org', 'task_id', 'organization_id'),
+        Index('ix_task_access_organization_org_task', 'organization_id', 'task_id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     task_id = db.Column(db.Integer, db.ForeignKey('task.id'), nullable=False)
     organization_id = db.Column(db.Integer, db.ForeignKey('organization.id'), nullable=False)
@@ -288,13 +340,15 @@ class UserTaskOrder(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
     task_id = db.Column(db.Integer, db.ForeignKey('task.id'), nullable=False)
-    display_order = db.Column(db.Integer, nullable=False)
+    # 辞書順ランク（app/task_rank.py）。文字列の昇順が表示順で、移動時は移動するタスクの行だけを書き換える
+    display_order = db.Column(db.String(255), nullable=False)
 
     task = db.relationship('Task', backref='user_orders')
     user = db.relationship('User', backref='task_orders')
 
     __table_args__ = (
         db.UniqueConstraint('user_id', 'task_id', name='uix_user_task'),
+        Index('ix_user_task_order_user_order', 'user_id', 'display_order'),
     )
 
     def to_dict(self):
@@ -0,0 +1,165 @@
+# app/org_tree.py
+
+import threading
+import time
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from .models import db, Organization, Company
+
+# 組織構成のバージョン（組織・会社の変更がコミットされるたびに加算）
+_tree_version = 0
+_tree_cache = {}
+_tree_cache_lock = threading.Lock()
+
+
+class OrganizationTreeIndex:
+    """
+    会社単位の組織ツリーのインデックス（親マップ・子リスト・深さ・オイラーツアー区間）
+
+    - 組織 a が組織 b の下位（自身を含む）であるかは ``enter[b] <= enter[a] <= leave[b]`` で判定
+    - 構築時に1クエリで全組織を読み込み、以降の判定・ツリー描画はクエリを発行しない
+    """
+
+    def __init__(self, rows, version):
+        self.version = version
+        self.built_at = time.monotonic()
+        self.nodes = {}
+        self.parent = {}
+        self.children = {}
+        for row in rows:
+            self.nodes[row['id']] = row
+            self.parent[row['id']] = row['parent_id']
+            self.children.setdefault(row['id'], [])
+
+        self.roots = []
+        for org_id, parent_id in self.parent.items():
+            if parent_id in self.nodes:
+                self.children[parent_id].append(org_id)
+            else:
+                self.roots.append(org_id)
+
+        self.depth = {}
+        self.enter = {}
+        self.leave = {}
+        self.order = []
+        self._build_euler_tour()
+
+    def _build_euler_tour(self):
+        # 深い階層でも再帰上限に達しないよう明示的なスタックで走査する
+        counter = 0
+        stack = [(org_id, 0, False) for org_id in reversed(self.roots)]
+        while stack:
+            org_id, depth, exiting = stack.pop()
+            if exiting:
+                self.leave[org_id] = counter - 1
+                continue
+            self.depth[org_id] = depth
+            self.enter[org_id] = counter
+            self.order.append(org_id)
+            counter += 1
+            stack.append((org_id, depth, True))
+            for child_id in reversed(self.children[org_id]):
+                stack.append((child_id, depth + 1, False))
+
+    def __contains__(self, org_id):
+        return org_id in self.nodes
+
+    def company_id(self, org_id):
+        node = self.nodes.get(org_id)
+        return node['company_id'] if node else None
+
+    def is_descendant(self, org_id, ancestor_id):
+        """org_id が ancestor_id 自身またはその下位組織かどうか"""
+        if org_id not in self.enter or ancestor_id not in self.enter:
+            return False
+        return self.enter[ancestor_id] <= self.enter[org_id] <= self.leave[ancestor_id]
+
+    def subtree_ids(self, root_id):
+        """root_id 自身と下位組織のIDをオイラーツアー順で返す"""
+        if root_id not in self.enter:
+            return []
+        return self.order[self.enter[root_id]:self.leave[root_id] + 1]
+
+    def render(self, accessible_ids=None):
+        """
+        アクセス可能な組織のみでツリー（dict）を構築する
+        親がアクセス不可の組織はルートとして扱う
+        """
+        rendered = {}
+        root_nodes = []
+        for org_id in self.order:
+            if accessible_ids is not None and org_id not in accessible_ids:
+                continue
+            node = dict(self.nodes[org_id], children=[])
+            rendered[org_id] = node
+            parent_id = self.parent[org_id]
+            if parent_id in rendered:
+                rendered[parent_id]['children'].append(node)
+            else:
+                root_nodes.append(node)
+        return root_nodes
+
+
+def get_organization_tree_index(company_id=None):
+    """
+    会社単位（company_id=None の場合は全会社）の組織ツリーインデックスを返す
+    組織構成のバージョンが変わっているか、ORG_TREE_CACHE_TTL を過ぎている場合は再構築する
+    """
+    version = _tree_version
+    ttl = current_app.config.get('ORG_TREE_CACHE_TTL', 30) if has_app_context() else 0
+    with _tree_cache_lock:
+        index = _tree_cache.get(company_id)
+    if index is not None and index.version == version and time.monotonic() - index.built_at < ttl:
+        return index
+
+    index = OrganizationTreeIndex(_load_tree_rows(company_id), version)
+    with _tree_cache_lock:
+        _tree_cache[company_id] = index
+    return index
+
+
+def invalidate_organization_tree_cache():
+    """組織構成のバージョンを進め、キャッシュ済みのインデックスを無効化する"""
+    global _tree_version
+    with _tree_cache_lock:
+        _tree_version += 1
+        _tree_cache.clear()
+
+
+def _load_tree_rows(company_id):
+    query = (
+        db.session.query(
+            Organization.id,
+            Organization.name,
+            Organization.org_code,
+            Organization.company_id,
+            Company.name.label('company_name'),
+            Organization.parent_id,
+            Organization.level,
+        )
+        .outerjoin(Company, Company.id == Organization.company_id)
+        .order_by(Organization.id)
+    )
+    if company_id:
+        query = query.filter(Organization.company_id == company_id)
+    return [row._asdict() for row in query.all()]
+
+
+@event.listens_for(Session, 'after_flush')
+def _mark_organization_changes(session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, (Organization, Company)):
+            session.info['organization_tree_changed'] = True
+            return
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_tree_version_on_commit(session):
+    if session.info.pop('organization_tree_changed', False):
+        invalidate_organization_tree_cache()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_tree_changes_on_rollback(session):
+    session.info.pop('organization_tree_changed', None)
@@ -0,0 +1,176 @@
+# app/permissions.py
+
+import threading
+from cachetools import TTLCache
+from flask import current_app, g, has_app_context, has_request_context
+from sqlalchemy import select, union_all
+from .models import db, TaskAccessUser, TaskAccessOrganization, OrganizationClosure
+from .constants import TaskAccessLevelEnum, OrgRoleEnum, TASK_ACCESS_PRIORITY
+
+# プロセス内で共有する権限スナップショット（PERMISSION_CACHE_SIZE > 0 の場合のみ）
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+class PermissionResolver:
+    """
+    ユーザーのタスクアクセス権限を一括で読み込み、タスクごとの実効アクセスレベルを判定する
+
+    - タスク単位の付与（TaskAccessUser / 所属組織の TaskAccessOrganization）は1クエリで取得
+    - ORG_ADMIN の管理対象組織（自組織＋下位組織）は組織閉包テーブルから1クエリで取得
+    - 読み込み後の判定は辞書・集合の参照のみ
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.user_id = user.id
+        self.organization_id = user.organization_id
+        self._grants = None
+        self._is_system_admin = None
+        self._admin_org_ids = None
+
+    @property
+    def cache_key(self):
+        return (self.user_id, self.organization_id)
+
+    def level_for(self, task):
+        """タスクに対する実効アクセスレベルを返す（権限がなければ None）"""
+        if task.created_by == self.user_id:
+            return TaskAccessLevelEnum.OWNER
+        return self.grants.get(task.id)
+
+    def has_level(self, task, required_level):
+        """``required_level`` 以上のアクセスレベルを持つかどうか"""
+        level = self.level_for(task)
+        if level is None:
+            return False
+        if not isinstance(required_level, TaskAccessLevelEnum):
+            required_level = TaskAccessLevelEnum(required_level)
+        return TASK_ACCESS_PRIORITY[level] >= TASK_ACCESS_PRIORITY[required_level]
+
+    def can_view(self, task):
+        """付与に加えて SYSTEM_ADMIN / ORG_ADMIN（管理対象組織のタスク）も閲覧可"""
+        if self.level_for(task) is not None:
+            return True
+        return self._is_admin_for(task)
+
+    def can_edit(self, task):
+        """作成者、SYSTEM_ADMIN、管理対象組織のタスクに対する ORG_ADMIN が編集可"""
+        if task.created_by == self.user_id:
+            return True
+        return self._is_admin_for(task)
+
+    @property
+    def grants(self):
+        if self._grants is None:
+            self._load()
+        return self._grants
+
+    def _is_admin_for(self, task):
+        if self._grants is None:
+            self._load()
+        if self._is_system_admin:
+            return True
+        return task.organization_id in self._admin_org_ids
+
+    def _load(self):
+        snapshot = _get_shared_snapshot(self.cache_key)
+        if snapshot is None:
+            snapshot = {
+                'grants': self._query_grants(),
+                'is_system_admin': False,
+                'admin_org_ids': frozenset(),
+            }
+            roles = {scope.role for scope in self.user.access_scopes}
+            snapshot['is_system_admin'] = OrgRoleEnum.SYSTEM_ADMIN in roles
+            if OrgRoleEnum.ORG_ADMIN in roles and self.organization_id:
+                snapshot['admin_org_ids'] = self._query_admin_org_ids()
+            _set_shared_snapshot(self.cache_key, snapshot)
+
+        self._grants = snapshot['grants']
+        self._is_system_admin = snapshot['is_system_admin']
+        self._admin_org_ids = snapshot['admin_org_ids']
+
+    def _query_grants(self):
+        queries = [
+            select(TaskAccessUser.task_id, TaskAccessUser.access_level)
+            .where(TaskAccessUser.user_id == self.user_id)
+        ]
+        if self.organization_id:
+            queries.append(
+                select(TaskAccessOrganization.task_id, TaskAccessOrganization.access_level)
+                .where(TaskAccessOrganization.organization_id == self.organization_id)
+            )
+
+        grants = {}
+        for task_id, level in db.session.execute(union_all(*queries)).all():
+            current = grants.get(task_id)
+            if current is None or TASK_ACCESS_PRIORITY[level] > TASK_ACCESS_PRIORITY[current]:
+                grants[task_id] = level
+        return grants
+
+    def _query_admin_org_ids(self):
+        rows = db.session.execute(
+            select(OrganizationClosure.descendant_id)
+            .where(OrganizationClosure.ancestor_id == self.organization_id)
+        ).all()
+        return frozenset([self.organization_id, *(org_id for (org_id,) in rows)])
+
+
+def get_permission_resolver(user):
+    """
+    リクエスト内で共有される PermissionResolver を返す（リクエスト外では都度生成）
+    """
+    if not has_request_context():
+        return PermissionResolver(user)
+
+    resolvers = g.setdefault('_permission_resolvers', {})
+    resolver = resolvers.get(user.id)
+    if resolver is None or resolver.organization_id != user.organization_id:
+        resolver = PermissionResolver(user)
+        resolvers[user.id] = resolver
+    return resolver
+
+
+def invalidate_permission_cache():
+    """
+    権限の付与・組織構成・スコープが変更されたときに呼び出し、リクエスト内およびプロセス内のキャッシュを破棄する
+    """
+    if has_app_context():
+        g.pop('_permission_resolvers', None)
+    if _shared_cache is not None:
+        with _shared_cache_lock:
+            _shared_cache.clear()
+
+
+def clear_request_permission_cache(exc=None):
+    """teardown_request 用：リクエスト終了時にリクエスト内キャッシュを破棄する"""
+    g.pop('_permission_resolvers', None)
+
+
+def _get_shared_cache():
+    global _shared_cache
+    if _shared_cache is None and has_app_context():
+        size = current_app.config.get('PERMISSION_CACHE_SIZE', 0)
+        if size:
+            with _shared_cache_lock:
+                if _shared_cache is None:
+                    ttl = current_app.config.get('PERMISSION_CACHE_TTL', 30)
+                    _shared_cache = TTLCache(maxsize=size, ttl=ttl)
+    return _shared_cache
+
+
+def _get_shared_snapshot(key):
+    cache = _get_shared_cache()
+    if cache is None:
+        return None
+    with _shared_cache_lock:
+        return cache.get(key)
+
+
+def _set_shared_snapshot(key, snapshot):
+    cache = _get_shared_cache()
+    if cache is None:
+        return
+    with _shared_cache_lock:
+        cache[key] = snapshot
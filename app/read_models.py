@@ -0,0 +1,113 @@
+# app/read_models.py
+"""
+一覧系エンドポイント用の読み取り専用モデル
+
+ORM エンティティの代わりに、列指定の select() の結果行から組み立てる軽量なオブジェクト。
+セッションの identity map に載らず属性の計装もないため、1行あたりのメモリ・CPU が小さい。
+スキーマは属性名で値を取り出すため、ORM エンティティと同じスキーマでそのまま dump できる。
+
+各クラスの columns() は select() に渡す列を属性と同じ順で返す（``Row(*row)`` で組み立てる）。
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from .models import Task, Objective, User, Organization, AccessScope
+from .constants import OrgRoleEnum
+
+
+@dataclass(slots=True)
+class TaskRow:
+    id: int
+    status_id: int | None
+    title: str | None
+    description: str | None
+    due_date: date | None
+    assigned_user_id: int | None
+    created_by: int | None
+    created_at: datetime | None
+    display_order: int | None
+    organization_id: int | None
+    user_access_level: str | None = None
+    user_rank: str | None = None
+    status_name: str | None = None
+
+    @staticmethod
+    def columns():
+        return (
+            Task.id, Task.status_id, Task.title, Task.description, Task.due_date, Task.assigned_user_id,
+            Task.created_by, Task.created_at, Task.display_order, Task.organization_id,
+        )
+
+
+@dataclass(slots=True)
+class ObjectiveRow:
+    id: int
+    task_id: int | None
+    title: str | None
+    due_date: date | None
+    assigned_user_id: int | None
+    display_order: int | None
+    status_id: int | None
+    created_by: int | None
+    created_at: datetime | None
+    latest_report_date: date | None
+    assigned_user_name: str | None = None
+    latest_progress: str | None = None
+
+    @staticmethod
+    def columns():
+        return (
+            Objective.id, Objective.task_id, Objective.title, Objective.due_date, Objective.assigned_user_id,
+            Objective.display_order, Objective.status_id, Objective.created_by, Objective.created_at,
+            Objective.latest_report_date,
+        )
+
+
+@dataclass(slots=True)
+class AccessScopeRow:
+    id: int
+    user_id: int
+    organization_id: int
+    role: OrgRoleEnum
+
+    @staticmethod
+    def columns():
+        return AccessScope.id, AccessScope.user_id, AccessScope.organization_id, AccessScope.role
+
+
+@dataclass(slots=True)
+class UserRow:
+    id: int
+    wp_user_id: int | None
+    name: str
+    email: str
+    is_superuser: bool | None
+    organization_id: int | None
+    organization_name: str | None
+    company_id: int | None
+    access_scopes: list = field(default_factory=list)
+
+    @staticmethod
+    def columns():
+        """Organization を外部結合した select() で使う"""
+        return (
+            User.id, User.wp_user_id, User.name, User.email, User.is_superuser, User.organization_id,
+            Organization.name, Organization.company_id,
+        )
+
+
+@dataclass(slots=True)
+class OrganizationRow:
+    id: int
+    name: str
+    company_id: int
+    org_code: str
+    parent_id: int | None
+    level: int | None
+
+    @staticmethod
+    def columns():
+        return (
+            Organization.id, Organization.name, Organization.company_id, Organization.org_code,
+            Organization.parent_id, Organization.level,
+        )
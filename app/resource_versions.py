@@ -0,0 +1,199 @@
+# app/resource_versions.py
+"""
+条件付き GET（ETag / If-None-Match）用のバージョンカウンタ
+
+ポーリングされる一覧の内容が変わり得る変更をコミット時に検出し、対応する行のカウンタを加算する。
+
+- Task.version              : タスク本体・オブジェクティブ・進捗（/objectives/tasks/<id>）
+- User.view_version         : ユーザーから見えるタスク一覧・組織の可視範囲（/tasks、/organizations/tree）
+- Company.org_tree_version  : 会社の組織構成（/organizations/tree）
+
+カウンタは同じトランザクション内で UPDATE するため、複数ワーカー間でも変更と同時に反映される。
+ORM を経由しない一括 INSERT / UPDATE を発行した場合は bump_* を明示的に呼ぶこと。
+ETag の確認は主キーでのカウンタ読み取りのみで、一覧本体のクエリ・シリアライズは行わない。
+"""
+
+import hashlib
+from flask import current_app, request
+from sqlalchemy import event, inspect, or_, select, update
+from sqlalchemy.orm import Session
+from .models import (
+    db,
+    Task,
+    Objective,
+    ProgressUpdate,
+    User,
+    AccessScope,
+    Company,
+    Organization,
+    TaskAccessUser,
+    TaskAccessOrganization,
+    UserTaskOrder,
+)
+
+
+def bump_task_versions(task_ids, session=None, include_viewers=True):
+    """タスクのバージョンを加算する（include_viewers ならタスクが見えるユーザーの一覧バージョンも加算する）"""
+    task_ids = sorted({task_id for task_id in task_ids if task_id is not None})
+    if not task_ids:
+        return
+    connection = (session or db.session).connection()
+    connection.execute(
+        update(Task.__table__)
+        .where(Task.__table__.c.id.in_(task_ids))
+        .values(version=Task.__table__.c.version + 1)
+    )
+    if include_viewers:
+        _bump_view_versions(connection, or_(
+            User.__table__.c.id.in_(select(Task.created_by).where(Task.id.in_(task_ids))),
+            User.__table__.c.id.in_(select(TaskAccessUser.user_id).where(TaskAccessUser.task_id.in_(task_ids))),
+            User.__table__.c.organization_id.in_(
+                select(TaskAccessOrganization.organization_id).where(TaskAccessOrganization.task_id.in_(task_ids))
+            ),
+        ))
+
+
+def bump_view_versions(user_ids=(), organization_ids=(), session=None):
+    """ユーザー（organization_ids 指定時はその組織に所属する全ユーザー）の一覧バージョンを加算する"""
+    user_ids = sorted({user_id for user_id in user_ids if user_id is not None})
+    organization_ids = sorted({org_id for org_id in organization_ids if org_id is not None})
+    conditions = []
+    if user_ids:
+        conditions.append(User.__table__.c.id.in_(user_ids))
+    if organization_ids:
+        conditions.append(User.__table__.c.organization_id.in_(organization_ids))
+    if conditions:
+        _bump_view_versions((session or db.session).connection(), or_(*conditions))
+
+
+def bump_org_tree_versions(company_ids, session=None):
+    """会社の組織構成バージョンを加算する"""
+    company_ids = sorted({company_id for company_id in company_ids if company_id is not None})
+    if not company_ids:
+        return
+    (session or db.session).connection().execute(
+        update(Company.__table__)
+        .where(Company.__table__.c.id.in_(company_ids))
+        .values(org_tree_version=Company.__table__.c.org_tree_version + 1)
+    )
+
+
+def _bump_view_versions(connection, condition):
+    connection.execute(
+        update(User.__table__)
+        .where(condition)
+        .values(view_version=User.__table__.c.view_version + 1)
+    )
+
+
+# ---- ETag ----
+
+def make_etag(*parts):
+    """バージョンとリクエストの条件から強い ETag の値（引用符なし）を作る"""
+    salt = current_app.config.get('API_VERSION', '')
+    payload = '|'.join(str(part) for part in (salt, *parts))
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def task_list_etag(user):
+    """GET /tasks の ETag（ユーザーの一覧バージョンとクエリ文字列から作る）"""
+    return make_etag('tasks', user.id, user.organization_id, user.view_version,
+                     request.query_string.decode())
+
+
+def objective_list_etag(task):
+    """GET /objectives/tasks/<id> の ETag（タスクのバージョンから作る）"""
+    return make_etag('objectives', task.id, task.version)
+
+
+def organization_tree_etag(user, company_id=None):
+    """GET /organizations/tree の ETag（対象会社の組織構成バージョンとユーザーの可視範囲から作る）"""
+    query = db.session.query(Company.id, Company.org_tree_version).order_by(Company.id)
+    if company_id:
+        query = query.filter(Company.id == company_id)
+    versions = ','.join(f'{cid}:{version}' for cid, version in query.all())
+    return make_etag('organization-tree', company_id, versions, user.id, user.organization_id,
+                     bool(user.is_superuser), user.view_version)
+
+
+def is_not_modified(etag):
+    """リクエストの If-None-Match が etag と一致するか（圧縮時は弱い ETag になるため弱い比較で判定する）"""
+    return request.if_none_match.contains_weak(etag)
+
+
+def not_modified_response(etag):
+    # 304 の Content-Type は送信されないが、圧縮の判定（Vary・弱い ETag）を 200 の JSON 応答と揃えるために指定する
+    response = current_app.response_class(status=304, mimetype='application/json')
+    return with_etag(response, etag)
+
+
+def with_etag(response, etag):
+    """レスポンスに ETag を付け、ブラウザには毎回再検証させる"""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+# ---- 変更の検出 ----
+
+def _was_modified(session, obj):
+    return obj in session.new or obj in session.deleted or session.is_modified(obj)
+
+
+def _old_and_new(obj, attr):
+    """属性の変更前後の値（変更がなければ現在値のみ）"""
+    history = inspect(obj).attrs[attr].history
+    return {*history.deleted, *history.unchanged, *history.added}
+
+
+@event.listens_for(Session, 'after_flush')
+def _bump_versions_after_flush(session, flush_context):
+    task_ids = set()
+    content_task_ids = set()
+    objective_ids = set()
+    user_ids = set()
+    organization_ids = set()
+    company_ids = set()
+    renamed_user_ids = set()
+
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if not _was_modified(session, obj):
+            continue
+        if isinstance(obj, Task):
+            task_ids.add(obj.id)
+        elif isinstance(obj, Objective):
+            content_task_ids |= _old_and_new(obj, 'task_id')
+        elif isinstance(obj, ProgressUpdate):
+            objective_ids.add(obj.objective_id)
+        elif isinstance(obj, (UserTaskOrder, TaskAccessUser, AccessScope)):
+            user_ids |= _old_and_new(obj, 'user_id')
+        elif isinstance(obj, TaskAccessOrganization):
+            organization_ids |= _old_and_new(obj, 'organization_id')
+        elif isinstance(obj, User):
+            user_ids.add(obj.id)
+            if inspect(obj).attrs.name.history.has_changes():
+                renamed_user_ids.add(obj.id)
+        elif isinstance(obj, Organization):
+            company_ids |= _old_and_new(obj, 'company_id')
+        elif isinstance(obj, Company):
+            company_ids.add(obj.id)
+
+    if not (task_ids or content_task_ids or objective_ids or user_ids or organization_ids
+            or company_ids or renamed_user_ids):
+        return
+
+    connection = session.connection()
+    if objective_ids:
+        content_task_ids |= set(connection.scalars(
+            select(Objective.task_id).where(Objective.id.in_(sorted(i for i in objective_ids if i is not None)))
+        ))
+    if renamed_user_ids:
+        # オブジェクティブ一覧は担当者名を含む
+        content_task_ids |= set(connection.scalars(
+            select(Objective.task_id).where(Objective.assigned_user_id.in_(sorted(renamed_user_ids))).distinct()
+        ))
+
+    bump_task_versions(task_ids, session=session)
+    bump_task_versions(content_task_ids - task_ids, session=session, include_viewers=False)
+    bump_view_versions(user_ids, organization_ids, session=session)
+    bump_org_tree_versions(company_ids, session=session)
@@ -6,6 +6,8 @@ from app.decorators import with_common_error_responses
 from app.service_errors import format_error_response
 from flask import jsonify
 from app.services import objectives_service
+from app.serializers import fast_response
+from app.resource_versions import objective_list_etag, is_not_modified, not_modified_response, with_etag
 from app.schemas import (
     ObjectiveSchema,
     ObjectiveInputSchema,
@@ -65,11 +67,16 @@ class ObjectiveResource(MethodView):
 class TaskObjectivesResource(MethodView):
     @login_required
     @objectives_bp.response(200, ObjectivesListSchema)
+    @objectives_bp.alt_response(304, description="If-None-Match の ETag から変更がない")
     @with_common_error_responses(objectives_bp)
     def get(self, task_id):
-        """タスクのオブジェクティブ一覧"""
-        objectives = objectives_service.get_objectives_for_task(task_id, current_user)
-        return objectives
+        """タスクのオブジェクティブ一覧（ETag による条件付き取得）"""
+        task = objectives_service.get_viewable_task(task_id, current_user)
+        etag = objective_list_etag(task)
+        if is_not_modified(etag):
+            return not_modified_response(etag)
+        objectives = objectives_service.list_objectives(task.id)
+        return with_etag(fast_response(ObjectivesListSchema, objectives), etag)
 
 
 
@@ -7,6 +7,8 @@ from marshmallow import fields
 from app.service_errors import ServiceError,ServiceValidationError
 from app.decorators import with_common_error_responses
 from app.services import organization_service
+from app.serializers import fast_response
+from app.resource_versions import organization_tree_etag, is_not_modified, not_modified_response, with_etag
 from app.schemas import (
     OrganizationSchema,
     OrganizationInputSchema,
@@ -57,7 +59,7 @@ class OrganizationListResource(MethodView):
         """組織一覧取得(会社指定が無い場合は所属会社、または全組織)"""
         company_id = args.get("company_id")
         orgs =organization_service.get_organizations(current_user, company_id)
-        return orgs
+        return fast_response(OrganizationSchema, orgs, many=True)
 
 
 @organization_bp.route("/<int:org_id>")
@@ -94,12 +96,16 @@ class OrganizationTreeResource(MethodView):
     @login_required
     @organization_bp.arguments(OrganizationQuerySchema, location="query")
     @organization_bp.response(200, OrganizationTreeSchema(many=True))
+    @organization_bp.alt_response(304, description="If-None-Match の ETag から変更がない")
     @with_common_error_responses(organization_bp)
     def get(self,args):
-        """組織ツリー取得(会社指定が無い場合は所属会社、または全組織)"""
+        """組織ツリー取得(会社指定が無い場合は所属会社、または全組織。ETag による条件付き取得)"""
         company_id = args.get("company_id")
+        etag = organization_tree_etag(current_user, company_id)
+        if is_not_modified(etag):
+            return not_modified_response(etag)
         tree = organization_service.get_organization_tree(current_user, company_id)
-        return tree
+        return with_etag(fast_response(OrganizationTreeSchema, tree, many=True), etag)
 
 @organization_bp.route("<int:parent_id>/children")
 class OrganizationChildrenResource(MethodView):
@@ -109,5 +115,5 @@ class OrganizationChildrenResource(MethodView):
     def get(self,parent_id):
         """子組織取得"""
         children = organization_service.get_children(parent_id)
-        return children
+        return fast_response(OrganizationSchema, children, many=True)
 
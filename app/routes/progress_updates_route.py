@@ -6,9 +6,11 @@ from flask_login import login_required, current_user
 from app.service_errors import ServiceError
 from app.decorators import with_common_error_responses
 from app.services import progress_updates_service
+from app.serializers import fast_response
 from app.schemas import (
     ProgressInputSchema,
     ProgressSchema,
+    ProgressListQuerySchema,
     MessageSchema,
     ErrorResponseSchema,
 )
@@ -33,12 +35,20 @@ class ProgressListResource(MethodView):
         return message
 
     @login_required
-    @progress_bp.response(200, ProgressSchema(many=True))
+    @progress_bp.arguments(ProgressListQuerySchema, location="query")
+    @progress_bp.response(200, ProgressSchema(many=True), headers={
+        "X-Next-Cursor": {"description": "次ページ取得用のカーソル（最終ページでは付与しない）", "schema": {"type": "string"}},
+    })
     @with_common_error_responses(progress_bp)
-    def get(self, objective_id):
-        """進捗一覧取得"""
-        progress_list = progress_updates_service.get_progress_list(objective_id, current_user)
-        return progress_list
+    def get(self, args, objective_id):
+        """進捗一覧取得（報告日順、from/to による期間絞り込み、limit/cursor によるキーセットページング）"""
+        resp = progress_updates_service.get_progress_list(
+            objective_id, current_user,
+            limit=args.get("limit"), cursor=args.get("cursor"),
+            date_from=args.get("date_from"), date_to=args.get("date_to"),
+        )
+        headers = {"X-Next-Cursor": resp["next_cursor"]} if resp["next_cursor"] else {}
+        return fast_response(ProgressSchema, resp["updates"], many=True, headers=headers)
 
 @progress_bp.route("/<int:objective_id>/latest-progress")
 class LatestProgressResource(MethodView):
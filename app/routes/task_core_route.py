@@ -1,17 +1,24 @@
 from app.service_errors import format_error_response
-from flask import jsonify
+from flask import jsonify, current_app
 from flask_smorest import Blueprint
 from flask.views import MethodView
 from flask_login import login_required, current_user
 from app.service_errors import ServiceError
 from app.decorators import with_common_error_responses
 from app.services import task_core_service
+from app.serializers import dump
+from app.resource_versions import task_list_etag, is_not_modified, not_modified_response, with_etag
+from app.schemas.task_schemas import project_task_fields
 from app.schemas import (
     TaskSchema,
     TaskInputSchema,
     TaskUpdateSchema,
     TaskCreateResponseSchema,
     TaskListResponseSchema,
+    TaskListQuerySchema,
+    TaskBulkCreateSchema,
+    TaskBulkUpdateSchema,
+    TaskBulkResponseSchema,
     OrderSchema,
     MessageSchema,
     StatusSchema,
@@ -37,12 +44,41 @@ class TaskListResource(MethodView):
         return {"message":"タスクを追加しました", "task":resp}
 
     @login_required
+    @task_core_bp.arguments(TaskListQuerySchema, location="query")
     @task_core_bp.response(200, TaskListResponseSchema)
+    @task_core_bp.alt_response(304, description="If-None-Match の ETag から変更がない")
     @with_common_error_responses(task_core_bp)
-    def get(self):
-        """タスク一覧"""
-        resp = task_core_service.get_tasks(current_user)
-        return {"tasks": resp} 
+    def get(self, args):
+        """タスク一覧（limit/cursor によるキーセットページング、fields による項目絞り込み、ETag による条件付き取得）"""
+        etag = task_list_etag(current_user)
+        if is_not_modified(etag):
+            return not_modified_response(etag)
+        resp = task_core_service.get_tasks(current_user, args.get("limit"), args.get("cursor"))
+        # スキーマは OpenAPI ドキュメント用。レスポンスはコンパイル済みシリアライザで組み立てる
+        tasks = dump(TaskSchema, resp["tasks"], many=True)
+        if args.get("projection"):
+            tasks = project_task_fields(tasks, args["projection"])
+        return with_etag(jsonify({"tasks": tasks, "next_cursor": resp["next_cursor"]}), etag)
+
+@task_core_bp.route("/bulk")
+class TaskBulkResource(MethodView):
+    @login_required
+    @task_core_bp.arguments(TaskBulkCreateSchema)
+    @task_core_bp.response(201, TaskBulkResponseSchema)
+    @with_common_error_responses(task_core_bp)
+    def post(self, data):
+        """タスク一括作成"""
+        task_ids = task_core_service.bulk_create_tasks(data["tasks"], current_user)
+        return {"message": "タスクを一括追加しました", "count": len(task_ids), "task_ids": task_ids}
+
+    @login_required
+    @task_core_bp.arguments(TaskBulkUpdateSchema)
+    @task_core_bp.response(200, TaskBulkResponseSchema)
+    @with_common_error_responses(task_core_bp)
+    def patch(self, data):
+        """タスク一括更新"""
+        task_ids = task_core_service.bulk_update_tasks(data["tasks"], current_user)
+        return {"message": "タスクを一括更新しました", "count": len(task_ids), "task_ids": task_ids}
 
 @task_core_bp.route("/<int:task_id>")
 class TaskResource(MethodView):
@@ -84,9 +120,12 @@ class ObjectiveOrderResource(MethodView):
 
 @task_core_bp.route('/statuses')
 class StatusListResource(MethodView):
-    @task_core_bp.response(200, StatusSchema(many=True))
+    @task_core_bp.response(200, StatusSchema(many=True), headers={
+        "Cache-Control": {"description": "ステータス表はほぼ不変のため長期間キャッシュ可能", "schema": {"type": "string"}},
+    })
     @with_common_error_responses(task_core_bp)
     def get(self):
-        """ステータス一覧"""
+        """ステータス一覧（プロセス内のステータスレジストリから返す）"""
         result = task_core_service.get_statuses()
-        return result
\ No newline at end of file
+        max_age = current_app.config.get('STATUS_CACHE_MAX_AGE', 86400)
+        return result, 200, {"Cache-Control": f"public, max-age={max_age}"}
\ No newline at end of file
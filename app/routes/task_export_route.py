@@ -1,16 +1,28 @@
 from flask_smorest import Blueprint
 from flask.views import MethodView
-from flask import send_file
+from flask import send_file, jsonify, url_for, Response, stream_with_context
 from flask_login import login_required, current_user
 
 from app.services.task_export_service import TaskDataExporter
+from app.services import export_job_service
 from app.models import db
-from app.schemas import YAMLResponseSchema, ErrorResponseSchema
-from app.service_errors import ServiceError
+from app.schemas import (
+    YAMLResponseSchema,
+    ErrorResponseSchema,
+    JobIdSchema,
+    ExportJobInputSchema,
+    ExportJobSchema,
+    ExportStreamQuerySchema,
+)
+from app.service_errors import ServiceError, format_error_response
 from app.decorators import with_common_error_responses
 
 task_export_bp = Blueprint("TaskExport", __name__, url_prefix="/exports", description="タスクエクスポート")
 
+@task_export_bp.errorhandler(ServiceError)
+def handle_service_error(e: ServiceError):
+    return jsonify(format_error_response(e.code, e.name, e.description)), e.code
+
 @task_export_bp.route('/excel')
 class ExportExcelResource(MethodView):
     @login_required
@@ -36,3 +48,58 @@ class ExportYAMLResource(MethodView):
         yaml_data = exporter.export_as_yaml()
         return {"yaml": yaml_data}
 
+
+STREAM_MIMETYPES = {
+    "ndjson": "application/x-ndjson",
+    "yaml": "application/x-yaml",
+}
+
+@task_export_bp.route('/stream')
+class ExportStreamResource(MethodView):
+    @login_required
+    @task_export_bp.arguments(ExportStreamQuerySchema, location="query")
+    @with_common_error_responses(task_export_bp)
+    def get(self, args):
+        """タスクをタスク単位で逐次エクスポート（チャンク転送）"""
+        exporter = TaskDataExporter(current_user.id, db)
+        if args["format"] == "yaml":
+            chunks = exporter.iter_yaml_documents()
+        else:
+            chunks = exporter.iter_ndjson_lines()
+        return Response(stream_with_context(chunks), mimetype=STREAM_MIMETYPES[args["format"]])
+
+@task_export_bp.route('/jobs')
+class ExportJobResource(MethodView):
+    @login_required
+    @task_export_bp.arguments(ExportJobInputSchema)
+    @task_export_bp.response(202, JobIdSchema)
+    @with_common_error_responses(task_export_bp)
+    def post(self, data):
+        """エクスポートジョブを登録（非同期）"""
+        return export_job_service.enqueue_export_job(data, current_user)
+
+@task_export_bp.route('/jobs/<job_id>')
+class ExportJobStatusResource(MethodView):
+    @login_required
+    @task_export_bp.response(200, ExportJobSchema)
+    @with_common_error_responses(task_export_bp)
+    def get(self, job_id):
+        """エクスポートジョブの状態取得"""
+        job = export_job_service.get_export_job(job_id, current_user)
+        if job["status"] == "success":
+            job["download_url"] = url_for("TaskExport.ExportJobDownloadResource", job_id=job_id)
+        return job
+
+@task_export_bp.route('/jobs/<job_id>/download')
+class ExportJobDownloadResource(MethodView):
+    @login_required
+    @with_common_error_responses(task_export_bp)
+    def get(self, job_id):
+        """エクスポートジョブの成果物をダウンロード"""
+        artifact = export_job_service.get_export_artifact(job_id, current_user)
+        return send_file(
+            artifact["path"],
+            as_attachment=True,
+            download_name=artifact["download_name"],
+            mimetype=artifact["mimetype"]
+        )
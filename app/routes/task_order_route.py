@@ -2,7 +2,7 @@ from app.service_errors import format_error_response
 from flask import jsonify, request
 from flask_smorest import Blueprint, abort
 from flask.views import MethodView
-from flask_login import login_required
+from flask_login import login_required, current_user
 from app.service_errors import ServiceError
 from app.decorators import with_common_error_responses
 from app.services import task_order_service
@@ -11,7 +11,8 @@ from app.schemas import (
     TaskOrderInputSchema,
     MessageSchema,
     ErrorResponseSchema,
-    TaskOrderQuerySchema
+    TaskOrderQuerySchema,
+    TaskOrderMoveSchema,
 )
 
 
@@ -43,3 +44,17 @@ class TaskOrderResource(MethodView):
         """タスク並び順保存"""
         resp = task_order_service.save_task_order(data.get('user_id'), data)
         return resp
+
+
+@task_order_bp.route('/move')
+class TaskOrderMoveResource(MethodView):
+    @login_required
+    @task_order_bp.arguments(TaskOrderMoveSchema)
+    @task_order_bp.response(200, MessageSchema)
+    @with_common_error_responses(task_order_bp)
+    def post(self, data):
+        """タスクを指定した2つのタスクの間に移動（ログインユーザーの並び順、1行のみ更新）"""
+        resp = task_order_service.move_task(
+            current_user, data["task_id"], data.get("prev_task_id"), data.get("next_task_id")
+        )
+        return resp
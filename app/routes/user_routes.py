@@ -7,6 +7,7 @@ from flask_login import login_required, current_user
 from app.service_errors import ServiceError
 from app.decorators import with_common_error_responses
 from app.services import user_service
+from app.serializers import fast_response
 from app.schemas import (
     UserSchema,
     UserInputSchema,
@@ -44,7 +45,7 @@ class UsersResource(MethodView):
     def get(self,query_args):
         """ユーザー一覧取得"""
         result = user_service.get_users(current_user, query_args)
-        return result
+        return fast_response(UserWithScopesSchema, result, many=True)
 
 @user_bp.route("/<int:user_id>")
 class UserResource(MethodView):
@@ -101,5 +102,5 @@ class UsersByOrgTreeResource(MethodView):
     def get(self, org_id):
         """組織ツリーでユーザー一覧取得"""
         result = user_service.get_users_by_org_tree(org_id, current_user)
-        return result
+        return fast_response(UserWithScopesSchema, result, many=True)
 
@@ -5,12 +5,16 @@ from .task_schemas import (
     TaskUpdateSchema,
     TaskCreateResponseSchema,
     TaskListResponseSchema,
+    TaskListQuerySchema,
+    TaskBulkCreateSchema,
+    TaskBulkUpdateSchema,
+    TaskBulkResponseSchema,
     OrderSchema,
     TaskOrderSchema,
     TaskOrderInputSchema,
     StatusSchema,
 )
-from .task_order_schemas import TaskOrderQuerySchema
+from .task_order_schemas import TaskOrderQuerySchema, TaskOrderMoveSchema
 from .user_schemas import (
     UserSchema,
     UserWithScopesSchema,
@@ -44,7 +48,7 @@ from .objective_schemas import (
     ObjectiveResponseSchema,
     ObjectivesListSchema,
 )
-from .progress_schemas import ProgressSchema, ProgressInputSchema
+from .progress_schemas import ProgressSchema, ProgressInputSchema, ProgressListQuerySchema
 from .access_scope_schemas import AccessScopeSchema, AccessScopeInputSchema
 from .task_access_schemas import (
     AccessUserSchema,
@@ -52,19 +56,22 @@ from .task_access_schemas import (
     AccessLevelInputSchema,
 )
 from .ai_schemas import AISuggestInputSchema, JobIdSchema, AIResultSchema
+from .export_schemas import ExportJobInputSchema, ExportJobSchema, ExportStreamQuerySchema
 
 __all__ = [
     'MessageSchema', 'ErrorResponseSchema', 'YAMLResponseSchema',
-    'TaskSchema', 'TaskInputSchema', 'TaskUpdateSchema', 'TaskCreateResponseSchema', 'TaskListResponseSchema', 'StatusSchema',
+    'TaskSchema', 'TaskInputSchema', 'TaskUpdateSchema', 'TaskCreateResponseSchema', 'TaskListResponseSchema', 'TaskListQuerySchema', 'StatusSchema',
+    'TaskBulkCreateSchema', 'TaskBulkUpdateSchema', 'TaskBulkResponseSchema',
     'OrderSchema', 'TaskOrderSchema', 'TaskOrderInputSchema',
-    'TaskOrderQuerySchema',
+    'TaskOrderQuerySchema', 'TaskOrderMoveSchema',
     'UserSchema', 'UserWithScopesSchema', 'UserInputSchema', 'UserUpdateSchema', 'UserCreateResponseSchema', 'LoginResponseSchema', 'LoginSchema', 'WPLoginSchema',
     'UserByEmailQuerySchema', 'UserByWPIDQuerySchema','UserQuerySchema',
     'CompanySchema', 'CompanyInputSchema','DeleteCompanyQuerySchema', 'CompanyQuerySchema',
     'OrganizationSchema', 'OrganizationInputSchema', 'OrganizationUpdateSchema','OrganizationTreeSchema','OrganizationQuerySchema'
     'ObjectiveSchema', 'ObjectiveInputSchema', 'ObjectiveResponseSchema', 'ObjectivesListSchema',
-    'ProgressSchema', 'ProgressInputSchema',
+    'ProgressSchema', 'ProgressInputSchema', 'ProgressListQuerySchema',
     'AccessScopeSchema', 'AccessScopeInputSchema',
     'AccessUserSchema', 'OrgAccessSchema', 'AccessLevelInputSchema',
     'AISuggestInputSchema', 'JobIdSchema', 'AIResultSchema',
+    'ExportJobInputSchema', 'ExportJobSchema', 'ExportStreamQuerySchema',
 ]
@@ -7,14 +7,14 @@ class CompanySchema(SQLAlchemyAutoSchema):
         model = Company
         include_fk = True
         load_instance = True
-        exclude = ("is_deleted",)
+        exclude = ("is_deleted", "org_tree_version")
     id = fields.Integer(required=True, dump_only=True, allow_none=False)
 
 class CompanyInputSchema(SQLAlchemyAutoSchema):
     class Meta:
         model = Company
         load_instance = False
-        exclude = ("id", "is_deleted")
+        exclude = ("id", "is_deleted", "org_tree_version")
 
 class DeleteCompanyQuerySchema(Schema):
     force = fields.Bool(
@@ -0,0 +1,15 @@
+from marshmallow import Schema, fields, validate
+
+class ExportJobInputSchema(Schema):
+    format = fields.Str(required=True, validate=validate.OneOf(["excel", "yaml", "csv"]),
+                        metadata={"description": "エクスポート形式"})
+
+class ExportJobSchema(Schema):
+    job_id = fields.Str()
+    status = fields.Str()
+    format = fields.Str()
+    download_url = fields.Str(allow_none=True)
+
+class ExportStreamQuerySchema(Schema):
+    format = fields.Str(load_default="ndjson", validate=validate.OneOf(["ndjson", "yaml"]),
+                        metadata={"description": "ストリーム形式（ndjson: 1行1タスク / yaml: 1ドキュメント1タスク）"})
@@ -7,19 +7,20 @@ class ObjectiveSchema(SQLAlchemyAutoSchema):
         model = Objective
         load_instance = True
         include_fk = True
-        exclude = ("is_deleted",)
+        exclude = ("is_deleted", "latest_progress_id")
 
     id = fields.Integer(required=True, dump_only=True, allow_none=False)
     assigned_user_name = fields.String(dump_only=True)
     latest_progress = fields.String(dump_only=True, allow_none=True)
-    latest_report_date = fields.DateTime(dump_only=True, allow_none=True)
+    latest_report_date = fields.Date(dump_only=True, allow_none=True)
 
 class ObjectiveInputSchema(SQLAlchemyAutoSchema):
     class Meta:
         model = Objective
         load_instance = False
         include_fk = True
-        exclude = ("id", "created_by", "created_at", "display_order", "is_deleted")
+        exclude = ("id", "created_by", "created_at", "display_order", "is_deleted",
+                   "latest_progress_id", "latest_report_date")
 
     task_id = fields.Int(required=True)
     title = fields.Str(required=True)
@@ -31,7 +32,8 @@ class ObjectiveUpdateSchema(SQLAlchemyAutoSchema):
         model = Objective
         load_instance = False
         include_fk = True
-        exclude = ("id", "created_by", "created_at", "display_order", "is_deleted")
+        exclude = ("id", "created_by", "created_at", "display_order", "is_deleted",
+                   "latest_progress_id", "latest_report_date")
 
     task_id = fields.Int()
     title = fields.Str()
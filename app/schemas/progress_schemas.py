@@ -1,5 +1,6 @@
-from marshmallow import Schema, fields
+from marshmallow import Schema, fields, validate, validates_schema, ValidationError
 from app.constants import StatusEnum
+from app.status_registry import status_id_for
 from marshmallow_enum import EnumField
 
 class ProgressInputSchema(Schema):
@@ -9,9 +10,28 @@ class ProgressInputSchema(Schema):
     detail = fields.Str(required=True)
     report_date = fields.Str(required=True)
 
+    @validates_schema
+    def resolve_status_enum(self, data, **kwargs):
+        status_id = status_id_for(data["status"])
+        if status_id is None:
+            raise ValidationError("Invalid status value", field_name="status")
+        data["status_id"] = status_id
+
 class ProgressSchema(Schema):
     id = fields.Integer(required=True, dump_only=True, allow_none=False)
     status = fields.Str()
     detail = fields.Str()
     report_date = fields.Str()
     updated_by = fields.Str()
+
+class ProgressListQuerySchema(Schema):
+    limit = fields.Int(validate=validate.Range(min=1, max=500),
+                       metadata={"description": "1ページの件数（未指定時は全件）"})
+    cursor = fields.Str(metadata={"description": "前ページのレスポンスヘッダ X-Next-Cursor の値"})
+    date_from = fields.Date(data_key="from", metadata={"description": "報告日の下限（この日を含む 例: 2024-01-01）"})
+    date_to = fields.Date(data_key="to", metadata={"description": "報告日の上限（この日を含む 例: 2024-12-31）"})
+
+    @validates_schema
+    def validate_date_range(self, data, **kwargs):
+        if data.get("date_from") and data.get("date_to") and data["date_from"] > data["date_to"]:
+            raise ValidationError("from は to 以前の日付を指定してください", field_name="from")
@@ -5,3 +5,10 @@ class TaskOrderQuerySchema(Schema):
         required=True,
         metadata={"description": "タスク並び順を取得するユーザーのID"}
     )
+
+class TaskOrderMoveSchema(Schema):
+    task_id = fields.Int(required=True, metadata={"description": "移動するタスクのID"})
+    prev_task_id = fields.Int(load_default=None, allow_none=True,
+                              metadata={"description": "移動先の直前のタスクID（先頭に移動する場合は省略）"})
+    next_task_id = fields.Int(load_default=None, allow_none=True,
+                              metadata={"description": "移動先の直後のタスクID（末尾に移動する場合は省略）"})
@@ -1,40 +1,48 @@
-from marshmallow import Schema, fields, validates_schema, ValidationError
+from marshmallow import Schema, fields, validate, validates_schema, ValidationError, missing
+from webargs.fields import DelimitedList
 from marshmallow_enum import EnumField
 from marshmallow_sqlalchemy import SQLAlchemyAutoSchema
 from app.models import Task
 from app.constants import TaskAccessLevelEnum
 from app.models import TaskAccessUser, TaskAccessOrganization
-from app.constants import StatusEnum
-from app import db
-from app.models import Status
-from app.constants import StatusEnum
+from app.constants import StatusEnum, STATUS_LABELS
+from app.status_registry import status_id_for
 
 class TaskSchema(SQLAlchemyAutoSchema):
     class Meta:
         model = Task
         load_instance = True
         include_fk = True
-        exclude = ("is_deleted",)
+        exclude = ("is_deleted", "version")
     id = fields.Integer(required=True, dump_only=True, allow_none=False)
     user_access_level = fields.Str()
-    status = EnumField(StatusEnum, by_value=True, dump_only=True ,
-                       metadata={"type": "string", "enum": [e.value for e in StatusEnum]})
+    display_order = fields.Int(allow_none=True,
+                               metadata={"description": "タスク既定の表示順（ユーザー別の並び順は user_rank を参照）"})
+    user_rank = fields.Str(dump_only=True, allow_none=True,
+                           metadata={"description": "ログインユーザー別の並び順ランク（辞書順、未設定は null）"})
+    status = fields.Method("get_status", dump_only=True,
+                           metadata={"type": "string", "enum": [e.value for e in StatusEnum]})
 
     label = fields.Method("get_status_label", dump_only=True)
 
+    def get_status(self, obj):
+        # ステータス名は一覧の読み取り専用モデル（TaskRow）のみが持つ。持たない場合は項目ごと省略する
+        return getattr(obj, "status_name", None) or missing
+
     def get_status_label(self, obj):
-        from app.constants import STATUS_LABELS
         try:
-            return STATUS_LABELS[StatusEnum(obj.status.name)]
-        except Exception:
+            return STATUS_LABELS[StatusEnum(getattr(obj, "status_name", None))]
+        except ValueError:
             return None
 
+TASK_FIELD_NAMES = tuple(TaskSchema().fields)
+
 class TaskInputSchema(SQLAlchemyAutoSchema):
     class Meta:
         model = Task
         load_instance = False
         include_fk = True
-        exclude = ("id", "created_by", "created_at", "is_deleted")
+        exclude = ("id", "created_by", "created_at", "is_deleted", "version")
 
     title = fields.Str(required=True)
     description = fields.Str(load_default="")
@@ -46,17 +54,17 @@ class TaskInputSchema(SQLAlchemyAutoSchema):
     @validates_schema
     def resolve_status_enum(self, data, **kwargs):
         if "status" in data and data["status"] is not None:
-            status_obj = db.session.query(Status).filter_by(name=data["status"].value).first()
-            if not status_obj:
+            status_id = status_id_for(data["status"])
+            if status_id is None:
                 raise ValidationError("Invalid status value", field_name="status")
-            data["status_id"] = status_obj.id
+            data["status_id"] = status_id
 
 class TaskUpdateSchema(SQLAlchemyAutoSchema):
     class Meta:
         model = Task
         load_instance = False
         include_fk = True
-        exclude = ("id", "created_by", "created_at", "is_deleted")
+        exclude = ("id", "created_by", "created_at", "is_deleted", "version")
 
     title = fields.Str(required=False)
     description = fields.Str()
@@ -68,10 +76,10 @@ class TaskUpdateSchema(SQLAlchemyAutoSchema):
     @validates_schema
     def resolve_status_enum(self, data, **kwargs):
         if "status" in data and data["status"] is not None:
-            status_obj = db.session.query(Status).filter_by(name=data["status"].value).first()
-            if not status_obj:
+            status_id = status_id_for(data["status"])
+            if status_id is None:
                 raise ValidationError("Invalid status value", field_name="status")
-            data["status_id"] = status_obj.id
+            data["status_id"] = status_id
 
 
 class TaskCreateResponseSchema(Schema):
@@ -80,6 +88,58 @@ class TaskCreateResponseSchema(Schema):
 
 class TaskListResponseSchema(Schema):
     tasks = fields.List(fields.Nested(TaskSchema))
+    next_cursor = fields.Str(allow_none=True, metadata={"description": "次ページ取得用のカーソル（最終ページは null）"})
+
+def project_task_fields(tasks, projection):
+    """dump 済みのタスクを fields で指定された項目だけに絞り込む"""
+    return [
+        {key: task[key] for key in projection if key in task}
+        for task in tasks
+    ]
+
+class TaskListQuerySchema(Schema):
+    limit = fields.Int(validate=validate.Range(min=1, max=500),
+                       metadata={"description": "1ページの件数（未指定時は全件）"})
+    cursor = fields.Str(metadata={"description": "前ページの next_cursor"})
+    projection = DelimitedList(fields.Str(validate=validate.OneOf(TASK_FIELD_NAMES)), data_key="fields",
+                               metadata={"description": "返却するフィールド（カンマ区切り 例: id,title,status_id）"})
+
+# 一括作成・一括更新で1リクエストに含められるタスク数の上限
+BULK_TASK_LIMIT = 1000
+
+class TaskBulkItemSchema(Schema):
+    title = fields.Str(required=True, validate=validate.Length(min=1))
+    description = fields.Str(load_default="")
+    due_date = fields.Str(load_default=None)
+    status = EnumField(StatusEnum, by_value=True, load_default=None,
+                       metadata={"type": "string", "enum": [e.value for e in StatusEnum]})
+
+class TaskBulkCreateSchema(Schema):
+    tasks = fields.List(fields.Nested(TaskBulkItemSchema), required=True,
+                        validate=validate.Length(min=1, max=BULK_TASK_LIMIT))
+
+class TaskBulkUpdateItemSchema(Schema):
+    id = fields.Int(required=True)
+    title = fields.Str(validate=validate.Length(min=1))
+    description = fields.Str()
+    due_date = fields.Str()
+    status = EnumField(StatusEnum, by_value=True,
+                       metadata={"type": "string", "enum": [e.value for e in StatusEnum]})
+
+class TaskBulkUpdateSchema(Schema):
+    tasks = fields.List(fields.Nested(TaskBulkUpdateItemSchema), required=True,
+                        validate=validate.Length(min=1, max=BULK_TASK_LIMIT))
+
+    @validates_schema
+    def validate_unique_ids(self, data, **kwargs):
+        ids = [item["id"] for item in data.get("tasks", [])]
+        if len(ids) != len(set(ids)):
+            raise ValidationError("同じタスクIDが複数含まれています", field_name="tasks")
+
+class TaskBulkResponseSchema(Schema):
+    message = fields.Str()
+    count = fields.Int()
+    task_ids = fields.List(fields.Int())
 
 class OrderSchema(Schema):
     order = fields.List(fields.Int(), required=True)
@@ -10,13 +10,16 @@ class UserSchema(SQLAlchemyAutoSchema):
         model = User
         load_instance = True
         include_fk = True
-        exclude = ("password_hash",)
+        exclude = ("password_hash", "view_version")
     id = fields.Integer(required=True, dump_only=True, allow_none=False)
     organization_id = fields.Integer(required=True, allow_none=False)
     organization_name = fields.Method("get_org_name", required=True, dump_only=True, allow_none=False, metadata={"type": "string"})
     company_id = fields.Integer(required=True, allow_none=False)
 
     def get_org_name(self, obj):
+        # 一覧の読み取り専用モデル（UserRow）は組織名を列として持つ
+        if hasattr(obj, "organization_name"):
+            return obj.organization_name
         return obj.organization.name if obj.organization else None
     
 class UserWithScopesSchema(UserSchema):
@@ -27,7 +30,7 @@ class UserInputSchema(SQLAlchemyAutoSchema):
         model = User
         load_instance = False
         include_fk = True
-        exclude = ("id", "password_hash", "is_superuser")
+        exclude = ("id", "password_hash", "is_superuser", "view_version")
 
     name = fields.Str(required=True)
     email = fields.Str(required=True)
@@ -42,7 +45,7 @@ class UserUpdateSchema(SQLAlchemyAutoSchema):
         model = User
         load_instance = False
         include_fk = True
-        exclude = ("id", "password_hash", "is_superuser")
+        exclude = ("id", "password_hash", "is_superuser", "view_version")
 
     # すべて任意。ただし形式は検証する
     name = fields.Str(required=False)
@@ -0,0 +1,256 @@
+# app/seed_scale.py
+
+import random
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, UTC
+from sqlalchemy import func, insert, select
+from werkzeug.security import generate_password_hash
+from .models import (
+    db,
+    Company,
+    Organization,
+    OrganizationClosure,
+    User,
+    AccessScope,
+    Task,
+    UserTaskOrder,
+    Objective,
+    ProgressUpdate,
+    Status,
+    TaskAccessUser,
+    TaskAccessOrganization,
+)
+from .constants import OrgRoleEnum, TaskAccessLevelEnum
+from .permissions import invalidate_permission_cache
+from .org_tree import invalidate_organization_tree_cache
+from .services.progress_updates_service import refresh_latest_progress
+from .task_rank import evenly_spaced_ranks
+
+# 1回の executemany に渡す行数
+SEED_BATCH_SIZE = 5000
+
+# 生成データの日付の基準（seed が同じなら常に同じデータになるよう固定）
+SEED_BASE_DATE = date(2025, 1, 1)
+
+SHARED_ACCESS_LEVELS = (TaskAccessLevelEnum.VIEW, TaskAccessLevelEnum.EDIT, TaskAccessLevelEnum.FULL)
+
+
+@dataclass
+class SeedScaleOptions:
+    companies: int = 1
+    org_depth: int = 3
+    org_fanout: int = 3
+    users_per_org: int = 5
+    tasks_per_user: int = 5
+    objectives_per_task: int = 3
+    progress_per_objective: int = 3
+    acl_density: float = 0.2
+    seed: int = 42
+    password: str = "password"
+
+
+class _BulkWriter:
+    """
+    モデルごとに行をバッファし、SEED_BATCH_SIZE 件ごとに executemany で挿入する
+    外部キー制約を満たすよう、初めて追加された順（親テーブルが先）に全バッファをまとめて書き出す
+    """
+
+    def __init__(self, batch_size=SEED_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.buffers = {}
+        self.counts = {}
+
+    def add(self, model, row):
+        buffer = self.buffers.setdefault(model, [])
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        for model in list(self.buffers):
+            self._flush_model(model)
+
+    def _flush_model(self, model):
+        rows = self.buffers.get(model)
+        if rows:
+            db.session.execute(insert(model.__table__), rows)
+            self.counts[model.__tablename__] = self.counts.get(model.__tablename__, 0) + len(rows)
+            self.buffers[model] = []
+
+
+class _IdAllocator:
+    """既存データの最大IDの続きから採番する（RETURNING を使わずに一括挿入するため）"""
+
+    def __init__(self, model):
+        self.next_id = (db.session.scalar(select(func.max(model.id))) or 0) + 1
+
+    def __call__(self):
+        allocated = self.next_id
+        self.next_id += 1
+        return allocated
+
+
+def seed_scale_dataset(options: SeedScaleOptions):
+    """
+    大規模テナントを想定した合成データを一括挿入する（同じ seed なら同じデータ）
+
+    会社ごとに深さ org_depth・分岐数 org_fanout の組織ツリーを作り、各組織に users_per_org 人、
+    各ユーザーに tasks_per_user 件のタスク、各タスクに objectives_per_task 件のオブジェクティブ、
+    各オブジェクティブに progress_per_objective 件の進捗を作成する。
+    各タスクは acl_density の確率で同じ会社の他ユーザーに、同じ確率で他組織に共有される。
+    戻り値: テーブル名ごとの挿入件数と所要秒数
+    """
+    started = time.perf_counter()
+    rng = random.Random(options.seed)
+    writer = _BulkWriter()
+    base_time = datetime(SEED_BASE_DATE.year, SEED_BASE_DATE.month, SEED_BASE_DATE.day, tzinfo=UTC)
+    status_ids = list(db.session.scalars(select(Status.id).order_by(Status.id))) or [None]
+    password_hash = generate_password_hash(options.password)
+    run_tag = f"s{options.seed}-{_IdAllocator(Company).next_id}"
+
+    ids = {model: _IdAllocator(model) for model in (
+        Company, Organization, User, AccessScope, Task, UserTaskOrder, Objective, ProgressUpdate,
+        TaskAccessUser, TaskAccessOrganization,
+    )}
+    first_objective_id = ids[Objective].next_id
+    task_ranks = evenly_spaced_ranks(options.tasks_per_user)
+
+    for company_index in range(options.companies):
+        company_id = ids[Company]()
+        writer.add(Company, {'id': company_id, 'name': f"Scale {run_tag} Company {company_index}", 'is_deleted': False})
+
+        org_ids = _seed_organizations(writer, ids, company_id, options)
+        users_by_org = _seed_users(writer, ids, org_ids, options, password_hash, f"{run_tag}-c{company_index}")
+        company_users = [user_id for users in users_by_org.values() for user_id in users]
+
+        for org_id, user_ids in users_by_org.items():
+            for user_id in user_ids:
+                for task_index in range(options.tasks_per_user):
+                    task_id = ids[Task]()
+                    writer.add(Task, {
+                        'id': task_id,
+                        'title': f"Task {user_id}-{task_index}",
+                        'description': "",
+                        'due_date': SEED_BASE_DATE + timedelta(days=rng.randrange(365)),
+                        'status_id': rng.choice(status_ids),
+                        'created_by': user_id,
+                        'organization_id': org_id,
+                        'created_at': base_time + timedelta(minutes=task_id),
+                        'is_deleted': False,
+                    })
+                    writer.add(UserTaskOrder, {
+                        'id': ids[UserTaskOrder](), 'user_id': user_id, 'task_id': task_id,
+                        'display_order': task_ranks[task_index],
+                    })
+                    _seed_task_acl(writer, ids, rng, task_id, user_id, org_id, company_users, org_ids, options)
+                    _seed_objectives(writer, ids, rng, task_id, user_id, status_ids, base_time, options)
+
+    writer.flush()
+    # 今回生成したオブジェクティブの最新進捗ポインタをまとめて設定する
+    refresh_latest_progress(Objective.id >= first_objective_id)
+    db.session.commit()
+    invalidate_permission_cache()
+    invalidate_organization_tree_cache()
+
+    return {'counts': writer.counts, 'seconds': time.perf_counter() - started}
+
+
+def _seed_organizations(writer, ids, company_id, options):
+    """幅優先で組織ツリーと閉包テーブルの行を作成し、組織IDを返す"""
+    org_ids = []
+    ancestors_of = {}
+    level_nodes = [None]
+    for level in range(1, options.org_depth + 1):
+        next_level = []
+        for parent_id in level_nodes:
+            for child_index in range(1 if parent_id is None else options.org_fanout):
+                org_id = ids[Organization]()
+                writer.add(Organization, {
+                    'id': org_id,
+                    'name': f"Org {org_id}",
+                    'org_code': f"org{org_id}",
+                    'company_id': company_id,
+                    'parent_id': parent_id,
+                    'level': level,
+                })
+                ancestors_of[org_id] = [org_id] + (ancestors_of[parent_id] if parent_id else [])
+                for depth, ancestor_id in enumerate(ancestors_of[org_id]):
+                    writer.add(OrganizationClosure, {'ancestor_id': ancestor_id, 'descendant_id': org_id, 'depth': depth})
+                org_ids.append(org_id)
+                next_level.append(org_id)
+        level_nodes = next_level
+    return org_ids
+
+
+def _seed_users(writer, ids, org_ids, options, password_hash, tag):
+    """
+    組織ごとにユーザーを作成する
+    ルート組織の先頭ユーザーは SYSTEM_ADMIN、他組織の先頭ユーザーは ORG_ADMIN、それ以外は MEMBER
+    """
+    users_by_org = {}
+    for org_index, org_id in enumerate(org_ids):
+        users_by_org[org_id] = []
+        for user_index in range(options.users_per_org):
+            user_id = ids[User]()
+            writer.add(User, {
+                'id': user_id,
+                'name': f"User {user_id}",
+                'email': f"scale-{tag}-u{user_id}@example.com",
+                'password_hash': password_hash,
+                'is_superuser': False,
+                'organization_id': org_id,
+            })
+            if user_index == 0:
+                role = OrgRoleEnum.SYSTEM_ADMIN if org_index == 0 else OrgRoleEnum.ORG_ADMIN
+            else:
+                role = OrgRoleEnum.MEMBER
+            writer.add(AccessScope, {'id': ids[AccessScope](), 'user_id': user_id, 'organization_id': org_id, 'role': role})
+            users_by_org[org_id].append(user_id)
+    return users_by_org
+
+
+def _seed_task_acl(writer, ids, rng, task_id, owner_id, owner_org_id, company_users, org_ids, options):
+    if len(company_users) > 1 and rng.random() < options.acl_density:
+        grantee = rng.choice(company_users)
+        if grantee != owner_id:
+            writer.add(TaskAccessUser, {
+                'id': ids[TaskAccessUser](), 'task_id': task_id, 'user_id': grantee,
+                'access_level': rng.choice(SHARED_ACCESS_LEVELS),
+            })
+    if len(org_ids) > 1 and rng.random() < options.acl_density:
+        org_id = rng.choice(org_ids)
+        if org_id != owner_org_id:
+            writer.add(TaskAccessOrganization, {
+                'id': ids[TaskAccessOrganization](), 'task_id': task_id, 'organization_id': org_id,
+                'access_level': rng.choice(SHARED_ACCESS_LEVELS),
+            })
+
+
+def _seed_objectives(writer, ids, rng, task_id, user_id, status_ids, base_time, options):
+    for objective_index in range(options.objectives_per_task):
+        objective_id = ids[Objective]()
+        writer.add(Objective, {
+            'id': objective_id,
+            'task_id': task_id,
+            'title': f"Objective {task_id}-{objective_index}",
+            'due_date': SEED_BASE_DATE + timedelta(days=rng.randrange(365)),
+            'assigned_user_id': user_id,
+            'display_order': objective_index,
+            'status_id': rng.choice(status_ids),
+            'created_by': user_id,
+            'created_at': base_time + timedelta(minutes=objective_id),
+            'is_deleted': False,
+        })
+        for progress_index in range(options.progress_per_objective):
+            progress_id = ids[ProgressUpdate]()
+            writer.add(ProgressUpdate, {
+                'id': progress_id,
+                'objective_id': objective_id,
+                'status_id': rng.choice(status_ids),
+                'detail': f"Progress {objective_id}-{progress_index}",
+                'report_date': SEED_BASE_DATE + timedelta(days=progress_index),
+                'updated_by': user_id,
+                'created_at': base_time + timedelta(minutes=progress_id),
+                'is_deleted': False,
+            })
@@ -0,0 +1,157 @@
+# app/serializers.py
+"""
+一覧レスポンス用のコンパイル済みシリアライザ
+
+marshmallow の dump はフィールドごとに get_value → serialize を経由するため、数千行規模の一覧では
+それ自体が支配的なコストになる。ここではスキーマの dump_fields を一度だけ読み取り、
+フィールドの並びを展開した専用の dump 関数をコード生成してスキーマごとにキャッシュする。
+
+- Integer / String / Boolean 等は値をそのまま返す（読み取りモデル・ORM の値は型が確定しているため）
+- Date / DateTime（ISO 形式）は isoformat()、EnumField / Enum は value（by_value でなければ name）
+- Method は スキーマの bound method を直接呼び出す（missing を返した項目は出力しない）
+- Nested / List(Nested) は入れ子のスキーマを同様にコンパイルする（再帰スキーマも可）
+- 上記以外のフィールドは marshmallow の _serialize にそのまま委譲する
+
+pre_dump / post_dump 等のフックを持つスキーマは、出力が変わらないよう schema.dump に委譲する。
+スキーマ定義（OpenAPI ドキュメント・入力検証）は引き続き marshmallow のものを使う。
+"""
+
+from collections.abc import Mapping
+
+from flask import current_app
+from marshmallow import Schema, fields, missing
+from marshmallow_enum import EnumField
+
+# 値をそのまま出力するフィールド型（サブクラスは独自の _serialize を持ち得るため完全一致で判定する）
+_PASSTHROUGH_FIELDS = (fields.Integer, fields.String, fields.Boolean, fields.Raw)
+
+_DUMP_HOOKS = ("pre_dump", "post_dump")
+
+_serializers = {}
+
+
+def get_serializer(schema):
+    """スキーマ（クラスまたはインスタンス）に対応する CompiledSerializer を返す（同じ構成のスキーマでは共有）"""
+    if isinstance(schema, type):
+        schema = schema()
+    key = (type(schema), schema.only and frozenset(schema.only), frozenset(schema.exclude))
+    serializer = _serializers.get(key)
+    if serializer is None:
+        serializer = _serializers[key] = CompiledSerializer(schema)
+    return serializer
+
+
+def dump(schema, data, many=False):
+    """schema.dump(data, many=many) と同じ結果を、コンパイル済みの dump 関数で返す"""
+    return get_serializer(schema).dump(data, many=many)
+
+
+def fast_response(schema, data, many=False, status=200, headers=None):
+    """コンパイル済みシリアライザで dump し、アプリの JSON プロバイダで Response を組み立てる"""
+    response = current_app.json.response(dump(schema, data, many=many))
+    response.status_code = status
+    if headers:
+        response.headers.update(headers)
+    return response
+
+
+class CompiledSerializer:
+    """1つのスキーマに対するコンパイル済み dump 関数（属性アクセス用と Mapping 用を初回利用時に生成）"""
+
+    def __init__(self, schema: Schema):
+        self.schema = schema
+        self._use_schema_dump = any(schema._hooks[hook] for hook in _DUMP_HOOKS)
+        self._dump_object = None
+        self._dump_mapping = None
+
+    def dump(self, data, many=False):
+        if self._use_schema_dump:
+            return self.schema.dump(data, many=many)
+        if many:
+            return [self.dump_one(obj) for obj in data]
+        return self.dump_one(data)
+
+    def dump_one(self, obj):
+        if isinstance(obj, Mapping):
+            if self._dump_mapping is None:
+                self._dump_mapping = self._compile(mapping=True)
+            return self._dump_mapping(obj)
+        if self._dump_object is None:
+            self._dump_object = self._compile(mapping=False)
+        return self._dump_object(obj)
+
+    def _compile(self, mapping):
+        namespace = {"_missing": missing}
+        lines = ["def dump(obj):", "    out = {}"]
+        for index, (name, field) in enumerate(self.schema.dump_fields.items()):
+            key = field.data_key if field.data_key is not None else name
+            attr = field.attribute or name
+
+            if isinstance(field, fields.Method):
+                method = getattr(self.schema, field.serialize_method_name, None) \
+                    if field.serialize_method_name else None
+                if method is None:
+                    continue
+                namespace[f"m{index}"] = method
+                lines.append(f"    v = m{index}(obj)")
+                lines.append(f"    if v is not _missing: out[{key!r}] = v")
+                continue
+
+            if field.dump_default is not missing or "." in attr or isinstance(field, fields.Function):
+                # 既定値・入れ子属性の解決や、obj 全体を受け取る Function は marshmallow に任せる
+                namespace[f"f{index}"] = field
+                lines.append(f"    v = f{index}.serialize({attr!r}, obj)")
+                lines.append(f"    if v is not _missing: out[{key!r}] = v")
+                continue
+
+            getter = f"obj.get({attr!r}, _missing)" if mapping else f"getattr(obj, {attr!r}, _missing)"
+            expression = self._value_expression(field, "v", f"f{index}", attr, namespace)
+            lines.append(f"    v = {getter}")
+            if expression == "v":
+                lines.append(f"    if v is not _missing: out[{key!r}] = v")
+            else:
+                lines.append(f"    if v is not _missing: out[{key!r}] = None if v is None else {expression}")
+        lines.append("    return out")
+
+        exec("\n".join(lines), namespace)
+        return namespace["dump"]
+
+    @staticmethod
+    def _value_expression(field, var, name, attr, namespace):
+        """None 以外の値 var を出力値に変換する式を返す"""
+        field_type = type(field)
+        if field_type in _PASSTHROUGH_FIELDS:
+            return var
+        if field_type in (fields.Date, fields.DateTime) and field.format in (None, "iso"):
+            return f"{var}.isoformat()"
+        if isinstance(field, EnumField):
+            return f"{var}.value" if field.dump_by == EnumField.VALUE else f"{var}.name"
+        if field_type is fields.Enum:
+            return f"{var}.value" if field.by_value is True else f"{var}.name"
+        if field_type is fields.Nested:
+            namespace[name] = _NestedSerializer(field)
+            return f"{name}({var})"
+        if field_type is fields.List:
+            inner = CompiledSerializer._value_expression(field.inner, "i", f"{name}i", attr, namespace)
+            if inner == "i":
+                return f"list({var})"
+            return f"[None if i is None else {inner} for i in {var}]"
+        namespace[name] = field
+        return f"{name}._serialize({var}, {attr!r}, obj)"
+
+
+class _NestedSerializer:
+    """Nested フィールドの入れ子スキーマを初回利用時に解決する（自己参照するスキーマのため遅延させる）"""
+
+    __slots__ = ("field", "many", "serializer")
+
+    def __init__(self, field):
+        self.field = field
+        self.many = field.many
+        self.serializer = None
+
+    def __call__(self, value):
+        if self.serializer is None:
+            self.serializer = get_serializer(self.field.schema)
+        return self.serializer.dump(value, many=self.many)
+
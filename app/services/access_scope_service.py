@@ -2,6 +2,7 @@
 
 from ..models import db, User, AccessScope, Organization
 from ..constants import OrgRoleEnum
+from ..permissions import invalidate_permission_cache
 from ..service_errors import (
     ServiceValidationError,
     ServicePermissionError,
@@ -31,6 +32,7 @@ def add_access_scope_to_user(user_id, data):
         if existing_scope.role != OrgRoleEnum(role):
             existing_scope.role = OrgRoleEnum(role)
             db.session.commit()
+            invalidate_permission_cache()
             return {'message': 'アクセススコープを更新しました'}
         return {'message': 'すでにこのアクセススコープは登録されています'}
 
@@ -42,6 +44,7 @@ def add_access_scope_to_user(user_id, data):
     new_scope = AccessScope(user_id=user.id, organization_id=org_id, role=role_enum)
     db.session.add(new_scope)
     db.session.commit()
+    invalidate_permission_cache()
     return {'message': 'アクセススコープを追加しました'}
 
 def delete_access_scope(scope_id):
@@ -51,4 +54,5 @@ def delete_access_scope(scope_id):
 
     db.session.delete(scope)
     db.session.commit()
+    invalidate_permission_cache()
     return {'message': 'アクセススコープを削除しました'}
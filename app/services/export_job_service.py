@@ -0,0 +1,134 @@
+# app/services/export_job_service.py
+
+import os
+import shutil
+import time
+import uuid
+from celery.result import AsyncResult
+from flask import current_app
+from app.export.export_tasks import run_task_export
+from celery_app import celery
+from app.models import db
+from app.services.task_export_service import TaskDataExporter
+from app.service_errors import ServiceValidationError, ServiceNotFoundError
+
+# 形式ごとの拡張子と MIME タイプ
+EXPORT_FORMATS = {
+    "excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "yaml": ("yaml", "application/x-yaml"),
+    "csv": ("csv", "text/csv"),
+}
+
+
+def enqueue_export_job(data: dict, user):
+    """
+    エクスポート処理をCeleryにキューイング
+    """
+    export_format = data.get("format")
+    if export_format not in EXPORT_FORMATS:
+        raise ServiceValidationError(f"無効な format: {export_format}")
+
+    # ジョブの所有者は、ユーザー別ディレクトリに置くジョブファイルで記録する（状態を返す前に確認する）
+    job_id = str(uuid.uuid4())
+    job_path = _job_path(job_id, user.id)
+    os.makedirs(os.path.dirname(job_path), exist_ok=True)
+    with open(job_path, "w", encoding="utf-8") as f:
+        f.write(export_format)
+
+    run_task_export.apply_async((user.id, export_format), task_id=job_id)
+    return {"job_id": job_id}
+
+
+def get_export_job(job_id: str, user):
+    """
+    Celeryで実行中のエクスポート処理の状態を取得（他ユーザーのジョブ・期限切れのジョブは存在しない扱い）
+    """
+    if not os.path.exists(_job_path(job_id, user.id)):
+        raise ServiceNotFoundError("エクスポートジョブが見つかりません")
+
+    result = AsyncResult(job_id, app=celery)
+
+    if result.state == "PENDING":
+        return {"job_id": job_id, "status": "processing"}
+    elif result.state == "FAILURE":
+        raise ServiceValidationError(str(result.result))
+    elif result.state == "SUCCESS":
+        data = result.result
+        if data.get("user_id") != user.id:
+            raise ServiceNotFoundError("エクスポートジョブが見つかりません")
+        return {"job_id": job_id, "status": data["status"], "format": data["format"]}
+    else:
+        return {"job_id": job_id, "status": result.state}
+
+
+def get_export_artifact(job_id: str, user):
+    """
+    完了したエクスポートジョブの成果物のパス・ダウンロード名・MIME タイプを返す
+    """
+    job = get_export_job(job_id, user)
+    if job["status"] != "success":
+        raise ServiceValidationError("エクスポートはまだ完了していません")
+
+    extension, mimetype = EXPORT_FORMATS[job["format"]]
+    path = _artifact_path(job_id, user.id, extension)
+    if not os.path.exists(path):
+        raise ServiceNotFoundError("エクスポートファイルが見つかりません")
+    return {"path": path, "download_name": f"tasks.{extension}", "mimetype": mimetype}
+
+
+def write_export_artifact(job_id: str, user_id: int, export_format: str):
+    """
+    エクスポートを実行し、成果物をストレージディレクトリに書き出す（Celeryタスクから呼び出す）
+    """
+    extension, _ = EXPORT_FORMATS[export_format]
+    path = _artifact_path(job_id, user_id, extension)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    exporter = TaskDataExporter(user_id, db)
+    tmp_path = f"{path}.tmp"
+    if export_format == "excel":
+        source = exporter.export_as_excel()
+        with source, open(tmp_path, "wb") as f:
+            shutil.copyfileobj(source, f)
+    elif export_format == "yaml":
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(exporter.export_as_yaml())
+    else:
+        with open(tmp_path, "w", encoding="utf-8-sig", newline="") as f:
+            exporter.export_as_csv(f)
+    os.replace(tmp_path, path)
+
+    return os.path.basename(path)
+
+
+def cleanup_expired_exports(max_age_seconds=None):
+    """
+    保持期間を過ぎたジョブファイル・成果物（書き出し途中の一時ファイルを含む）を削除する
+    戻り値: 削除したファイル数
+    """
+    if max_age_seconds is None:
+        max_age_seconds = current_app.config["EXPORT_RETENTION_SECONDS"]
+    storage_dir = current_app.config["EXPORT_STORAGE_DIR"]
+    cutoff = time.time() - max_age_seconds
+
+    removed = 0
+    for dirpath, _, filenames in os.walk(storage_dir):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except FileNotFoundError:
+                continue
+    return removed
+
+
+def _job_path(job_id, user_id):
+    storage_dir = current_app.config["EXPORT_STORAGE_DIR"]
+    return os.path.join(storage_dir, str(user_id), f"{os.path.basename(job_id)}.job")
+
+
+def _artifact_path(job_id, user_id, extension):
+    storage_dir = current_app.config["EXPORT_STORAGE_DIR"]
+    return os.path.join(storage_dir, str(user_id), f"{os.path.basename(job_id)}.{extension}")
@@ -1,30 +1,22 @@
 # app/services/objectives_service.py
 from datetime import datetime
 from app.models import db, Objective, Task, User, ProgressUpdate
-from app.utils import check_task_access
+from app.read_models import ObjectiveRow
+from app.access_context import load_task_context, load_objective_context
 from app.constants import TaskAccessLevelEnum, StatusEnum, STATUS_LABELS
+from app.status_registry import is_valid_status_id
 from app.service_errors import (
     ServiceValidationError,
     ServicePermissionError,
-    ServiceNotFoundError,
 )
 from sqlalchemy.orm import aliased
-from sqlalchemy import func
 
 
 
-def get_task_by_id(task_id):
-    return Task.query.filter_by(id=task_id, is_deleted=False).first()
-
-
 def get_task_by_id_with_deleted(task_id):
     return db.session.get(Task, task_id)
 
 
-def get_objective_by_id(objective_id):
-    return Objective.query.filter_by(id=objective_id, is_deleted=False).first()
-
-
 def get_objective_by_id_with_deleted(objective_id):
     return db.session.get(Objective, objective_id)
 
@@ -36,10 +28,8 @@ def create_objective(data, user):
     if not title or not task_id:
         raise ServiceValidationError('タイトル・タスクIDは必須です')
 
-    task = get_task_by_id(task_id)
-    if not task:
-        raise ServiceNotFoundError('タスクが見つかりません')
-    if not check_task_access(user, task, TaskAccessLevelEnum.EDIT):
+    context = load_task_context(task_id, user)
+    if not context.has_level(TaskAccessLevelEnum.EDIT):
         raise ServicePermissionError('このタスクにオブジェクティブを追加する権限がありません')
 
     due_date = None
@@ -71,15 +61,10 @@ def create_objective(data, user):
 
 
 def update_objective(objective_id, data, user):
-    objective = get_objective_by_id(objective_id)
-    if not objective:
-        raise ServiceNotFoundError('オブジェクティブが見つかりません')
-    task = get_task_by_id(objective.task_id)
-    if not task:
-        raise ServiceNotFoundError('タスクが見つかりません')
-
-    if not check_task_access(user, task, TaskAccessLevelEnum.EDIT):
+    context = load_objective_context(objective_id, user)
+    if not context.has_level(TaskAccessLevelEnum.EDIT):
         raise ServicePermissionError('編集権限がありません')
+    objective = context.objective
 
     objective.title = data.get('title', objective.title)
     if 'due_date' in data:
@@ -101,43 +86,26 @@ def update_objective(objective_id, data, user):
         }
 
 def get_objectives_for_task(task_id, user):
-    task = get_task_by_id(task_id)
-    if not task:
-        raise ServiceNotFoundError('タスクが見つかりません')
-    if not check_task_access(user, task, TaskAccessLevelEnum.VIEW):
+    task = get_viewable_task(task_id, user)
+    return list_objectives(task.id)
+
+def get_viewable_task(task_id, user):
+    """閲覧権限を確認したうえでタスクを返す（オブジェクティブ一覧の ETag 確認にも使う）"""
+    context = load_task_context(task_id, user)
+    if not context.has_level(TaskAccessLevelEnum.VIEW):
         raise ServicePermissionError('閲覧権限がありません')
-    
-    # 最新のProgressUpdateのサブクエリ
-    latest_progress_subquery = db.session.query(
-        ProgressUpdate.objective_id,
-        ProgressUpdate.detail.label('latest_progress'),
-        ProgressUpdate.report_date.label('latest_report_date'),
-        func.row_number().over(
-            partition_by=ProgressUpdate.objective_id,
-            order_by=ProgressUpdate.report_date.desc()
-        ).label('rn')
-    ).filter(
-        ProgressUpdate.is_deleted == False
-    ).subquery()
-    
-    # 最新の1件のみを取得するサブクエリ
-    latest_progress_filtered = db.session.query(
-        latest_progress_subquery.c.objective_id,
-        latest_progress_subquery.c.latest_progress,
-        latest_progress_subquery.c.latest_report_date
-    ).filter(
-        latest_progress_subquery.c.rn == 1
-    ).subquery()
-    
-    # メインクエリ
-    objectives = db.session.query(Objective)\
+    return context.task
+
+def list_objectives(task_id):
+    """タスクのオブジェクティブ一覧（権限確認は呼び出し側で行う）"""
+    # 最新進捗は Objective.latest_progress_id（非正規化ポインタ）から主キーで結合する
+    # ORM エンティティではなく列の値から読み取り専用モデルを組み立てる
+    rows = db.session.query(*ObjectiveRow.columns())\
         .outerjoin(User, Objective.assigned_user_id == User.id)\
-        .outerjoin(latest_progress_filtered, 
-                  Objective.id == latest_progress_filtered.c.objective_id)\
+        .outerjoin(ProgressUpdate, ProgressUpdate.id == Objective.latest_progress_id)\
         .add_columns(
             User.name.label('assigned_user_name'),
-            latest_progress_filtered.c.latest_progress,
-            latest_progress_filtered.c.latest_report_date
+            ProgressUpdate.detail.label('latest_progress'),
         )\
         .filter(
             Objective.task_id == task_id,
@@ -145,43 +113,23 @@ def get_objectives_for_task(task_id, user):
         )\
         .order_by(Objective.display_order)\
         .all()
-    
-    # 結果を整形
-    objective_list = []
-    for obj_data in objectives:
-        objective = obj_data[0]  # Objectiveインスタンス
-        # 追加データを動的に設定
-        objective.assigned_user_name = obj_data[1]
-        objective.latest_progress = obj_data[2]
-        objective.latest_report_date = obj_data[3]
-        objective_list.append(objective)
-    
+
+    objective_list = [ObjectiveRow(*row) for row in rows]
     return {'objectives': objective_list}
 def get_objective(objective_id, user):
-    objective = get_objective_by_id(objective_id)
-    if not objective:
-        raise ServiceNotFoundError('オブジェクティブが見つかりません')
-
-    task = get_task_by_id(objective.task_id)
-    if not task:
-        raise ServiceNotFoundError('タスクが見つかりません')
-    if not check_task_access(user, task, TaskAccessLevelEnum.VIEW):
+    context = load_objective_context(objective_id, user)
+    if not context.has_level(TaskAccessLevelEnum.VIEW):
         raise ServicePermissionError('閲覧権限がありません')
 
-    return objective
+    return context.objective
 
 
 def delete_objective(objective_id, user):
-    objective = get_objective_by_id(objective_id)
-    if not objective:
-        raise ServiceNotFoundError('オブジェクティブが見つかりません')
-    task = get_task_by_id(objective.task_id)
-    if not task:
-        raise ServiceNotFoundError('タスクが見つかりません')
-
-    if not check_task_access(user, task, TaskAccessLevelEnum.EDIT):
+    context = load_objective_context(objective_id, user)
+    if not context.has_level(TaskAccessLevelEnum.EDIT):
         raise ServicePermissionError('削除権限がありません')
 
+    objective, task = context.objective, context.task
     objective.soft_delete()
     db.session.commit()
 
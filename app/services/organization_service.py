@@ -1,5 +1,6 @@
-from app.models import db, Organization
-from flask import jsonify, g
+from app.models import db, Organization, OrganizationClosure
+from flask import g
+from sqlalchemy import insert
 from sqlalchemy.exc import IntegrityError
 from app.service_errors import (
     ServiceValidationError,
@@ -7,7 +8,10 @@ from app.service_errors import (
     ServicePermissionError,
     ServiceNotFoundError,
 )
-from app.utils import check_org_access, get_descendant_organizations
+from app.utils import check_org_access
+from app.permissions import invalidate_permission_cache
+from app.org_tree import get_organization_tree_index
+from app.read_models import OrganizationRow
 from app.constants import OrgRoleEnum
 
 
@@ -50,7 +54,10 @@ def create_organization(name, org_code, company_id=None, parent_id=None):
         level=level
     )
     db.session.add(org)
+    db.session.flush()
+    _add_closure_paths(org.id, org.parent_id)
     db.session.commit()
+    invalidate_permission_cache()
     return org
 
 
@@ -67,16 +74,16 @@ def get_organizations(current_user, company_id=None):
     ユーザーの権限に基づいてアクセス可能な組織一覧を返す
     """
 
-    # ベースクエリ作成
-    query = Organization.query
+    # ベースクエリ作成（ORM エンティティではなく列の値から読み取り専用モデルを組み立てる）
+    query = db.session.query(*OrganizationRow.columns()).order_by(Organization.id)
     if company_id:
-        query = query.filter_by(company_id=company_id)
+        query = query.filter(Organization.company_id == company_id)
     
     # 全組織データ取得
-    all_orgs = query.all()
+    all_orgs = [OrganizationRow(*row) for row in query.all()]
     
     # ユーザーがアクセス可能な組織をフィルタリング
-    accessible_orgs = _filter_organizations_by_access(current_user, all_orgs)
+    accessible_orgs = _filter_organizations_by_access(current_user, all_orgs, company_id)
     
     return accessible_orgs
 
@@ -100,9 +107,11 @@ def update_organization(org_id, name=None, parent_id=None):
             org.level = parent.level + 1
         else:
             org.level = 1
+        _move_closure_subtree(org.id, parent_id)
         org.parent_id = parent_id
 
     db.session.commit()
+    invalidate_permission_cache()
     return org
 
 
@@ -115,141 +124,163 @@ def delete_organization(org_id):
     if has_children:
         raise ServiceValidationError("子組織が存在するため削除できません。")
 
+    OrganizationClosure.query.filter_by(descendant_id=org_id).delete(synchronize_session=False)
     db.session.delete(org)
     db.session.commit()
+    invalidate_permission_cache()
     return True, "削除成功"
 
 
+def rebuild_organization_closure():
+    """
+    organization.parent_id から組織閉包テーブルを再構築する（既存データの移行用）
+    """
+    parent_map = dict(db.session.query(Organization.id, Organization.parent_id).all())
+
+    rows = []
+    for org_id in parent_map:
+        current, depth, visited = org_id, 0, set()
+        while current is not None and current not in visited:
+            rows.append({'ancestor_id': current, 'descendant_id': org_id, 'depth': depth})
+            visited.add(current)
+            current = parent_map.get(current)
+            depth += 1
+
+    OrganizationClosure.query.delete(synchronize_session=False)
+    if rows:
+        db.session.execute(insert(OrganizationClosure), rows)
+    db.session.commit()
+    invalidate_permission_cache()
+    return len(rows)
+
+
+def _add_closure_paths(org_id, parent_id):
+    """
+    新規組織について、自身へのパスと親の祖先すべてからのパスを閉包テーブルに追加する
+    """
+    rows = [{'ancestor_id': org_id, 'descendant_id': org_id, 'depth': 0}]
+    if parent_id:
+        ancestors = (
+            db.session.query(OrganizationClosure.ancestor_id, OrganizationClosure.depth)
+            .filter(OrganizationClosure.descendant_id == parent_id)
+            .all()
+        )
+        rows.extend(
+            {'ancestor_id': ancestor_id, 'descendant_id': org_id, 'depth': depth + 1}
+            for ancestor_id, depth in ancestors
+        )
+    db.session.execute(insert(OrganizationClosure), rows)
+
+
+def _move_closure_subtree(org_id, new_parent_id):
+    """
+    org_id 以下のサブツリーを new_parent_id の下へ付け替え、閉包テーブルを更新する
+    """
+    subtree = (
+        db.session.query(OrganizationClosure.descendant_id, OrganizationClosure.depth)
+        .filter(OrganizationClosure.ancestor_id == org_id)
+        .all()
+    ) or [(org_id, 0)]
+    subtree_ids = [descendant_id for descendant_id, _ in subtree]
+    if new_parent_id in subtree_ids:
+        raise ServiceValidationError("自身または下位組織を親組織に指定することはできません。")
+
+    old_ancestor_ids = [
+        ancestor_id for (ancestor_id,) in
+        db.session.query(OrganizationClosure.ancestor_id)
+        .filter(
+            OrganizationClosure.descendant_id == org_id,
+            OrganizationClosure.ancestor_id != org_id,
+        )
+        .all()
+    ]
+    if old_ancestor_ids:
+        OrganizationClosure.query.filter(
+            OrganizationClosure.descendant_id.in_(subtree_ids),
+            OrganizationClosure.ancestor_id.in_(old_ancestor_ids),
+        ).delete(synchronize_session=False)
+
+    if new_parent_id is None:
+        return
+
+    new_ancestors = (
+        db.session.query(OrganizationClosure.ancestor_id, OrganizationClosure.depth)
+        .filter(OrganizationClosure.descendant_id == new_parent_id)
+        .all()
+    )
+    rows = [
+        {'ancestor_id': ancestor_id, 'descendant_id': descendant_id, 'depth': a_depth + d_depth + 1}
+        for ancestor_id, a_depth in new_ancestors
+        for descendant_id, d_depth in subtree
+    ]
+    if rows:
+        db.session.execute(insert(OrganizationClosure), rows)
+
+
 def get_organization_tree(current_user, company_id=None):
     """
-    Organization.to_dict() を使ってツリー構造を再帰的に構築する
+    キャッシュ済みの組織ツリーインデックスからツリー構造を構築する
     ユーザーの権限と所属組織に基づいてフィルタリングを行う
     """
-    # ベースクエリ作成
-    orgs = Organization.query
-    if company_id:
-        orgs = orgs.filter_by(company_id=company_id)
-    
-    # 全組織データ取得
-    all_orgs = orgs.all()
-    
-    # ユーザーがアクセス可能な組織をフィルタリング
-    accessible_orgs = _filter_organizations_by_access(current_user, all_orgs)
-    
-    if not accessible_orgs:
-        return jsonify([])
-    
-    # 各 org を dict に変換し、children を追加
-    org_map = {}
-    for org in accessible_orgs:
-        org_dict = org.to_dict()
-        org_dict['children'] = []
-        org_map[org.id] = org_dict
-
-    # ツリー構造を作成
-    root_nodes = []
-    for org in org_map.values():
-        parent_id = org['parent_id']
-        if parent_id and parent_id in org_map:
-            org_map[parent_id]['children'].append(org)
-        else:
-            root_nodes.append(org)
-
-    return jsonify(root_nodes)
+    index = get_organization_tree_index(company_id)
+    accessible_ids = _get_accessible_org_ids(current_user, index)
+    return index.render(accessible_ids)
 
 
 def get_children(parent_id):
     """
-    指定された親組織IDに属する子組織を返す（モデルオブジェクト）
+    指定された親組織IDに属する子組織を返す（読み取り専用モデル）
     """
-    children = Organization.query.filter_by(parent_id=parent_id).all()
-    return children
+    rows = (
+        db.session.query(*OrganizationRow.columns())
+        .filter(Organization.parent_id == parent_id)
+        .order_by(Organization.id)
+        .all()
+    )
+    return [OrganizationRow(*row) for row in rows]
 
 
-def _filter_organizations_by_access(user, all_orgs):
+def _filter_organizations_by_access(user, all_orgs, company_id=None):
     """
     ユーザーの権限に基づいてアクセス可能な組織をフィルタリング
     """
-    accessible_orgs = []
-    
-    # スーパーユーザーは全組織にアクセス可能
-    if getattr(user, 'is_superuser', False):
+    accessible_ids = _get_accessible_org_ids(user, get_organization_tree_index(company_id))
+    if accessible_ids is None:
         return all_orgs
-    
-    # SYSTEM_ADMIN権限をチェック
-    system_admin_companies = _get_system_admin_companies(user)
-    if system_admin_companies:
-        # SYSTEM_ADMINの場合、同一会社の全組織にアクセス可能
-        for org in all_orgs:
-            if org.company_id in system_admin_companies:
-                accessible_orgs.append(org)
-        return accessible_orgs
-    
-    # ORG_ADMIN権限をチェック
-    org_admin_orgs = _get_org_admin_accessible_orgs(user, all_orgs)
-    if org_admin_orgs:
-        accessible_orgs.extend(org_admin_orgs)
-    
-    # MEMBER権限：自組織のみ
-    if user.organization_id:
-        member_accessible = _get_member_accessible_orgs(user, all_orgs)
-        accessible_orgs.extend(member_accessible)
-    
-    # 重複を除去
-    return list(set(accessible_orgs))
+    return [org for org in all_orgs if org.id in accessible_ids]
 
-def _get_system_admin_companies(user):
-    """
-    SYSTEM_ADMIN権限を持つ会社のIDリストを取得
-    """
-    company_ids = set()
-    
-    for scope in user.access_scopes:
-        if scope.role == OrgRoleEnum.SYSTEM_ADMIN:
-            # scope.organizationまたはscope.organization_idから会社IDを取得
-            if scope.organization:
-                company_ids.add(scope.organization.company_id)
-            elif scope.organization_id:
-                org = Organization.query.get(scope.organization_id)
-                if org:
-                    company_ids.add(org.company_id)
-    
-    return list(company_ids)
 
-def _get_org_admin_accessible_orgs(user, all_orgs):
+def _get_accessible_org_ids(user, index):
     """
-    ORG_ADMIN権限でアクセス可能な組織リストを取得
+    組織ツリーインデックス上でユーザーがアクセス可能な組織IDの集合を返す（全組織の場合は None）
     """
-    accessible_orgs = []
-    
-    for scope in user.access_scopes:
+    # スーパーユーザーは全組織にアクセス可能
+    if getattr(user, 'is_superuser', False):
+        return None
+
+    scopes = list(user.access_scopes)
+
+    # SYSTEM_ADMINの場合、同一会社の全組織にアクセス可能
+    system_admin_org_ids = [scope.organization_id for scope in scopes
+                            if scope.role == OrgRoleEnum.SYSTEM_ADMIN and scope.organization_id]
+    if system_admin_org_ids:
+        company_ids = {index.company_id(org_id) for org_id in system_admin_org_ids}
+        return {org_id for org_id in index.order if index.company_id(org_id) in company_ids}
+
+    accessible_ids = set()
+
+    # ORG_ADMIN権限：自組織＋下位組織
+    for scope in scopes:
         if scope.role == OrgRoleEnum.ORG_ADMIN:
-            # 管理対象の組織IDを取得
             base_org_id = scope.organization_id or user.organization_id
             if base_org_id:
-                # 自組織＋下位組織を取得
-                descendant_orgs = get_descendant_organizations(base_org_id, all_orgs)
-                accessible_orgs.extend(descendant_orgs)
-    
-    return accessible_orgs
+                accessible_ids.update(index.subtree_ids(base_org_id))
 
-def _get_member_accessible_orgs(user, all_orgs):
-    """
-    MEMBER権限でアクセス可能な組織リストを取得
-    """
-    accessible_orgs = []
-    
-    # 明示的にMEMBER権限が付与されている組織
-    for scope in user.access_scopes:
-        if scope.role == OrgRoleEnum.MEMBER and scope.organization_id:
-            org = next((o for o in all_orgs if o.id == scope.organization_id), None)
-            if org:
-                accessible_orgs.append(org)
-    
-    # 所属組織（デフォルトのMEMBER権限）
-    if user.organization_id:
-        user_org = next((o for o in all_orgs if o.id == user.organization_id), None)
-        if user_org:
-            accessible_orgs.append(user_org)
-    
-    return accessible_orgs
\ No newline at end of file
+    # MEMBER権限：明示的に付与された組織と所属組織
+    for scope in scopes:
+        if scope.role == OrgRoleEnum.MEMBER and scope.organization_id in index:
+            accessible_ids.add(scope.organization_id)
+    if user.organization_id in index:
+        accessible_ids.add(user.organization_id)
+
+    return accessible_ids
@@ -1,27 +1,22 @@
 # app/services/progress_updates_service.py
-from datetime import datetime
-from app.models import db, Objective, Task, ProgressUpdate, Status, User
-from app.utils import check_task_access
-from app.constants import TaskAccessLevelEnum, StatusEnum, STATUS_LABELS
+import base64
+import json
+from datetime import date, datetime
+from sqlalchemy import and_, or_, select, update
+from app.models import db, Objective, Task, ProgressUpdate, User
+from app.access_context import load_objective_context, load_progress_context
+from app.constants import TaskAccessLevelEnum, STATUS_LABELS
+from app.status_registry import get_status_registry
 from app.service_errors import (
     ServiceValidationError,
     ServicePermissionError,
-    ServiceNotFoundError,
 )
 
 
-def get_task_by_id(task_id):
-    return Task.query.filter_by(id=task_id, is_deleted=False).first()
-
-
 def get_task_by_id_with_deleted(task_id):
     return db.session.get(Task, task_id)
 
 
-def get_objective_by_id(objective_id):
-    return Objective.query.filter_by(id=objective_id, is_deleted=False).first()
-
-
 def get_objective_by_id_with_deleted(objective_id):
     return db.session.get(Objective, objective_id)
 
@@ -36,78 +31,124 @@ def get_progress_by_id_with_deleted(progress_id):
 
 def add_progress(objective_id, data, user):
     print("add progress",data)
-    objective = get_objective_by_id(objective_id)
-    if not objective:
-        raise ServiceNotFoundError('オブジェクティブが見つかりません')
-    task = get_task_by_id(objective.task_id)
-    if not task:
-        raise ServiceNotFoundError('タスクが見つかりません')
-
+    context = load_objective_context(objective_id, user)
     if not (
-        check_task_access(user, task, TaskAccessLevelEnum.EDIT)
-        or user.id == objective.assigned_user_id
+        context.has_level(TaskAccessLevelEnum.EDIT)
+        or user.id == context.objective.assigned_user_id
     ):
         raise ServicePermissionError('進捗追加の権限がありません')
 
     progress = ProgressUpdate(
         objective_id=objective_id,
-        status_id=data['status'],
+        status_id=data['status_id'],
         detail=data['detail'],
-        report_date=datetime.strptime(data['report_date'], '%Y-%m-%d'),
+        report_date=datetime.strptime(data['report_date'], '%Y-%m-%d').date(),
         updated_by=user.id
     )
     db.session.add(progress)
+    db.session.flush()
+    # 報告日が現在の最新以降であれば最新進捗ポインタを差し替える（同時追加でも条件付きUPDATEで整合を保つ）
+    db.session.execute(
+        update(Objective)
+        .where(
+            Objective.id == objective_id,
+            or_(Objective.latest_report_date == None, Objective.latest_report_date <= progress.report_date),
+        )
+        .values(latest_progress_id=progress.id, latest_report_date=progress.report_date)
+        .execution_options(synchronize_session=False)
+    )
     db.session.commit()
     return {'message': '進捗を追加しました'}
 
 
-def get_progress_list(objective_id, user):
-    objective = get_objective_by_id(objective_id)
-    if not objective:
-        raise ServiceNotFoundError('オブジェクティブが見つかりません')
-    task = get_task_by_id(objective.task_id)
-    if not task:
-        raise ServiceNotFoundError('タスクが見つかりません')
-
-    if not check_task_access(user, task, TaskAccessLevelEnum.VIEW):
+def get_progress_list(objective_id, user, limit=None, cursor=None, date_from=None, date_to=None):
+    """
+    進捗一覧を報告日の昇順（同日は登録順）で返す
+    ステータス名・報告者名は1クエリで結合して取得し、limit/cursor によるキーセットページングと
+    報告日の範囲（from/to、両端を含む）による絞り込みに対応する
+    戻り値: 進捗のリストと次ページ取得用のカーソル（最終ページは None）
+    """
+    context = load_objective_context(objective_id, user)
+    if not context.has_level(TaskAccessLevelEnum.VIEW):
         raise ServicePermissionError('閲覧権限がありません')
 
-    progress_list = ProgressUpdate.query.filter_by(objective_id=objective_id, is_deleted=False).all()
-    result = []
-    for p in progress_list:
-        status = db.session.get(Status, p.status_id)
-        try:
-            enum = StatusEnum(status.name)
-            label = STATUS_LABELS[enum]
-        except Exception:
-            label = '-'
-        result.append({
-            'id': p.id,
-            'status': label,
-            'detail': p.detail,
-            'report_date': p.report_date.strftime('%Y-%m-%d'),
-            'updated_by': db.session.get(User, p.updated_by).name
-        })
-    return result
+    query = _progress_rows_query(objective_id).order_by(ProgressUpdate.report_date, ProgressUpdate.id)
+    if date_from:
+        query = query.filter(ProgressUpdate.report_date >= date_from)
+    if date_to:
+        query = query.filter(ProgressUpdate.report_date <= date_to)
+    if cursor:
+        last_date, last_id = _decode_progress_cursor(cursor)
+        query = query.filter(or_(
+            ProgressUpdate.report_date > last_date,
+            and_(ProgressUpdate.report_date == last_date, ProgressUpdate.id > last_id),
+        ))
+    if limit:
+        query = query.limit(limit + 1)
+    rows = query.all()
+
+    next_cursor = None
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_progress_cursor(rows[-1].report_date, rows[-1].id)
+
+    statuses = get_status_registry()
+    return {'updates': [_format_progress_row(row, statuses) for row in rows], 'next_cursor': next_cursor}
+
+
+def _progress_rows_query(objective_id):
+    """オブジェクティブの有効な進捗を、報告者名と合わせて取得するクエリ（ステータスはレジストリで解決する）"""
+    return (
+        db.session.query(
+            ProgressUpdate.id,
+            ProgressUpdate.detail,
+            ProgressUpdate.report_date,
+            ProgressUpdate.status_id,
+            User.name.label('user_name'),
+        )
+        .outerjoin(User, User.id == ProgressUpdate.updated_by)
+        .filter(ProgressUpdate.objective_id == objective_id, ProgressUpdate.is_deleted == False)
+    )
+
+
+def _format_progress_row(row, statuses):
+    return {
+        'id': row.id,
+        'status': _status_label(statuses, row.status_id),
+        'detail': row.detail,
+        'report_date': row.report_date.strftime('%Y-%m-%d'),
+        'updated_by': row.user_name,
+    }
+
+
+def _status_label(statuses, status_id):
+    status_enum = statuses.enum_for(status_id)
+    return STATUS_LABELS[status_enum] if status_enum is not None else '-'
+
+
+def _encode_progress_cursor(report_date, progress_id):
+    payload = json.dumps([report_date.isoformat(), progress_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def _decode_progress_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        report_date, progress_id = json.loads(base64.urlsafe_b64decode(padded))
+        return date.fromisoformat(report_date), int(progress_id)
+    except (ValueError, TypeError):
+        raise ServiceValidationError('cursor が不正です')
 
 
 def get_latest_progress(objective_id, user):
-    objective = get_objective_by_id(objective_id)
-    if not objective:
-        raise ServiceNotFoundError('オブジェクティブが見つかりません')
-    task = get_task_by_id(objective.task_id)
-    if not task:
-        raise ServiceNotFoundError('タスクが見つかりません')
-
-    if not check_task_access(user, task, TaskAccessLevelEnum.VIEW):
+    context = load_objective_context(objective_id, user)
+    if not context.has_level(TaskAccessLevelEnum.VIEW):
         raise ServicePermissionError('閲覧権限がありません')
 
-    progress = (
-        ProgressUpdate.query
-        .filter_by(objective_id=objective_id, is_deleted=False)
-        .order_by(ProgressUpdate.report_date.desc(), ProgressUpdate.created_at.desc())
-        .first()
-    )
+    progress = None
+    latest_progress_id = context.objective.latest_progress_id
+    if latest_progress_id:
+        progress = _progress_rows_query(objective_id).filter(ProgressUpdate.id == latest_progress_id).first()
 
     if not progress:
         return {
@@ -117,40 +158,43 @@ def get_latest_progress(objective_id, user):
             'updated_by': '-'
         }
 
-    status = db.session.get(Status, progress.status_id)
-    user_name = db.session.get(User, progress.updated_by).name
-
-    if status:
-        try:
-            enum = StatusEnum(status.name)
-            label = STATUS_LABELS[enum]
-        except Exception:
-            label = '-'
-    else:
-        label = '-'
-
-    return {
-        'status': label,
-        'report_date': progress.report_date.strftime('%Y-%m-%d'),
-        'updated_by': user_name,
-        'detail': progress.detail
-    }
+    return _format_progress_row(progress, get_status_registry())
 
 
 def delete_progress(progress_id, user):
-    progress = get_progress_by_id(progress_id)
-    if not progress:
-        raise ServiceNotFoundError('進捗が見つかりません')
-    objective = get_objective_by_id_with_deleted(progress.objective_id)
-    if not objective or objective.is_deleted:
-        raise ServiceNotFoundError('オブジェクティブが見つかりません')
-    task = get_task_by_id_with_deleted(objective.task_id)
-    if not task or task.is_deleted:
-        raise ServiceNotFoundError('タスクが見つかりません')
-
-    if not check_task_access(user, task, TaskAccessLevelEnum.EDIT):
+    context = load_progress_context(progress_id, user)
+    if not context.has_level(TaskAccessLevelEnum.EDIT):
         raise ServicePermissionError('削除権限がありません')
 
+    progress, objective = context.progress, context.objective
+
     progress.soft_delete()
+    if objective.latest_progress_id == progress.id:
+        db.session.flush()
+        refresh_latest_progress(Objective.id == objective.id)
     db.session.commit()
     return {'message': '進捗を削除しました'}
+
+
+def refresh_latest_progress(*criteria):
+    """
+    条件に合うオブジェクティブの latest_progress_id / latest_report_date を進捗テーブルから再計算する
+    （条件なしの場合は全オブジェクティブ。既存データのバックフィルにも使う）
+    戻り値: 更新したオブジェクティブ数
+    """
+    def latest(column):
+        return (
+            select(column)
+            .where(ProgressUpdate.objective_id == Objective.id, ProgressUpdate.is_deleted == False)
+            .order_by(ProgressUpdate.report_date.desc(), ProgressUpdate.created_at.desc(), ProgressUpdate.id.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+
+    result = db.session.execute(
+        update(Objective)
+        .where(*criteria)
+        .values(latest_progress_id=latest(ProgressUpdate.id), latest_report_date=latest(ProgressUpdate.report_date))
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
@@ -1,16 +1,13 @@
 from app.models import db, Task, User, Organization, TaskAccessUser, TaskAccessOrganization
-from app.utils import check_task_access, access_level_sufficient
+from app.utils import access_level_sufficient
+from app.access_context import load_task_context
+from app.permissions import invalidate_permission_cache
 from app.constants import TaskAccessLevelEnum
 from app.service_errors import (
     ServicePermissionError,
-    ServiceNotFoundError,
 )
 
 
-def get_task_by_id(task_id):
-    return Task.query.filter_by(id=task_id, is_deleted=False).first()
-
-
 def get_task_by_id_with_deleted(task_id):
     return db.session.get(Task, task_id)
 
@@ -18,10 +15,8 @@ def get_task_by_id_with_deleted(task_id):
 ACCESS_LEVELS = list(TaskAccessLevelEnum)
 
 def update_access_level(task_id, data, user):
-    task = get_task_by_id(task_id)
-    if not task:
-        raise ServiceNotFoundError('タスクが見つかりません')
-    if not check_task_access(user, task, TaskAccessLevelEnum.FULL):
+    context = load_task_context(task_id, user)
+    if not context.has_level(TaskAccessLevelEnum.FULL):
         raise ServicePermissionError('スコープ権限を変更する権限がありません')
 
     # --- ユーザーアクセス処理 ---
@@ -59,6 +54,7 @@ def update_access_level(task_id, data, user):
         db.session.delete(existing_org_map[org_id])
 
     db.session.commit()
+    invalidate_permission_cache()
     return {'message': 'アクセス設定を更新しました'}
 
 def get_task_users(task_id):
@@ -1,15 +1,25 @@
+import base64
+import json
+from functools import lru_cache
 from flask import current_app
 from datetime import datetime
-from app.models import db, Task, Objective, UserTaskOrder, TaskAccessUser, TaskAccessOrganization, Status
+from app.models import db, Task, Objective, UserTaskOrder, TaskAccessUser, TaskAccessOrganization
 from app.utils import check_task_access
-from app.constants import TaskAccessLevelEnum, StatusEnum, STATUS_LABELS
+from app.permissions import invalidate_permission_cache
+from app.read_models import TaskRow
+from app.services import task_order_service
+from app.constants import TaskAccessLevelEnum, TASK_ACCESS_PRIORITY
+from app.status_registry import get_status_registry, status_id_for, is_valid_status_id
+from app.resource_versions import bump_task_versions
 from app.service_errors import (
     ServiceValidationError,
     ServicePermissionError,
     ServiceAuthenticationError,
     ServiceNotFoundError,
 )
-from sqlalchemy import and_, or_, case
+from sqlalchemy import and_, or_, bindparam, case, func, insert, select, union_all, update
+
+ACCESS_LEVEL_BY_PRIORITY = {priority: level for level, priority in TASK_ACCESS_PRIORITY.items()}
 
 
 def get_task_by_id(task_id, user):
@@ -46,16 +56,115 @@ def create_task(data, user):
     db.session.add(task)
     db.session.flush()
 
-    db.session.query(UserTaskOrder).filter_by(user_id=user.id).update(
-        {UserTaskOrder.display_order: UserTaskOrder.display_order + 1},
-        synchronize_session='fetch'
-    )
-    db.session.add(UserTaskOrder(user_id=user.id, task_id=task.id, display_order=0))
+    # 既存の並び順は書き換えず、先頭より前のランクを1件だけ追加する
+    ranks = task_order_service.prepend_ranks(user.id, 1)
+    db.session.add(UserTaskOrder(user_id=user.id, task_id=task.id, display_order=ranks[0]))
     db.session.commit()
+    task_order_service.schedule_rank_rebalance_if_needed(user.id, ranks)
 
     return task
 
 
+def bulk_create_tasks(items, user):
+    """
+    タスクを一括作成する
+    INSERT は executemany でまとめて発行し、ユーザーの表示順は既存行を書き換えずに先頭より前のランクを割り当てる
+    （バッチ内の並びのまま一覧の先頭に追加される）
+    """
+    status_ids = _resolve_status_ids(item.get('status') for item in items)
+    rows = [
+        {
+            'title': item['title'],
+            'description': item.get('description', ''),
+            'due_date': _parse_bulk_due_date(item.get('due_date'), i),
+            'status_id': status_ids.get(item.get('status')),
+            'created_by': user.id,
+            'organization_id': user.organization_id,
+        }
+        for i, item in enumerate(items)
+    ]
+
+    task_ids = _insert_tasks(rows)
+
+    ranks = task_order_service.prepend_ranks(user.id, len(task_ids))
+    db.session.execute(insert(UserTaskOrder), [
+        {'user_id': user.id, 'task_id': task_id, 'display_order': rank}
+        for task_id, rank in zip(task_ids, ranks)
+    ])
+    # ORM を経由しない INSERT のため、一覧の ETag 用バージョンを明示的に加算する
+    bump_task_versions(task_ids)
+    db.session.commit()
+    task_order_service.schedule_rank_rebalance_if_needed(user.id, ranks)
+    return task_ids
+
+
+def bulk_update_tasks(items, user):
+    """
+    複数タスクを一括更新する（全件の存在・権限を確認してから、主キー指定の executemany で更新）
+    """
+    task_ids = [item['id'] for item in items]
+    tasks = {
+        task.id: task
+        for task in Task.query.filter(Task.id.in_(task_ids), Task.is_deleted == False).all()
+    }
+    missing = [task_id for task_id in task_ids if task_id not in tasks]
+    if missing:
+        raise ServiceNotFoundError(f'タスクが見つかりません: {missing}')
+    denied = [task_id for task_id in task_ids
+              if not check_task_access(user, tasks[task_id], TaskAccessLevelEnum.FULL)]
+    if denied:
+        raise ServicePermissionError(f'このタスクを編集する権限がありません: {denied}')
+
+    status_ids = _resolve_status_ids(item.get('status') for item in items)
+    rows = []
+    for i, item in enumerate(items):
+        row = {'id': item['id']}
+        for key in ('title', 'description'):
+            if key in item:
+                row[key] = item[key]
+        if 'due_date' in item:
+            row['due_date'] = _parse_bulk_due_date(item['due_date'], i)
+        if item.get('status') is not None:
+            row['status_id'] = status_ids[item['status']]
+        rows.append(row)
+
+    db.session.execute(update(Task), rows)
+    bump_task_versions(task_ids)
+    db.session.commit()
+    return task_ids
+
+
+def _insert_tasks(rows):
+    """タスクを executemany で挿入し、挿入順のIDリストを返す"""
+    if db.engine.dialect.insert_executemany_returning_sort_by_parameter_order:
+        return list(db.session.scalars(
+            insert(Task).returning(Task.id, sort_by_parameter_order=True), rows
+        ))
+    # RETURNING を使えないDB（MySQL）ではORMのバッチ挿入で採番結果を取得する
+    tasks = [Task(**row) for row in rows]
+    db.session.add_all(tasks)
+    db.session.flush()
+    return [task.id for task in tasks]
+
+
+def _resolve_status_ids(statuses):
+    """StatusEnum の集合をステータスレジストリでステータスIDへ変換する"""
+    id_by_status = {status: status_id_for(status) for status in set(statuses) if status is not None}
+    missing = [status.value for status, status_id in id_by_status.items() if status_id is None]
+    if missing:
+        raise ServiceValidationError(f'ステータスが不正です: {sorted(missing)}')
+    return id_by_status
+
+
+def _parse_bulk_due_date(value, index):
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        raise ServiceValidationError(f'{index + 1}件目: 日付の形式が正しくありません（YYYY-MM-DD）')
+
+
 def update_task(task_id, data, user):
     task = get_task_by_id(task_id, user)
     if not task:
@@ -94,13 +203,16 @@ def delete_task(task_id, user):
         db.session.delete(order)
     db.session.flush()
 
+    # 付与を一括削除すると after_flush から閲覧ユーザーを辿れなくなるため、削除前に一覧バージョンを加算する
+    bump_task_versions([task_id])
     TaskAccessUser.query.filter_by(task_id=task_id).delete()
     TaskAccessOrganization.query.filter_by(task_id=task_id).delete()
 
     task.soft_delete()
     db.session.commit()
+    invalidate_permission_cache()
 
-def get_tasks(user):
+def get_tasks(user, limit=None, cursor=None):
     current_app.logger.info("[START] get_tasks called")
 
     if not user or not user.is_authenticated:
@@ -109,73 +221,135 @@ def get_tasks(user):
     org_id = user.organization_id
     user_id = user.id
 
-    filter_conditions = [
-        Task.created_by == user_id,
-        Task.id.in_(
-            db.session.query(TaskAccessUser.task_id)
-            .filter(TaskAccessUser.user_id == user_id)
-            .filter(TaskAccessUser.access_level.in_([
-                TaskAccessLevelEnum.VIEW,
-                TaskAccessLevelEnum.EDIT,
-                TaskAccessLevelEnum.FULL,
-            ]))
-        ),
-        Task.id.in_(
-            db.session.query(TaskAccessOrganization.task_id)
-            .filter(TaskAccessOrganization.organization_id == org_id)
-            .filter(
-                TaskAccessOrganization.access_level.in_([
-                    TaskAccessLevelEnum.VIEW,
-                    TaskAccessLevelEnum.EDIT,
-                    TaskAccessLevelEnum.FULL,
-                ])
-            )
-        )
-    ]
+    task_grants = _task_grants_subquery()
+
+    # 実効アクセスレベル（作成者は FULL、それ以外は付与の最高レベル）を同一SQL内で算出
+    access_priority = case(
+        (Task.created_by == user_id, TASK_ACCESS_PRIORITY[TaskAccessLevelEnum.FULL]),
+        else_=func.coalesce(task_grants.c.priority, 0),
+    )
+
+    # 並び順：ユーザー別ランク → タスク既定の表示順 → 未設定、同順位はタスクID（キーセットページング用の全順序）
+    sort_group = case(
+        (UserTaskOrder.display_order != None, 0),
+        (Task.display_order != None, 1),
+        else_=2,
+    )
+    user_rank = func.coalesce(UserTaskOrder.display_order, '')
+    sort_order = func.coalesce(Task.display_order, 0)
 
-    visible_tasks = (
-        db.session.query(Task, UserTaskOrder.display_order.label('user_order'))
+    task_columns = TaskRow.columns()
+    query = (
+        db.session.query(
+            *task_columns,
+            UserTaskOrder.display_order.label('user_rank'),
+            access_priority.label('access_priority'),
+            sort_group.label('sort_group'),
+            user_rank.label('sort_rank'),
+            sort_order.label('sort_order'),
+        )
         .outerjoin(UserTaskOrder, and_(
             UserTaskOrder.task_id == Task.id,
             UserTaskOrder.user_id == user_id
         ))
+        .outerjoin(task_grants, task_grants.c.task_id == Task.id)
         .filter(
             and_(
-                Task.is_deleted != True,
-                or_(*filter_conditions)
+                Task.is_deleted == False,
+                or_(Task.created_by == user_id, task_grants.c.task_id != None)
             )
         )
-        .order_by(
-            case((UserTaskOrder.display_order == None, 1), else_=0),  # NULLは後ろへ
-            UserTaskOrder.display_order.asc(),
-            case((Task.display_order == None, 1), else_=0),
-            Task.display_order.asc()
-        )
-        .all()
+        .order_by(sort_group, user_rank, sort_order, Task.id)
+        .params(grant_user_id=user_id, grant_org_id=org_id)
     )
 
+    if cursor:
+        query = query.filter(_keyset_after((sort_group, user_rank, sort_order, Task.id), _decode_task_cursor(cursor)))
+    if limit:
+        query = query.limit(limit + 1)
+    visible_tasks = query.all()
+
+    next_cursor = None
+    if limit and len(visible_tasks) > limit:
+        visible_tasks = visible_tasks[:limit]
+        last = visible_tasks[-1]
+        next_cursor = _encode_task_cursor(last.sort_group, last.sort_rank, last.sort_order, last.id)
+
+    # ORM エンティティを読み込まず、列の値から読み取り専用モデルを組み立てる
+    width = len(task_columns)
+    statuses = get_status_registry()
     result = []
-    for task, user_order in visible_tasks:
-        task.user_access_level = _calc_user_access_level(task, user_id, org_id)
-        task.display_order = user_order if user_order is not None else task.display_order
-        result.append(task)
-    return result
-
-def _calc_user_access_level(task, user_id, org_id):
-    if task.created_by == user_id:
-        return TaskAccessLevelEnum.FULL.value
-    if (entry := TaskAccessUser.query.filter_by(task_id=task.id, user_id=user_id).first()):
-        return entry.access_level.value
-    if (entry := TaskAccessOrganization.query.filter_by(task_id=task.id, organization_id=org_id).first()):
-        return entry.access_level.value
-    return TaskAccessLevelEnum.VIEW.value
+    for row in visible_tasks:
+        access_level = ACCESS_LEVEL_BY_PRIORITY.get(row.access_priority, TaskAccessLevelEnum.VIEW).value
+        result.append(TaskRow(*row[:width], user_access_level=access_level, user_rank=row.user_rank,
+                              status_name=statuses.name_for(row.status_id)))
+    return {'tasks': result, 'next_cursor': next_cursor}
+
+@lru_cache(maxsize=1)
+def _task_grants_subquery():
+    """
+    ユーザー付与・組織付与をタスク単位に集約するサブクエリ（同じタスク・主体への付与が複数行あっても1行になる）
+    閲覧可能なレベルの付与が1件以上あるタスクのみ残し、実効レベルは付与のうち最も高いもの
+    式の構築はプロセスで1度だけ行い、ユーザーID・組織IDは実行時に grant_user_id / grant_org_id で渡す
+    """
+    visible_levels = [
+        TaskAccessLevelEnum.VIEW,
+        TaskAccessLevelEnum.EDIT,
+        TaskAccessLevelEnum.FULL,
+    ]
+    grants = union_all(
+        select(
+            TaskAccessUser.task_id.label('task_id'),
+            _access_priority_case(TaskAccessUser.access_level).label('priority'),
+            TaskAccessUser.access_level.in_(visible_levels).label('visible'),
+        ).where(TaskAccessUser.user_id == bindparam('grant_user_id')),
+        select(
+            TaskAccessOrganization.task_id,
+            _access_priority_case(TaskAccessOrganization.access_level),
+            TaskAccessOrganization.access_level.in_(visible_levels),
+        ).where(TaskAccessOrganization.organization_id == bindparam('grant_org_id')),
+    ).subquery()
+    return (
+        select(grants.c.task_id, func.max(grants.c.priority).label('priority'))
+        .group_by(grants.c.task_id)
+        .having(func.max(case((grants.c.visible, 1), else_=0)) == 1)
+        .subquery('task_grants')
+    )
+
+def _keyset_after(columns, values):
+    """(columns) > (values) の辞書式比較条件（キーセットページング用）"""
+    condition = columns[-1] > values[-1]
+    for column, value in zip(reversed(columns[:-1]), reversed(values[:-1])):
+        condition = or_(column > value, and_(column == value, condition))
+    return condition
+
+def _encode_task_cursor(sort_group, sort_rank, sort_order, task_id):
+    payload = json.dumps([sort_group, sort_rank, sort_order, task_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def _decode_task_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_group, sort_rank, sort_order, task_id = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(sort_rank, str):
+            raise TypeError(sort_rank)
+        return int(sort_group), sort_rank, int(sort_order), int(task_id)
+    except (ValueError, TypeError):
+        raise ServiceValidationError('cursor が不正です')
+
+def _access_priority_case(level_column):
+    """アクセスレベル列を TASK_ACCESS_PRIORITY の数値に変換するCASE式（付与なしは0）"""
+    return case(
+        *[(level_column == level, priority) for level, priority in TASK_ACCESS_PRIORITY.items()],
+        else_=0,
+    )
 
 def update_objective_order(task_id, data):
     new_order = data.get('order')
     if not new_order or not isinstance(new_order, list):
         raise ServiceValidationError('order はオブジェクティブIDのリストである必要があります')
 
-    objectives = Objective.query.filter_by(task_id=task_id).filter(Objective.is_deleted != True).all()
+    objectives = Objective.query.filter_by(task_id=task_id).filter(Objective.is_deleted == False).all()
     obj_dict = {obj.id: obj for obj in objectives}
 
     for index, obj_id in enumerate(new_order):
@@ -189,12 +363,4 @@ def update_objective_order(task_id, data):
     return {'message': '表示順を更新しました'}
 
 def get_statuses():
-    statuses = Status.query.all()
-    result = []
-    for s in statuses:
-        try:
-            enum = StatusEnum(s.name)
-        except ValueError:
-            continue
-        result.append({'id': s.id, 'enum':s.name, 'label': STATUS_LABELS[enum]})
-    return result
+    return get_status_registry().items()
@@ -1,7 +1,9 @@
 # --- task_export_service.py ---
 
-import io
-import pandas as pd
+import csv
+import json
+import tempfile
+from collections import defaultdict
 import yaml
 from sqlalchemy import and_, or_
 from app.models import (
@@ -9,83 +11,151 @@ from app.models import (
     Task,
     Objective,
     ProgressUpdate,
-    Status,
     User,
     TaskAccessUser,
     TaskAccessOrganization,
     UserTaskOrder,
 )
-from app.constants import TaskAccessLevelEnum, StatusEnum, STATUS_LABELS
+from app.constants import TaskAccessLevelEnum
+from app.status_registry import get_status_registry
 
 
-class ProgressFormatter:
-    def __init__(self, db_session):
+# Excel出力の列幅（A列は行種別で非表示）と折り返し対象列
+EXCEL_COLUMN_WIDTHS = [12, 68, 11, 11, 11, 57, 11, 11]
+EXCEL_WRAP_COLUMNS = (2, 6)
+
+CSV_HEADER = [
+    "タスク名", "タスク期限", "タスクステータス", "作成者",
+    "オブジェクティブ名", "期限", "ステータス", "担当者",
+    "進捗内容", "進捗日", "報告者",
+]
+
+# IN句に渡すIDの最大件数（SQLiteのバインド変数上限を考慮）
+IN_CLAUSE_CHUNK_SIZE = 500
+
+# 配下データ（オブジェクティブ・進捗）をまとめて読み込むタスク件数
+# エクスポート中に保持する配下データはこの件数のタスク分のみ
+EXPORT_TASK_CHUNK_SIZE = 200
+
+
+def _chunks(ids, size=IN_CLAUSE_CHUNK_SIZE):
+    ids = list(ids)
+    for i in range(0, len(ids), size):
+        yield ids[i:i + size]
+
+
+class ExportDataset:
+    """
+    エクスポート対象タスク（1チャンク分）配下のオブジェクティブ・進捗・ユーザー名・ステータス名を
+    固定回数の一括クエリで読み込み、メモリ上で参照できるようにする
+    ORM エンティティではなく列の値のみを読み込む（ユーザー名はチャンク間で共有する user_names に蓄積する）
+    """
+
+    def __init__(self, db_session, tasks, user_names=None):
         self.db = db_session
+        self.tasks = tasks
+        self.objectives_by_task = defaultdict(list)
+        self.progresses_by_objective = defaultdict(list)
+        self.user_names = {} if user_names is None else user_names
+        self.status_names = {}
+        self._load()
+
+    def _load(self):
+        task_ids = [task.id for task in self.tasks]
+
+        objectives = []
+        for chunk in _chunks(task_ids):
+            objectives += (
+                self.db.session.query(
+                    Objective.id, Objective.task_id, Objective.title, Objective.due_date,
+                    Objective.status_id, Objective.assigned_user_id,
+                )
+                .filter(Objective.task_id.in_(chunk), Objective.is_deleted == False)
+                .order_by(Objective.task_id, Objective.display_order.asc())
+                .all()
+            )
+        for obj in objectives:
+            self.objectives_by_task[obj.task_id].append(obj)
+
+        progresses = []
+        for chunk in _chunks([obj.id for obj in objectives]):
+            progresses += (
+                self.db.session.query(
+                    ProgressUpdate.objective_id, ProgressUpdate.detail, ProgressUpdate.report_date,
+                    ProgressUpdate.updated_by,
+                )
+                .filter(ProgressUpdate.objective_id.in_(chunk), ProgressUpdate.is_deleted == False)
+                .order_by(ProgressUpdate.objective_id, ProgressUpdate.report_date.asc())
+                .all()
+            )
+        for p in progresses:
+            self.progresses_by_objective[p.objective_id].append(p)
+
+        user_ids = {task.created_by for task in self.tasks}
+        user_ids |= {obj.assigned_user_id for obj in objectives}
+        user_ids |= {p.updated_by for p in progresses}
+        user_ids.discard(None)
+        user_ids -= self.user_names.keys()
+        for chunk in _chunks(user_ids):
+            self.user_names.update(
+                self.db.session.query(User.id, User.name).filter(User.id.in_(chunk)).all()
+            )
+
+        statuses = get_status_registry()
+        self.status_names = {status_id: statuses.label_for(status_id) for status_id in statuses.names}
+
+    def user_name(self, user_id):
+        return self.user_names.get(user_id, "")
+
+    def status_name(self, status_id):
+        return self.status_names.get(status_id, "")
+
+
+class ProgressFormatter:
+    def __init__(self, dataset):
+        self.dataset = dataset
 
     def list_for_objective(self, objective_id):
-        progresses = (
-            self.db.session.query(ProgressUpdate)
-            .filter_by(objective_id=objective_id, is_deleted=False)
-            .order_by(ProgressUpdate.report_date.asc())
-            .all()
-        )
         result = []
-        for p in progresses:
+        for p in self.dataset.progresses_by_objective.get(objective_id, []):
             result.append({
                 "内容": p.detail or "",
                 "日付": p.report_date.strftime("%Y-%m-%d") if p.report_date else "",
-                "報告者": self._get_user_name(p.updated_by)
+                "報告者": self.dataset.user_name(p.updated_by)
             })
         return result
 
-    def _get_user_name(self, user_id):
-        user = self.db.session.get(User, user_id)
-        return user.name if user else ""
-
 
 class ObjectiveFormatter:
-    def __init__(self, db_session):
-        self.db = db_session
-        self.progress_formatter = ProgressFormatter(db_session)
+    def __init__(self, dataset):
+        self.dataset = dataset
+        self.progress_formatter = ProgressFormatter(dataset)
 
     def list_for_task(self, task_id):
-        objectives = (
-            self.db.session.query(Objective)
-            .filter_by(task_id=task_id, is_deleted=False)
-            .order_by(Objective.display_order.asc())
-            .all()
-        )
         result = []
-        for obj in objectives:
+        for obj in self.dataset.objectives_by_task.get(task_id, []):
             result.append({
                 "オブジェクティブ名": obj.title,
                 "期限": obj.due_date.strftime("%Y-%m-%d") if obj.due_date else "",
-                "ステータス": self._get_status_name(obj.status_id),
-                "担当者": self._get_user_name(obj.assigned_user_id),
+                "ステータス": self.dataset.status_name(obj.status_id),
+                "担当者": self.dataset.user_name(obj.assigned_user_id),
                 "progresses": self.progress_formatter.list_for_objective(obj.id)
             })
         return result
 
-    def _get_status_name(self, status_id):
-        status = self.db.session.get(Status, status_id)
-        if not status:
-            return ""
-        try:
-            enum = StatusEnum(status.name)
-            return STATUS_LABELS[enum]
-        except Exception:
-            return status.name
-
-    def _get_user_name(self, user_id):
-        user = self.db.session.get(User, user_id)
-        return user.name if user else ""
-
 
 class TaskDataExporter:
-    def __init__(self, user_id, db_session):
+    def __init__(self, user_id, db_session, chunk_size=EXPORT_TASK_CHUNK_SIZE):
         self.user_id = user_id
         self.db = db_session
-        self.objective_formatter = ObjectiveFormatter(db_session)
+        self.chunk_size = chunk_size
+
+    def iter_datasets(self):
+        """タスク一覧を chunk_size 件ずつに分け、チャンクごとに配下データを読み込んで返す"""
+        user_names = {}
+        tasks = self.get_tasks()
+        for i in range(0, len(tasks), self.chunk_size):
+            yield ExportDataset(self.db, tasks[i:i + self.chunk_size], user_names)
 
     def get_user(self):
         return self.db.session.get(User, self.user_id)
@@ -127,15 +197,16 @@ class TaskDataExporter:
             # 組織に直接属するタスクも追加
             filter_conditions.append(Task.organization_id == user.organization_id)
 
-        result = (
-            db.session.query(Task, UserTaskOrder.display_order.label('user_order'))
+        # 配下データはチャンク単位で読み込むため、ここでは出力に使うタスクの列のみを取得する
+        return (
+            db.session.query(Task.id, Task.title, Task.due_date, Task.status_id, Task.created_by)
             .outerjoin(UserTaskOrder, and_(
                 UserTaskOrder.task_id == Task.id,
                 UserTaskOrder.user_id == self.user_id 
             ))
             .filter(
                 and_(
-                    Task.is_deleted != True,
+                    Task.is_deleted == False,
                     or_(*filter_conditions)
                 )
             )
@@ -147,29 +218,46 @@ class TaskDataExporter:
             .all()
         )
 
-        return [tup[0] for tup in result]
-
     def build_nested_export_data(self):
-        tasks = self.get_tasks()
-        data = []
-        for task in tasks:
-            task_entry = {
-                "タスク名": task.title,
-                "期限": task.due_date.strftime("%Y-%m-%d") if task.due_date else "",
-                "ステータス": self._get_status_name(task.status_id),
-                "作成者": self._get_user_name(task.created_by),
-                "objectives": self.objective_formatter.list_for_task(task.id)
-            }
-            data.append(task_entry)
-        return data
+        return list(self.iter_nested_export_data())
+
+    def iter_nested_export_data(self):
+        """
+        タスク1件分のネスト構造（オブジェクティブ・進捗を含む）を順に生成する
+        配下データはチャンクごとに読み込むため、最初のチャンクを読み込んだ時点から生成を始める
+        """
+        for dataset in self.iter_datasets():
+            objective_formatter = ObjectiveFormatter(dataset)
+            for task in dataset.tasks:
+                yield {
+                    "タスク名": task.title,
+                    "期限": task.due_date.strftime("%Y-%m-%d") if task.due_date else "",
+                    "ステータス": dataset.status_name(task.status_id),
+                    "作成者": dataset.user_name(task.created_by),
+                    "objectives": objective_formatter.list_for_task(task.id)
+                }
 
     def export_as_excel(self):
-        rows = self.build_flat_rows_for_excel()
-        df = pd.DataFrame.from_records(rows)
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, header=False, sheet_name='Tasks')
-            self.apply_excel_formatting(writer.sheets['Tasks'])
+        """
+        書き込み専用ワークブックへ行ごとにスタイルを付けて逐次書き出し、一時ファイルとして返す
+        （ワークシートはメモリ上に保持せず、配下データも EXPORT_TASK_CHUNK_SIZE 件のタスク分ずつ読み込む。
+        全件分保持するのはタスクの列の値のみ）
+        """
+        from openpyxl import Workbook
+        from openpyxl.utils import get_column_letter
+
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet('Tasks')
+        for i, width in enumerate(EXCEL_COLUMN_WIDTHS, start=1):
+            worksheet.column_dimensions[get_column_letter(i)].width = width
+        worksheet.column_dimensions['A'].hidden = True
+
+        styler = ExcelRowStyler(worksheet)
+        for row in self.iter_flat_rows_for_excel():
+            worksheet.append(styler.style_row(row))
+
+        output = tempfile.TemporaryFile()
+        workbook.save(output)
         output.seek(0)
         return output
 
@@ -177,27 +265,72 @@ class TaskDataExporter:
         data = self.build_nested_export_data()
         return yaml.dump(data, allow_unicode=True, sort_keys=False)
 
+    def iter_yaml_documents(self):
+        """タスク1件を1ドキュメントとするYAMLマルチドキュメントを逐次生成する"""
+        for task_entry in self.iter_nested_export_data():
+            yield yaml.dump(task_entry, allow_unicode=True, sort_keys=False, explicit_start=True)
+
+    def iter_ndjson_lines(self):
+        """タスク1件を1行とするNDJSONを逐次生成する"""
+        for task_entry in self.iter_nested_export_data():
+            yield json.dumps(task_entry, ensure_ascii=False) + "\n"
+
+    def export_as_csv(self, stream):
+        """進捗1件につき1行（進捗・オブジェクティブがない場合も1行）のCSVを stream に書き出す"""
+        writer = csv.writer(stream)
+        writer.writerow(CSV_HEADER)
+        writer.writerows(self.iter_csv_rows())
+
+    def iter_csv_rows(self):
+        for dataset in self.iter_datasets():
+            yield from self._iter_csv_rows(dataset)
+
+    def _iter_csv_rows(self, dataset):
+        objective_formatter = ObjectiveFormatter(dataset)
+        for task in dataset.tasks:
+            task_cols = [
+                task.title,
+                task.due_date.strftime("%Y-%m-%d") if task.due_date else "",
+                dataset.status_name(task.status_id),
+                dataset.user_name(task.created_by),
+            ]
+            for obj in objective_formatter.list_for_task(task.id) or [{}]:
+                obj_cols = [
+                    obj.get("オブジェクティブ名", ""),
+                    obj.get("期限", ""),
+                    obj.get("ステータス", ""),
+                    obj.get("担当者", ""),
+                ]
+                for p in obj.get("progresses") or [{}]:
+                    yield task_cols + obj_cols + [p.get("内容", ""), p.get("日付", ""), p.get("報告者", "")]
+
     def build_flat_rows_for_excel(self):
+        return list(self.iter_flat_rows_for_excel())
+
+    def iter_flat_rows_for_excel(self):
         user = self.get_user()
-        tasks = self.get_tasks()
-        rows = []
 
-        rows.append(["user", f"ユーザー名：{user.name}（ID：{user.id}）"])
-        rows.append(["spacer"])
+        yield ["user", f"ユーザー名：{user.name}（ID：{user.id}）"]
+        yield ["spacer"]
+
+        for dataset in self.iter_datasets():
+            yield from self._iter_flat_task_rows(dataset)
 
-        for task in tasks:
-            task_cell = f"{task.title}（期限：{task.due_date.strftime('%Y-%m-%d') if task.due_date else '未設定'}　作成者：{self._get_user_name(task.created_by)})"
-            task_status = self._get_status_name(task.status_id)
-            rows.append(["task", task_cell, task_status])
-            rows.append(["header", "オブジェクティブ名", "期限", "ステータス", "担当者", "進捗内容", "進捗日", "報告者"])
+    def _iter_flat_task_rows(self, dataset):
+        objective_formatter = ObjectiveFormatter(dataset)
+        for task in dataset.tasks:
+            task_cell = f"{task.title}（期限：{task.due_date.strftime('%Y-%m-%d') if task.due_date else '未設定'}　作成者：{dataset.user_name(task.created_by)})"
+            task_status = dataset.status_name(task.status_id)
+            yield ["task", task_cell, task_status]
+            yield ["header", "オブジェクティブ名", "期限", "ステータス", "担当者", "進捗内容", "進捗日", "報告者"]
 
-            for obj in self.objective_formatter.list_for_task(task.id):
+            for obj in objective_formatter.list_for_task(task.id):
                 progresses = obj["progresses"] or [{}]
                 for i, p in enumerate(progresses):
                     type_prefix = "objective.multi" if i > 0 else "objective"
                     if i > 0 and len(progresses) > 2:
                         type_prefix = "objective.dotted"
-                    rows.append([
+                    yield [
                         type_prefix,
                         obj["オブジェクティブ名"] if i == 0 else "",
                         obj["期限"] if i == 0 else "",
@@ -206,40 +339,55 @@ class TaskDataExporter:
                         p.get("内容", ""),
                         p.get("日付", ""),
                         p.get("報告者", "")
-                    ])
-            rows.append(["spacer"])
+                    ]
+            yield ["spacer"]
+
 
-        return rows
+class ExcelRowStyler:
+    """
+    エクスポート行（先頭列が行種別）を書き込み専用セルに変換し、行種別に応じたスタイルを付与する
+    """
 
-    def apply_excel_formatting(self, worksheet):
+    def __init__(self, worksheet):
         from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
-        col_widths = [12, 68, 11, 11, 11, 57, 11, 11]
-        for i, width in enumerate(col_widths, start=1):
-            col_letter = worksheet.cell(row=1, column=i).column_letter
-            worksheet.column_dimensions[col_letter].width = width
-        worksheet.column_dimensions['A'].hidden = True
-        wrap_columns = [2, 6]
-        header_fill = PatternFill(start_color='F2F2F2', end_color='F2F2F2', fill_type='solid')
-        thin_border = Border(left=Side(style='thin'), right=Side(style='thin'),
-                             top=Side(style='thin'), bottom=Side(style='thin'))
-
-        for row_idx in range(1, worksheet.max_row + 1):
-            type_cell = worksheet.cell(row=row_idx, column=1)
-            row_type = type_cell.value or ""
-            for col_idx, cell in enumerate(worksheet[row_idx], start=1):
-                if col_idx == 1:
-                    continue
-                if col_idx in wrap_columns:
-                    cell.alignment = Alignment(wrap_text=True)
-                if row_type == "user" and col_idx == 2:
-                    cell.font = Font(size=14)
-                elif row_type == "task" and col_idx in (2, 3):
-                    cell.font = Font(size=14, bold=True)
-                elif row_type == "header":
-                    cell.font = Font(bold=True)
-                    cell.fill = header_fill
-                    cell.alignment = Alignment(horizontal='center')
-                    cell.border = thin_border
-                elif row_type.startswith("objective"):
-                    cell.border = thin_border
-                    cell.alignment = Alignment(vertical='top', wrap_text=(col_idx in wrap_columns))
+
+        self.worksheet = worksheet
+        side = Side(style='thin')
+        self.thin_border = Border(left=side, right=side, top=side, bottom=side)
+        self.header_fill = PatternFill(start_color='F2F2F2', end_color='F2F2F2', fill_type='solid')
+        self.wrap = Alignment(wrap_text=True)
+        self.center = Alignment(horizontal='center')
+        self.top = Alignment(vertical='top')
+        self.top_wrap = Alignment(vertical='top', wrap_text=True)
+        self.user_font = Font(size=14)
+        self.task_font = Font(size=14, bold=True)
+        self.header_font = Font(bold=True)
+
+    def style_row(self, row):
+        from openpyxl.cell import WriteOnlyCell
+
+        row_type = row[0] or ""
+        values = list(row) + [None] * (len(EXCEL_COLUMN_WIDTHS) - len(row))
+        cells = [WriteOnlyCell(self.worksheet, value=values[0])]
+        for col_idx, value in enumerate(values[1:], start=2):
+            cell = WriteOnlyCell(self.worksheet, value=value)
+            self._apply(cell, row_type, col_idx)
+            cells.append(cell)
+        return cells
+
+    def _apply(self, cell, row_type, col_idx):
+        wrapped = col_idx in EXCEL_WRAP_COLUMNS
+        if wrapped:
+            cell.alignment = self.wrap
+        if row_type == "user" and col_idx == 2:
+            cell.font = self.user_font
+        elif row_type == "task" and col_idx in (2, 3):
+            cell.font = self.task_font
+        elif row_type == "header":
+            cell.font = self.header_font
+            cell.fill = self.header_fill
+            cell.alignment = self.center
+            cell.border = self.thin_border
+        elif row_type.startswith("objective"):
+            cell.border = self.thin_border
+            cell.alignment = self.top_wrap if wrapped else self.top
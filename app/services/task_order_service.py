@@ -1,33 +1,139 @@
+from flask import current_app
+from sqlalchemy import func, update
 from app.models import db, UserTaskOrder, Task
-from app.service_errors import ServiceValidationError
+from app.utils import check_task_access
+from app.constants import TaskAccessLevelEnum
+from app.resource_versions import bump_view_versions
+from app.task_rank import rank_between, ranks_between, evenly_spaced_ranks
+from app.task_order.rank_tasks import rebalance_task_ranks as rebalance_task_ranks_job
+from app.service_errors import ServiceValidationError, ServiceNotFoundError, ServicePermissionError
 
 def get_task_order(user_id):
-    orders = (
-        db.session.query(UserTaskOrder)
-        .filter_by(user_id=user_id)
-        .order_by(UserTaskOrder.display_order)
+    rows = (
+        db.session.query(UserTaskOrder.task_id, Task.title)
+        .join(Task, Task.id == UserTaskOrder.task_id)
+        .filter(UserTaskOrder.user_id == user_id, Task.is_deleted == False)
+        .order_by(UserTaskOrder.display_order, UserTaskOrder.task_id)
         .all()
     )
 
-    result = []
-    for order in orders:
-        if order.task and not order.task.is_deleted:
-            result.append({
-                'task_id': order.task_id,
-                'title': order.task.title
-            })
-
-    return result
+    return [{'task_id': task_id, 'title': title} for task_id, title in rows]
 
 def save_task_order(user_id, data):
+    """並び順を全件指定で保存する（等間隔のランクで振り直す。1件の移動には move_task を使う）"""
     task_ids = data.get('task_ids', [])
     if not isinstance(task_ids, list):
         raise ServiceValidationError('task_ids はリストである必要があります')
 
     # 一括削除 & 再登録
     db.session.query(UserTaskOrder).filter_by(user_id=user_id).delete()
-    for index, task_id in enumerate(task_ids):
-        db.session.add(UserTaskOrder(user_id=user_id, task_id=task_id, display_order=index))
+    for task_id, rank in zip(task_ids, evenly_spaced_ranks(len(task_ids))):
+        db.session.add(UserTaskOrder(user_id=user_id, task_id=task_id, display_order=rank))
 
     db.session.commit()
     return {'message': 'タスクの並び順を保存しました'}
+
+def prepend_ranks(user_id, count):
+    """ユーザーの並び順の先頭に追加する count 件分のランクを昇順で返す（既存行は書き換えない）"""
+    first_rank = db.session.query(func.min(UserTaskOrder.display_order)) \
+        .filter(UserTaskOrder.user_id == user_id).scalar()
+    return ranks_between(None, first_rank, count)
+
+def move_task(user, task_id, prev_task_id=None, next_task_id=None):
+    """
+    タスクを prev_task_id と next_task_id の間に移動する（書き込みは移動するタスクの1行のみ）
+    片方のみ指定した場合は、指定したタスクの直後（直前）に移動する
+    """
+    if prev_task_id is None and next_task_id is None:
+        raise ServiceValidationError('prev_task_id または next_task_id を指定してください')
+    if task_id in (prev_task_id, next_task_id):
+        raise ServiceValidationError('移動するタスク自身は前後のタスクに指定できません')
+
+    task = Task.query.filter_by(id=task_id, is_deleted=False).first()
+    if not task:
+        raise ServiceNotFoundError('タスクが見つかりません')
+    if not check_task_access(user, task, TaskAccessLevelEnum.VIEW):
+        raise ServicePermissionError('このタスクを閲覧する権限がありません')
+
+    neighbor_ids = [i for i in (prev_task_id, next_task_id) if i is not None]
+    neighbor_ranks = dict(
+        db.session.query(UserTaskOrder.task_id, UserTaskOrder.display_order)
+        .filter(UserTaskOrder.user_id == user.id, UserTaskOrder.task_id.in_(neighbor_ids))
+        .all()
+    )
+    if len(neighbor_ranks) != len(neighbor_ids):
+        raise ServiceNotFoundError('前後に指定したタスクが並び順にありません')
+
+    before = neighbor_ranks.get(prev_task_id)
+    after = neighbor_ranks.get(next_task_id)
+    if prev_task_id is None:
+        before = _adjacent_rank(user.id, task_id, func.max, UserTaskOrder.display_order < after)
+    elif next_task_id is None:
+        after = _adjacent_rank(user.id, task_id, func.min, UserTaskOrder.display_order > before)
+    elif before >= after:
+        raise ServiceValidationError('prev_task_id には next_task_id より前のタスクを指定してください')
+
+    rank = rank_between(before, after)
+    order = UserTaskOrder.query.filter_by(user_id=user.id, task_id=task_id).first()
+    if order:
+        order.display_order = rank
+    else:
+        db.session.add(UserTaskOrder(user_id=user.id, task_id=task_id, display_order=rank))
+    db.session.commit()
+
+    schedule_rank_rebalance_if_needed(user.id, [rank])
+    return {'message': 'タスクを移動しました'}
+
+def _adjacent_rank(user_id, task_id, aggregate, condition):
+    """移動するタスク自身を除き、condition を満たすランクの最大（最小）値を返す"""
+    return db.session.query(aggregate(UserTaskOrder.display_order)).filter(
+        UserTaskOrder.user_id == user_id, UserTaskOrder.task_id != task_id, condition
+    ).scalar()
+
+def schedule_rank_rebalance_if_needed(user_id, ranks):
+    """
+    ランクが TASK_RANK_REBALANCE_LENGTH を超えて長くなっていれば、再採番をバックグラウンドに依頼する
+    （依頼に失敗しても並び順自体は正しいため、警告ログのみ出力する）
+    """
+    limit = current_app.config.get('TASK_RANK_REBALANCE_LENGTH', 24)
+    if not any(len(rank) > limit for rank in ranks):
+        return False
+    try:
+        rebalance_task_ranks_job.delay(user_id)
+    except Exception as e:
+        current_app.logger.warning(f"[RANK] rebalance enqueue failed user_id={user_id}: {e}")
+        return False
+    return True
+
+def rebalance_task_ranks(user_id):
+    """ユーザーの並び順を保ったまま、ランクを等間隔・同じ桁数に振り直す"""
+    order_ids = [
+        order_id for order_id, in
+        db.session.query(UserTaskOrder.id)
+        .filter(UserTaskOrder.user_id == user_id)
+        .order_by(UserTaskOrder.display_order, UserTaskOrder.task_id)
+        .all()
+    ]
+    if order_ids:
+        db.session.execute(update(UserTaskOrder), [
+            {'id': order_id, 'display_order': rank}
+            for order_id, rank in zip(order_ids, evenly_spaced_ranks(len(order_ids)))
+        ])
+        bump_view_versions([user_id])
+    db.session.commit()
+    return len(order_ids)
+
+def rebalance_long_ranks(min_length=None):
+    """ランクが min_length（既定は TASK_RANK_REBALANCE_LENGTH）を超えているユーザーを再採番し、ユーザー数を返す"""
+    if min_length is None:
+        min_length = current_app.config.get('TASK_RANK_REBALANCE_LENGTH', 24)
+    user_ids = [
+        user_id for user_id, in
+        db.session.query(UserTaskOrder.user_id)
+        .filter(func.length(UserTaskOrder.display_order) > min_length)
+        .distinct()
+        .all()
+    ]
+    for user_id in user_ids:
+        rebalance_task_ranks(user_id)
+    return len(user_ids)
@@ -2,11 +2,10 @@
 
 from flask import current_app
 import re
-from sqlalchemy.orm import joinedload
 from ..models import db, User, Organization, AccessScope, Company
+from ..read_models import UserRow, AccessScopeRow
 from ..utils import (
     get_all_child_organizations,
-    get_descendant_organizations,
     check_org_access,
 )
 from ..constants import OrgRoleEnum
@@ -171,50 +170,66 @@ def get_users(user, query_args):
 
     # スーパーユーザーなら全ユーザーを返す
     if requester.is_superuser:
-        query = db.session.query(User).options(joinedload(User.organization))
         if company_id:
-            query = query.join(Organization).filter(Organization.company_id == company_id)
-        return query.all()
+            return _load_user_rows(User.organization_id.in_(
+                db.session.query(Organization.id).filter(Organization.company_id == company_id)
+            ))
+        return _load_user_rows()
 
     # system-admin ロールのチェック
     system_admin_scope = next(
         (s for s in requester.access_scopes if s.role == OrgRoleEnum.SYSTEM_ADMIN), None
     )
     if system_admin_scope:
-        company_id = system_admin_scope.organization.company_id
-        orgs = (
-            Organization.query
-            .filter_by(company_id=company_id)
-            .all()
-        )
-        org_ids = [org.id for org in orgs]
-        return (
-            User.query
-            .options(joinedload(User.organization))
-            .filter(User.organization_id.in_(org_ids))
-            .all()
+        # 組織はエンティティ化せず、会社IDと組織IDの列だけで絞り込む
+        company_id = (
+            db.session.query(Organization.company_id)
+            .filter(Organization.id == system_admin_scope.organization_id)
+            .scalar()
         )
+        return _load_user_rows(User.organization_id.in_(
+            db.session.query(Organization.id).filter(Organization.company_id == company_id)
+        ))
 
     # 通常の組織管理者（ORG_ADMIN）なら所属組織＋子組織のみ
     if not check_org_access(requester, organization_id or requester.organization_id, OrgRoleEnum.ORG_ADMIN):
         raise ServicePermissionError('権限がありません')
 
-    all_orgs = Organization.query.all()
     base_org_id = organization_id or requester.organization_id
     base_org = db.session.get(Organization, base_org_id)
     if not base_org:
         raise ServiceNotFoundError('組織が見つかりません')
 
-    descendants = get_descendant_organizations(base_org.id, all_orgs)
-    org_ids = [org.id for org in descendants]
+    org_ids = get_all_child_organizations(base_org.id)
+    return _load_user_rows(User.organization_id.in_(org_ids))
+
+
+def _load_user_rows(*criteria):
+    """
+    条件に合うユーザーを読み取り専用モデル（所属組織名・会社ID・アクセススコープ付き）で返す
+    ユーザーとアクセススコープをそれぞれ1クエリで取得し、ORM エンティティは読み込まない
+    """
+    users = [
+        UserRow(*row) for row in
+        db.session.query(*UserRow.columns())
+        .outerjoin(Organization, Organization.id == User.organization_id)
+        .filter(*criteria)
+        .order_by(User.id)
+        .all()
+    ]
+    if not users:
+        return users
 
-    users = (
-        User.query
-        .options(joinedload(User.organization))
-        .filter(User.organization_id.in_(org_ids))
+    users_by_id = {user.id: user for user in users}
+    scope_rows = (
+        db.session.query(*AccessScopeRow.columns())
+        .join(User, User.id == AccessScope.user_id)
+        .filter(*criteria)
+        .order_by(AccessScope.id)
         .all()
     )
-
+    for row in scope_rows:
+        users_by_id[row.user_id].access_scopes.append(AccessScopeRow(*row))
     return users
 
 
@@ -244,7 +259,6 @@ def get_users_by_org_tree(org_id, current_user):
 
     try:
         org_ids = get_all_child_organizations(org_id)
-        users = User.query.filter(User.organization_id.in_(org_ids)).all()
-        return users
+        return _load_user_rows(User.organization_id.in_(org_ids))
     except Exception as e:
         raise ServiceValidationError(str(e))
@@ -0,0 +1,76 @@
+# app/sql_timing.py
+
+import json
+import random
+import time
+from flask import current_app, g, has_app_context, request
+from sqlalchemy import event
+from .extensions import db
+
+SERVER_TIMING_METRIC = "sql"
+
+
+def init_sql_timing(app):
+    """
+    リクエストごとの SQL 発行数と DB 時間を計測し、Server-Timing ヘッダーと構造化ログに出力する
+    SQL_TIMING_SAMPLE_RATE（0〜1）の割合のリクエストのみ計測する（0 で無効）
+    """
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_statement_timer(conn, cursor, statement, parameters, context, executemany):
+        if has_app_context() and "_sql_timing" in g:
+            conn.info.setdefault("_sql_timing_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _stop_statement_timer(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("_sql_timing_started")
+        if not started or not has_app_context() or "_sql_timing" not in g:
+            return
+        timing = g._sql_timing
+        timing["statements"] += 1
+        timing["seconds"] += time.perf_counter() - started.pop()
+
+    @event.listens_for(engine, "handle_error")
+    def _discard_statement_timer(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("_sql_timing_started"):
+            conn.info["_sql_timing_started"].pop()
+
+    app.before_request(_start_request_timing)
+    app.after_request(_emit_request_timing)
+    app.teardown_request(_clear_request_timing)
+
+
+def _start_request_timing():
+    rate = current_app.config.get("SQL_TIMING_SAMPLE_RATE", 0)
+    if rate and (rate >= 1 or random.random() < rate):
+        g._sql_timing = {"statements": 0, "seconds": 0.0}
+
+
+def _emit_request_timing(response):
+    timing = g.pop("_sql_timing", None)
+    if timing is None:
+        return response
+
+    db_ms = timing["seconds"] * 1000
+    metric = f'{SERVER_TIMING_METRIC};dur={db_ms:.2f};desc="{timing["statements"]} statements"'
+    existing = response.headers.get("Server-Timing")
+    response.headers["Server-Timing"] = f"{existing}, {metric}" if existing else metric
+
+    current_app.logger.info(json.dumps({
+        "event": "sql_timing",
+        "blueprint": request.blueprint,
+        "endpoint": request.endpoint,
+        "method": request.method,
+        "path": request.path,
+        "status": response.status_code,
+        "statements": timing["statements"],
+        "db_ms": round(db_ms, 2),
+    }, ensure_ascii=False))
+    return response
+
+
+def _clear_request_timing(exc=None):
+    g.pop("_sql_timing", None)
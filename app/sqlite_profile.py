@@ -0,0 +1,62 @@
+# app/sqlite_profile.py
+
+import re
+import sqlite3
+from sqlalchemy import event, text
+from .extensions import db
+
+# 接続ごとに適用する PRAGMA の順序（journal_mode は他の設定より先に切り替える）
+SQLITE_PRAGMA_ORDER = ("busy_timeout", "journal_mode", "synchronous", "mmap_size", "cache_size", "temp_store")
+
+_PRAGMA_VALUE = re.compile(r"^-?[A-Za-z0-9_]+$")
+
+
+def init_sqlite_profile(app):
+    """
+    SQLite 利用時、接続ごとに SQLITE_PRAGMAS（WAL・synchronous・mmap 等）を適用するリスナーを登録する
+    """
+    pragmas = _validated_pragmas(app.config.get("SQLITE_PRAGMAS") or {})
+    if not pragmas:
+        return
+
+    with app.app_context():
+        engine = db.engine
+        if engine.dialect.name != "sqlite":
+            return
+
+        @event.listens_for(engine, "connect")
+        def apply_sqlite_profile(dbapi_connection, connection_record):
+            if not isinstance(dbapi_connection, sqlite3.Connection):
+                return
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas:
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+
+
+def run_sqlite_maintenance(checkpoint_mode="TRUNCATE"):
+    """
+    WAL をチェックポイントし、PRAGMA optimize で統計情報を更新する（定期実行を想定）
+    戻り値: {"busy": ..., "log_frames": ..., "checkpointed_frames": ...}
+    """
+    if checkpoint_mode not in ("PASSIVE", "FULL", "RESTART", "TRUNCATE"):
+        raise ValueError(f"invalid checkpoint mode: {checkpoint_mode}")
+
+    with db.engine.connect() as conn:
+        busy, log_frames, checkpointed = conn.execute(text(f"PRAGMA wal_checkpoint({checkpoint_mode})")).one()
+        conn.execute(text("PRAGMA optimize"))
+        conn.commit()
+    return {"busy": busy, "log_frames": log_frames, "checkpointed_frames": checkpointed}
+
+
+def _validated_pragmas(config_pragmas):
+    pragmas = []
+    for name in SQLITE_PRAGMA_ORDER:
+        value = config_pragmas.get(name)
+        if value in (None, ""):
+            continue
+        value = str(value)
+        if not _PRAGMA_VALUE.match(value):
+            raise ValueError(f"invalid value for SQLite PRAGMA {name}: {value!r}")
+        pragmas.append((name, value))
+    return pragmas
@@ -0,0 +1,155 @@
+# app/status_registry.py
+
+import threading
+import time
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from .models import db, Status
+from .constants import StatusEnum, STATUS_LABELS
+
+# ステータス表のバージョン（Status の変更がコミットされるたびに加算）
+_status_version = 0
+_registry = None
+_registry_lock = threading.Lock()
+
+
+class StatusRegistry:
+    """
+    ステータス表のプロセス内スナップショット（ID ↔ StatusEnum ↔ 表示ラベル）
+
+    - 構築時に1クエリで全ステータスを読み込み、以降の変換はクエリを発行しない
+    - StatusEnum に無い名前のステータスは、名前をそのままラベルとして扱う
+    """
+
+    def __init__(self, rows, version):
+        self.version = version
+        self.built_at = time.monotonic()
+        self.names = {}
+        self.enums = {}
+        self.ids = {}
+        for status_id, name in rows:
+            self.names[status_id] = name
+            try:
+                status_enum = StatusEnum(name)
+            except ValueError:
+                continue
+            self.enums[status_id] = status_enum
+            self.ids.setdefault(status_enum, status_id)
+
+    def __contains__(self, status_id):
+        return status_id in self.names
+
+    def id_for(self, status_enum):
+        return self.ids.get(status_enum)
+
+    def enum_for(self, status_id):
+        return self.enums.get(status_id)
+
+    def name_for(self, status_id):
+        return self.names.get(status_id)
+
+    def label_for(self, status_id):
+        status_enum = self.enums.get(status_id)
+        if status_enum is not None:
+            return STATUS_LABELS[status_enum]
+        return self.names.get(status_id)
+
+    def items(self):
+        """StatusEnum に対応するステータスを ID 順に返す（GET /tasks/statuses の形式）"""
+        return [
+            {'id': status_id, 'enum': status_enum.value, 'label': STATUS_LABELS[status_enum]}
+            for status_id, status_enum in sorted(self.enums.items())
+        ]
+
+
+def get_status_registry():
+    """
+    ステータス表のスナップショットを返す
+    ステータスの変更がこのプロセスでコミットされたか、STATUS_CACHE_TTL を過ぎている場合は読み込み直す
+    """
+    registry = _registry
+    ttl = current_app.config.get('STATUS_CACHE_TTL', 3600) if has_app_context() else 0
+    if registry is not None and registry.version == _status_version and time.monotonic() - registry.built_at < ttl:
+        return registry
+    return reload_status_registry()
+
+
+def reload_status_registry():
+    """ステータス表を読み込み直してスナップショットを差し替える"""
+    global _registry
+    version = _status_version
+    rows = db.session.query(Status.id, Status.name).order_by(Status.id).all()
+    registry = StatusRegistry(rows, version)
+    with _registry_lock:
+        _registry = registry
+    return registry
+
+
+def _lookup(getter, key):
+    """スナップショットに無いキーは、他プロセスで追加された可能性があるため1回だけ読み込み直して引き直す"""
+    value = getter(get_status_registry(), key)
+    if value is None and key is not None:
+        value = getter(reload_status_registry(), key)
+    return value
+
+
+def status_id_for(status_enum):
+    """StatusEnum に対応するステータスID（存在しなければ None）"""
+    return _lookup(StatusRegistry.id_for, status_enum)
+
+
+def status_name_for(status_id):
+    """ステータスIDに対応するステータス名（存在しなければ None）"""
+    return _lookup(StatusRegistry.name_for, status_id)
+
+
+def status_label_for(status_id):
+    """ステータスIDに対応する表示ラベル（存在しなければ None）"""
+    return _lookup(StatusRegistry.label_for, status_id)
+
+
+def is_valid_status_id(status_id):
+    return status_name_for(status_id) is not None
+
+
+def init_status_registry(app):
+    """
+    起動時にステータス表を読み込んでおく（ワーカーごとに1回）
+    テーブル未作成（マイグレーション前など）の場合は、初回利用時に読み込む
+    """
+    with app.app_context():
+        try:
+            reload_status_registry()
+        except SQLAlchemyError as e:
+            app.logger.info(f"[STATUS] registry is loaded lazily: {e.__class__.__name__}")
+        finally:
+            db.session.remove()
+
+
+def invalidate_status_registry():
+    """ステータス表のバージョンを進め、スナップショットを無効化する"""
+    global _status_version, _registry
+    with _registry_lock:
+        _status_version += 1
+        _registry = None
+
+
+@event.listens_for(Session, 'after_flush')
+def _mark_status_changes(session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Status):
+            session.info['status_table_changed'] = True
+            return
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_status_version_on_commit(session):
+    if session.info.pop('status_table_changed', False):
+        invalidate_status_registry()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_status_changes_on_rollback(session):
+    session.info.pop('status_table_changed', None)
@@ -0,0 +1,18 @@
+# app/task_order/rank_tasks.py
+from celery.utils.log import get_task_logger
+
+from celery_app import celery, app_context
+
+logger = get_task_logger(__name__)
+
+
+@celery.task(bind=True)
+def rebalance_task_ranks(self, user_id: int) -> dict:
+    """ユーザーのタスク表示順ランクを等間隔・短い桁数に再採番する"""
+    from app.services import task_order_service
+
+    logger.info("rank rebalance started: user_id=%s job_id=%s", user_id, self.request.id)
+    with app_context():
+        count = task_order_service.rebalance_task_ranks(user_id)
+
+    return {"status": "success", "user_id": user_id, "count": count}
@@ -0,0 +1,79 @@
+# app/task_rank.py
+"""
+ユーザー別タスク表示順の辞書順ランク（fractional indexing）
+
+ランクは 0 以上 1 未満の小数の小数部を 36 進数で表した文字列で、文字列の辞書順がそのまま並び順になる。
+任意の2つのランクの間には必ず新しいランクを作れるため、並べ替え・先頭への追加は1行の書き込みで済む。
+末尾が "0" のランクは作らない（"a" と "a0" のように同じ値を指す別表記を避け、常に間に挿入できるようにする）。
+"""
+
+import math
+
+RANK_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+RANK_BASE = len(RANK_DIGITS)
+
+
+def rank_between(before=None, after=None):
+    """
+    before と after の間に並ぶランクを返す（None はそれぞれ先頭・末尾を表す）
+    """
+    before = before or ""
+    if after is not None and before >= after:
+        raise ValueError(f"rank_between: {before!r} は {after!r} より前である必要があります")
+    if before.endswith("0") or (after or "").endswith("0"):
+        raise ValueError("rank_between: 末尾が 0 のランクは扱えません")
+    return _midpoint(before, after)
+
+
+def _midpoint(before, after):
+    if after is not None:
+        # 共通の接頭辞はそのまま残し、残りの桁で中間を求める
+        n = 0
+        while n < len(after) and (before[n] if n < len(before) else "0") == after[n]:
+            n += 1
+        if n > 0:
+            return after[:n] + _midpoint(before[n:], after[n:])
+
+    digit_before = RANK_DIGITS.index(before[0]) if before else 0
+    digit_after = RANK_DIGITS.index(after[0]) if after is not None else RANK_BASE
+    if digit_after - digit_before > 1:
+        return RANK_DIGITS[(digit_before + digit_after + 1) // 2]
+    if after is not None and len(after) > 1:
+        return after[:1]
+    return RANK_DIGITS[digit_before] + _midpoint(before[1:], None)
+
+
+def ranks_between(before, after, count):
+    """
+    before と after の間に並ぶ count 個のランクを昇順で返す
+    中央から二分して割り当てるため、ランク長の増加は count の対数程度に収まる
+    """
+    if count <= 0:
+        return []
+    middle = count // 2
+    middle_rank = rank_between(before, after)
+    return (
+        ranks_between(before, middle_rank, middle)
+        + [middle_rank]
+        + ranks_between(middle_rank, after, count - middle - 1)
+    )
+
+
+def evenly_spaced_ranks(count):
+    """
+    count 個のランクを等間隔・同じ桁数で返す（再採番用）
+    先頭の前と末尾の後ろにも1区間分の余白を残す
+    """
+    if count <= 0:
+        return []
+    width = max(1, math.ceil(math.log(count + 1, RANK_BASE))) + 1
+    step = RANK_BASE ** width // (count + 1)
+    return [_encode_fraction((i + 1) * step, width) for i in range(count)]
+
+
+def _encode_fraction(value, width):
+    digits = []
+    for _ in range(width):
+        value, remainder = divmod(value, RANK_BASE)
+        digits.append(RANK_DIGITS[remainder])
+    return "".join(reversed(digits)).rstrip("0")
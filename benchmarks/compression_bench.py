@@ -0,0 +1,100 @@
+# benchmarks/compression_bench.py
+"""
+レスポンス圧縮のベンチマーク
+
+seed-scale のデータで一覧・エクスポートの非圧縮レスポンスを取得し、使えるエンコーディング
+（gzip と、インストールされていれば br / zstd）の各レベルで圧縮後のバイト数と CPU 時間を比較する。
+
+    python -m benchmarks.compression_bench
+    python -m benchmarks.compression_bench --preset large --iterations 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.endpoint_latency import BENCHMARK_PASSWORD, PRESETS, build_app, pick_targets, seed
+
+LEVELS = {"gzip": (1, 6, 9), "br": (1, 4, 6, 11), "zstd": (1, 3, 10)}
+
+
+def payloads(prefix):
+    return {
+        "GET /tasks": f"{prefix}/tasks",
+        "GET /users": f"{prefix}/users",
+        "GET /organizations/tree": f"{prefix}/organizations/tree",
+        "GET /exports/yaml": f"{prefix}/exports/yaml",
+        "GET /exports/stream (ndjson)": f"{prefix}/exports/stream?format=ndjson",
+    }
+
+
+def compress(encoder_class, level, body, chunk_size):
+    encoder = encoder_class(level)
+    parts = [encoder.compress(body[i:i + chunk_size]) for i in range(0, len(body), chunk_size)]
+    parts.append(encoder.finish())
+    return b"".join(parts)
+
+
+def measure(encoder_class, level, body, chunk_size, iterations):
+    samples = []
+    for _ in range(iterations):
+        started = time.process_time()
+        size = len(compress(encoder_class, level, body, chunk_size))
+        samples.append((time.process_time() - started) * 1000)
+    return size, statistics.median(samples)
+
+
+def main(argv=None):
+    from app.compression import available_encoders
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--chunk-size", type=int, default=64 * 1024, help="ストリーミング時の入力チャンクサイズ")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = build_app(os.path.join(tmp_dir, "benchmark.db"))
+        seed(app, args.preset, args.seed)
+        targets = pick_targets(app)
+
+        prefix = os.getenv("URL_PREFIX", "")
+        client = app.test_client()
+        res = client.post(f"{prefix}/sessions", json={"email": targets["email"], "password": BENCHMARK_PASSWORD})
+        if res.status_code != 200:
+            parser.error(f"login failed: {res.status_code} {res.get_data(as_text=True)}")
+
+        bodies = {}
+        for name, url in payloads(prefix).items():
+            # 非圧縮の本文を得るため identity を指定する
+            res = client.get(url, headers={"Accept-Encoding": "identity"})
+            bodies[name] = res.get_data()
+            res.close()
+
+        from app.extensions import db
+        with app.app_context():
+            db.engine.dispose()
+
+    results = {"preset": args.preset, "encoders": sorted(available_encoders()), "payloads": {}}
+    for name, body in bodies.items():
+        entry = {"bytes": len(body), "encodings": {}}
+        for encoding, (encoder_class, _, _) in available_encoders().items():
+            for level in LEVELS[encoding]:
+                size, cpu_ms = measure(encoder_class, level, body, args.chunk_size, args.iterations)
+                entry["encodings"][f"{encoding}-{level}"] = {
+                    "bytes": size,
+                    "ratio": round(len(body) / size, 1) if size else None,
+                    "cpu_ms": round(cpu_ms, 2),
+                }
+        results["payloads"][name] = entry
+
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
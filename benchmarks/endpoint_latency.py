@@ -0,0 +1,269 @@
+# benchmarks/endpoint_latency.py
+"""
+主要エンドポイントのレイテンシ・ベンチマーク
+
+`flask seed-scale` と同じ生成器で作った大規模データに対し、Flask テストクライアント経由で
+実際の Blueprint を呼び出し、エンドポイントごとに p50/p95/p99 レイテンシ、1リクエストあたりの
+SQL 発行数、ピークメモリ（tracemalloc）を計測して JSON に出力する。
+保存済みのベースラインと比較し、SQL 発行数の増加またはピークメモリの許容幅を超えた悪化があれば
+終了コード 1 で終了する。
+
+    python -m benchmarks.endpoint_latency --preset small
+    python -m benchmarks.endpoint_latency --preset small --update-baseline
+    python -m benchmarks.endpoint_latency --preset large --iterations 50 --output /tmp/large.json
+
+レイテンシは同じマシンでも実行ごとに数十％以上ぶれるため、既定では差分を表示するだけで失敗にはしない。
+--latency-tolerance を指定した場合のみ p95 も判定に含める（ベースラインは比較に使うマシンで更新すること）。
+SQL 発行数は環境に依存しないため、許容幅なしで比較する。
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy import event, select
+
+from config import Config
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "baseline.json")
+
+# seed-scale のパラメータ（small: 約4千行 / large: 約100万行）
+PRESETS = {
+    "small": dict(companies=1, org_depth=3, org_fanout=3, users_per_org=4, tasks_per_user=5,
+                  objectives_per_task=3, progress_per_objective=3, acl_density=0.3),
+    "large": dict(companies=1, org_depth=4, org_fanout=5, users_per_org=10, tasks_per_user=10,
+                  objectives_per_task=4, progress_per_objective=15, acl_density=0.3),
+}
+
+BENCHMARK_PASSWORD = "benchmark"
+
+
+def build_app(db_path):
+    from app import create_app
+
+    os.environ.setdefault("URL_PREFIX", "")
+
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{db_path}"
+
+    return create_app(BenchmarkConfig)
+
+
+def seed(app, preset, seed_value):
+    from app.extensions import db
+    from app.seed_scale import SeedScaleOptions, seed_scale_dataset
+
+    with app.app_context():
+        db.create_all()
+        result = seed_scale_dataset(SeedScaleOptions(seed=seed_value, password=BENCHMARK_PASSWORD, **PRESETS[preset]))
+    print(f"seeded {sum(result['counts'].values())} rows in {result['seconds']:.1f}s", file=sys.stderr)
+
+
+def pick_targets(app):
+    """計測対象のユーザー（会社の SYSTEM_ADMIN）と、そのユーザーのタスク・オブジェクティブを選ぶ"""
+    from app.constants import OrgRoleEnum
+    from app.extensions import db
+    from app.models import AccessScope, Objective, Task, User
+
+    with app.app_context():
+        user = db.session.execute(
+            select(User).join(AccessScope, AccessScope.user_id == User.id)
+            .where(AccessScope.role == OrgRoleEnum.SYSTEM_ADMIN).order_by(User.id)
+        ).scalars().first()
+        task_id = db.session.scalar(select(Task.id).where(Task.created_by == user.id).order_by(Task.id))
+        objective_id = db.session.scalar(select(Objective.id).where(Objective.task_id == task_id).order_by(Objective.id))
+        return {"email": user.email, "task_id": task_id, "objective_id": objective_id}
+
+
+def endpoints(prefix, targets):
+    return {
+        "GET /tasks": f"{prefix}/tasks",
+        "GET /objectives/tasks/<id>": f"{prefix}/objectives/tasks/{targets['task_id']}",
+        "GET /updates/<id>": f"{prefix}/updates/{targets['objective_id']}",
+        "GET /organizations/tree": f"{prefix}/organizations/tree",
+        "GET /users": f"{prefix}/users",
+        "GET /exports/excel": f"{prefix}/exports/excel",
+        "GET /exports/yaml": f"{prefix}/exports/yaml",
+    }
+
+
+def measure(app, client, url, iterations, warmup):
+    from app.extensions import db
+
+    statements = []
+
+    def count_statement(*args):
+        statements.append(1)
+
+    for _ in range(warmup):
+        client.get(url).close()
+
+    latencies, query_counts = [], []
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        for _ in range(iterations):
+            statements.clear()
+            started = time.perf_counter()
+            res = client.get(url)
+            res.get_data()
+            latencies.append((time.perf_counter() - started) * 1000)
+            query_counts.append(len(statements))
+            status = res.status_code
+            res.close()
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+
+    # tracemalloc はレイテンシを歪めるため別パスで計測する
+    tracemalloc.start()
+    try:
+        client.get(url).close()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "status": status,
+        "p50_ms": round(quantiles[49], 3),
+        "p95_ms": round(quantiles[94], 3),
+        "p99_ms": round(quantiles[98], 3),
+        "queries": max(query_counts),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def compare(results, baseline, tolerance, latency_tolerance=None):
+    """
+    ベースラインより悪化した項目の説明を返す
+    SQL 発行数は許容幅なし、ピークメモリは tolerance、p95 は latency_tolerance を指定した場合のみ判定する
+    """
+    regressions = []
+    if baseline.get("meta", {}).get("preset") != results["meta"]["preset"]:
+        regressions.append(
+            f"preset mismatch: baseline={baseline.get('meta', {}).get('preset')} current={results['meta']['preset']}"
+        )
+        return regressions
+
+    limits = {"peak_kib": tolerance}
+    if latency_tolerance is not None:
+        limits["p95_ms"] = latency_tolerance
+
+    for name, base in baseline["endpoints"].items():
+        current = results["endpoints"].get(name)
+        if current is None:
+            regressions.append(f"{name}: missing from results")
+            continue
+        if current["status"] != base["status"]:
+            regressions.append(f"{name}: status {base['status']} -> {current['status']}")
+        if current["queries"] > base["queries"]:
+            regressions.append(f"{name}: queries {base['queries']} -> {current['queries']}")
+        for metric, metric_tolerance in limits.items():
+            limit = base[metric] * (1 + metric_tolerance)
+            if current[metric] > limit:
+                regressions.append(f"{name}: {metric} {base[metric]} -> {current[metric]} (limit {limit:.1f})")
+    return regressions
+
+
+def latency_changes(results, baseline):
+    """ベースラインとの p95 の差分を返す（表示用。判定には使わない）"""
+    changes = []
+    for name, current in results["endpoints"].items():
+        base = baseline.get("endpoints", {}).get(name)
+        if base is None or not base["p95_ms"]:
+            continue
+        ratio = current["p95_ms"] / base["p95_ms"] - 1
+        changes.append(f"{name}: p95_ms {base['p95_ms']} -> {current['p95_ms']} ({ratio:+.0%})")
+    return changes
+
+
+def print_table(results):
+    print(f"{'endpoint':<30}{'status':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}{'peak KiB':>11}")
+    for name, r in results["endpoints"].items():
+        print(f"{name:<30}{r['status']:>7}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['p99_ms']:>10.2f}"
+              f"{r['queries']:>9}{r['peak_kib']:>11.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--only", action="append", help="計測するエンドポイント名（複数指定可）")
+    parser.add_argument("--output", help="結果 JSON の出力先（省略時は標準出力に表示のみ）")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="ピークメモリの許容悪化率")
+    parser.add_argument("--latency-tolerance", type=float,
+                        help="p95 の許容悪化率（省略時はレイテンシを判定に含めず差分の表示のみ）")
+    parser.add_argument("--update-baseline", action="store_true", help="結果でベースラインを上書きする")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = build_app(os.path.join(tmp_dir, "benchmark.db"))
+        seed(app, args.preset, args.seed)
+        targets = pick_targets(app)
+
+        prefix = os.getenv("URL_PREFIX", "")
+        client = app.test_client()
+        res = client.post(f"{prefix}/sessions", json={"email": targets["email"], "password": BENCHMARK_PASSWORD})
+        if res.status_code != 200:
+            parser.error(f"login failed: {res.status_code} {res.get_data(as_text=True)}")
+
+        results = {
+            "meta": {
+                "preset": args.preset,
+                "seed": args.seed,
+                "iterations": args.iterations,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+            },
+            "endpoints": {},
+        }
+        for name, url in endpoints(prefix, targets).items():
+            if args.only and name not in args.only:
+                continue
+            results["endpoints"][name] = measure(app, client, url, args.iterations, args.warmup)
+
+        from app.extensions import db
+        with app.app_context():
+            db.engine.dispose()
+
+    print_table(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"baseline updated: {args.baseline}")
+        return
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("meta", {}).get("preset") == results["meta"]["preset"]:
+            print("\nlatency vs baseline (informational):")
+            for line in latency_changes(results, baseline):
+                print(f"  {line}")
+        regressions = compare(results, baseline, args.tolerance, args.latency_tolerance)
+        if regressions:
+            print("\nregressions:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\nno regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
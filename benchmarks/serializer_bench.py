@@ -0,0 +1,102 @@
+# benchmarks/serializer_bench.py
+"""
+一覧レスポンスのシリアライズ・ベンチマーク
+
+一覧エンドポイントが返す読み取り専用モデル（TaskRow / ObjectiveRow / UserRow）を --rows 件メモリ上に作り、
+次の2通りで「dump → JSON バイト列」までの時間を比較する（DB アクセスは含まない）。
+
+- before: marshmallow の schema.dump(many=True) + Flask 既定の JSON プロバイダ
+- after : app.serializers のコンパイル済みシリアライザ + JSON_BACKEND（auto）のプロバイダ
+
+    python -m benchmarks.serializer_bench
+    python -m benchmarks.serializer_bench --rows 10000 --iterations 10
+"""
+
+import argparse
+import json
+import statistics
+import time
+from datetime import date, datetime, timedelta
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.constants import OrgRoleEnum, StatusEnum
+from app.json_provider import init_json_provider, json_backend_name
+from app.read_models import AccessScopeRow, ObjectiveRow, TaskRow, UserRow
+from app.schemas import ObjectiveSchema, TaskSchema, UserWithScopesSchema
+from app.serializers import get_serializer
+
+
+def build_rows(count):
+    start = datetime(2025, 1, 1, 9, 0, 0)
+    statuses = [status.value for status in StatusEnum]
+    tasks = [
+        TaskRow(i, i % 5 + 1, f"Task {i}", "説明" * 8, date(2025, 1, 1) + timedelta(days=i % 365), i % 50,
+                1, start + timedelta(minutes=i), None, i % 20, user_access_level="full",
+                user_rank=f"i{i:06d}", status_name=statuses[i % len(statuses)])
+        for i in range(1, count + 1)
+    ]
+    objectives = [
+        ObjectiveRow(i, i // 4 + 1, f"Objective {i}", date(2025, 6, 1), i % 50, i % 4, i % 5 + 1, 1,
+                     start + timedelta(minutes=i), date(2025, 3, 1), assigned_user_name=f"User {i % 50}",
+                     latest_progress="進捗報告")
+        for i in range(1, count + 1)
+    ]
+    users = []
+    for i in range(1, count + 1):
+        user = UserRow(i, None, f"User {i}", f"user{i}@example.com", False, i % 20, f"Org {i % 20}", 1)
+        user.access_scopes = [AccessScopeRow(i, i, i % 20, OrgRoleEnum.MEMBER)]
+        users.append(user)
+    return {"tasks": (TaskSchema, tasks), "objectives": (ObjectiveSchema, objectives),
+            "users": (UserWithScopesSchema, users)}
+
+
+def measure(func, iterations):
+    func()  # コンパイル・ウォームアップ
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    app = Flask(__name__)
+    baseline_json = DefaultJSONProvider(app)
+    init_json_provider(app)
+    fast_json = app.json
+
+    results = {"rows": args.rows, "json_backend": json_backend_name(app), "payloads": {}}
+    with app.app_context():
+        for name, (schema_class, rows) in build_rows(args.rows).items():
+            schema = schema_class(many=True)
+            serializer = get_serializer(schema_class)
+
+            def before():
+                return baseline_json.dumps(schema.dump(rows), separators=(",", ":"))
+
+            def after():
+                return fast_json.dumps(serializer.dump(rows, many=True))
+
+            assert json.loads(before()) == json.loads(after()), name
+            before_ms = measure(before, args.iterations)
+            after_ms = measure(after, args.iterations)
+            results["payloads"][name] = {
+                "before_ms": round(before_ms, 1),
+                "after_ms": round(after_ms, 1),
+                "speedup": round(before_ms / after_ms, 1),
+            }
+
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,114 @@
+# benchmarks/sqlite_concurrency.py
+"""
+SQLite の並行読み書きベンチマーク
+
+複数スレッドから読み取り（タスク一覧・ID指定取得）と書き込み（タスク追加）を混在させて実行し、
+スループットとロック待ちによる失敗数を表示する。
+SQLITE_PRAGMAS の設定（既定の WAL プロファイル）と、PRAGMA を適用しない従来設定を比較する。
+
+    python -m benchmarks.sqlite_concurrency --threads 8 --seconds 10 --write-ratio 0.2
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+from sqlalchemy import select, func
+from sqlalchemy.exc import OperationalError
+
+from config import Config
+
+
+def build_app(db_path, pragmas):
+    from app import create_app
+
+    os.environ.setdefault("URL_PREFIX", "")
+
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{db_path}"
+        SQLITE_PRAGMAS = pragmas
+
+    return create_app(BenchmarkConfig)
+
+
+def run_profile(label, pragmas, threads, seconds, write_ratio, seed_tasks):
+    from app.extensions import db
+    from app.models import Task
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = build_app(os.path.join(tmp_dir, "bench.db"), pragmas)
+        with app.app_context():
+            db.create_all()
+            db.session.add_all(Task(title=f"seed {i}") for i in range(seed_tasks))
+            db.session.commit()
+
+        counters = {"read": 0, "write": 0, "error": 0}
+        lock = threading.Lock()
+        deadline = time.perf_counter() + seconds
+
+        def worker(worker_id):
+            rng = random.Random(worker_id)
+            reads = writes = errors = 0
+            with app.app_context():
+                while time.perf_counter() < deadline:
+                    try:
+                        if rng.random() < write_ratio:
+                            db.session.add(Task(title=f"bench {worker_id}-{writes}"))
+                            db.session.commit()
+                            writes += 1
+                        else:
+                            db.session.execute(
+                                select(Task.id, Task.title).where(Task.is_deleted == False).limit(50)
+                            ).all()
+                            db.session.get(Task, rng.randint(1, seed_tasks))
+                            db.session.rollback()
+                            reads += 1
+                    except OperationalError:
+                        db.session.rollback()
+                        errors += 1
+                db.session.remove()
+            with lock:
+                counters["read"] += reads
+                counters["write"] += writes
+                counters["error"] += errors
+
+        workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+        started = time.perf_counter()
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+        with app.app_context():
+            total_tasks = db.session.scalar(select(func.count(Task.id)))
+            db.engine.dispose()
+
+    ops = counters["read"] + counters["write"]
+    print(
+        f"{label:<10} threads={threads} ops/s={ops / elapsed:,.0f} "
+        f"reads={counters['read']} writes={counters['write']} errors={counters['error']} "
+        f"tasks={total_tasks}"
+    )
+    return {"label": label, "ops_per_sec": ops / elapsed, **counters}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--seed-tasks", type=int, default=1000)
+    args = parser.parse_args()
+
+    # 従来設定でもロック待ちで即失敗しないよう busy_timeout だけは揃える
+    baseline = {"busy_timeout": Config.SQLITE_PRAGMAS["busy_timeout"]}
+    for label, pragmas in (("baseline", baseline), ("profile", Config.SQLITE_PRAGMAS)):
+        run_profile(label, pragmas, args.threads, args.seconds, args.write_ratio, args.seed_tasks)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 # celery_app.py
 from celery import Celery
+from contextlib import nullcontext
 import os
 from dotenv import load_dotenv
 
@@ -22,4 +23,20 @@ celery.conf.update(
     broker_connection_retry_on_startup=True
 )
 
-import app.ai.ai_tasks
\ No newline at end of file
+_flask_app = None
+
+
+def app_context():
+    """ワーカープロセスでは Flask アプリを1度だけ生成し、そのアプリコンテキストを返す"""
+    global _flask_app
+    from flask import has_app_context
+    if has_app_context():
+        return nullcontext()
+    if _flask_app is None:
+        from app import create_app
+        _flask_app = create_app()
+    return _flask_app.app_context()
+
+import app.ai.ai_tasks
+import app.export.export_tasks
+import app.task_order.rank_tasks
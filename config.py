@@ -1,5 +1,6 @@
 # config.py
 import os
+import tempfile
 
 class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
@@ -11,6 +12,53 @@ class Config:
     SESSION_COOKIE_SAMESITE=os.getenv("SESSION_COOKIE_SAMESITE", "None")
     SESSION_COOKIE_SECURE= os.getenv("SESSION_COOKIE_SECURE") == 'True'
 
+    # SQLite 利用時に接続ごとに適用する PRAGMA（空文字にした項目は適用しない）
+    SQLITE_PRAGMAS = {
+        "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+        "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+        "mmap_size": os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)),
+        "cache_size": os.getenv("SQLITE_CACHE_SIZE", "-65536"),  # 負数は KiB 単位（64MiB）
+        "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+        "busy_timeout": os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"),
+    }
+
+    # SQL 発行数・DB 時間を Server-Timing ヘッダーとログに出力するリクエストの割合（0〜1、0で無効）
+    SQL_TIMING_SAMPLE_RATE = float(os.getenv("SQL_TIMING_SAMPLE_RATE", "0"))
+
+    # タスク権限のプロセス内キャッシュ（0で無効。複数ワーカー間では TTL 秒まで古い権限が残り得る）
+    PERMISSION_CACHE_SIZE = int(os.getenv("PERMISSION_CACHE_SIZE", "0"))
+    PERMISSION_CACHE_TTL = int(os.getenv("PERMISSION_CACHE_TTL", "30"))
+
+    # 組織ツリーインデックスのキャッシュ有効期間（秒）。他プロセスでの変更はこの期間で反映される
+    ORG_TREE_CACHE_TTL = int(os.getenv("ORG_TREE_CACHE_TTL", "30"))
+
+    # 非同期エクスポートの成果物の保存先
+    EXPORT_STORAGE_DIR = os.getenv(
+        "EXPORT_STORAGE_DIR",
+        os.path.join(tempfile.gettempdir(), "task_progress_exports")
+    )
+    # 非同期エクスポートのジョブ・成果物の保持期間（秒）。`flask cleanup-exports` で期限切れを削除する
+    EXPORT_RETENTION_SECONDS = int(os.getenv("EXPORT_RETENTION_SECONDS", str(24 * 60 * 60)))
+
+    # タスク表示順のランクがこの文字数を超えたら、バックグラウンドでそのユーザーのランクを再採番する
+    TASK_RANK_REBALANCE_LENGTH = int(os.getenv("TASK_RANK_REBALANCE_LENGTH", "24"))
+
+    # ステータス表のプロセス内キャッシュの再読み込み間隔（秒）と、GET /tasks/statuses の Cache-Control max-age（秒）
+    STATUS_CACHE_TTL = int(os.getenv("STATUS_CACHE_TTL", "3600"))
+    STATUS_CACHE_MAX_AGE = int(os.getenv("STATUS_CACHE_MAX_AGE", "86400"))
+
+    # レスポンス圧縮（br/zstd は brotli/zstandard がインストールされている場合のみ）。詳細は app/compression.py
+    COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "True") == "True"
+    COMPRESSION_ALGORITHMS = os.getenv("COMPRESSION_ALGORITHMS", "br,zstd,gzip")
+    COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+    COMPRESSION_ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+    COMPRESSION_STREAM_FLUSH_BYTES = int(os.getenv("COMPRESSION_STREAM_FLUSH_BYTES", str(64 * 1024)))
+
+    # JSON のエンコーダ（auto: orjson があれば使う / orjson / stdlib / flask）。詳細は app/json_provider.py
+    JSON_BACKEND = os.getenv("JSON_BACKEND", "auto")
+
     
 
         # OpenAPI/Swagger 設定
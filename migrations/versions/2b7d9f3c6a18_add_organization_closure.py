@@ -0,0 +1,67 @@
+"""add organization closure table
+
+Revision ID: 2b7d9f3c6a18
+Revises: 5a2c8e4f1b63
+Create Date: 2026-10-17 21:00:00.000000
+
+organization.parent_id から組織閉包テーブルを作成・バックフィルする（`flask rebuild-org-closure` と同じ内容）。
+db.create_all() 等で既にテーブルがある環境では、作成は行わず中身のみ再構築する。
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2b7d9f3c6a18'
+down_revision = '5a2c8e4f1b63'
+branch_labels = None
+depends_on = None
+
+
+organization = sa.table(
+    'organization',
+    sa.column('id', sa.Integer),
+    sa.column('parent_id', sa.Integer),
+)
+
+organization_closure = sa.table(
+    'organization_closure',
+    sa.column('ancestor_id', sa.Integer),
+    sa.column('descendant_id', sa.Integer),
+    sa.column('depth', sa.Integer),
+)
+
+
+def upgrade():
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table('organization_closure'):
+        op.create_table(
+            'organization_closure',
+            sa.Column('ancestor_id', sa.Integer(), nullable=False),
+            sa.Column('descendant_id', sa.Integer(), nullable=False),
+            sa.Column('depth', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['ancestor_id'], ['organization.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['descendant_id'], ['organization.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id'),
+        )
+        op.create_index('ix_organization_closure_descendant_id', 'organization_closure', ['descendant_id'],
+                        unique=False)
+
+    parent_map = dict(bind.execute(sa.select(organization.c.id, organization.c.parent_id)).all())
+    rows = []
+    for org_id in parent_map:
+        current, depth, visited = org_id, 0, set()
+        while current is not None and current not in visited:
+            rows.append({'ancestor_id': current, 'descendant_id': org_id, 'depth': depth})
+            visited.add(current)
+            current = parent_map.get(current)
+            depth += 1
+
+    bind.execute(organization_closure.delete())
+    if rows:
+        bind.execute(organization_closure.insert(), rows)
+
+
+def downgrade():
+    op.drop_index('ix_organization_closure_descendant_id', table_name='organization_closure')
+    op.drop_table('organization_closure')
@@ -0,0 +1,65 @@
+"""add latest progress pointer to objective
+
+Revision ID: 3f8b6d2e9a17
+Revises: 7c3e1a9d4b52
+Create Date: 2026-10-17 15:00:00.000000
+
+既存データは削除されていない進捗のうち報告日が最新のもの（同日は登録の新しい順）で埋める
+（`flask backfill-latest-progress` と同じ内容）。
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f8b6d2e9a17'
+down_revision = '7c3e1a9d4b52'
+branch_labels = None
+depends_on = None
+
+
+objective = sa.table(
+    'objective',
+    sa.column('id', sa.Integer),
+    sa.column('latest_progress_id', sa.Integer),
+    sa.column('latest_report_date', sa.Date),
+)
+
+progress_update = sa.table(
+    'progress_update',
+    sa.column('id', sa.Integer),
+    sa.column('objective_id', sa.Integer),
+    sa.column('report_date', sa.Date),
+    sa.column('created_at', sa.DateTime),
+    sa.column('is_deleted', sa.Boolean),
+)
+
+
+def _latest(column):
+    return (
+        sa.select(column)
+        .where(progress_update.c.objective_id == objective.c.id, progress_update.c.is_deleted == sa.false())
+        .order_by(progress_update.c.report_date.desc(), progress_update.c.created_at.desc(),
+                  progress_update.c.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+def upgrade():
+    with op.batch_alter_table('objective') as batch_op:
+        batch_op.add_column(sa.Column('latest_progress_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('latest_report_date', sa.Date(), nullable=True))
+
+    op.get_bind().execute(
+        objective.update().values(
+            latest_progress_id=_latest(progress_update.c.id),
+            latest_report_date=_latest(progress_update.c.report_date),
+        )
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('objective') as batch_op:
+        batch_op.drop_column('latest_report_date')
+        batch_op.drop_column('latest_progress_id')
@@ -0,0 +1,34 @@
+"""add version counters for conditional GET
+
+Revision ID: 5a2c8e4f1b63
+Revises: 9d4e2b7c1f36
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5a2c8e4f1b63'
+down_revision = '9d4e2b7c1f36'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('task') as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), nullable=False, server_default='0'))
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.add_column(sa.Column('view_version', sa.Integer(), nullable=False, server_default='0'))
+    with op.batch_alter_table('company') as batch_op:
+        batch_op.add_column(sa.Column('org_tree_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('company') as batch_op:
+        batch_op.drop_column('org_tree_version')
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.drop_column('view_version')
+    with op.batch_alter_table('task') as batch_op:
+        batch_op.drop_column('version')
@@ -0,0 +1,46 @@
+"""add indexes for hot service-layer filters
+
+Revision ID: 7c3e1a9d4b52
+Revises: 1e5c7a3b9f20
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c3e1a9d4b52'
+down_revision = '1e5c7a3b9f20'
+branch_labels = None
+depends_on = None
+
+
+# 論理削除されていない行のみを対象とする部分インデックスの条件（MySQL では無視される）
+ACTIVE_ROWS = {
+    'sqlite_where': sa.text('is_deleted = 0'),
+    'postgresql_where': sa.text('is_deleted = false'),
+}
+
+INDEXES = [
+    ('ix_task_access_user_task_user', 'task_access_user', ['task_id', 'user_id'], {}),
+    ('ix_task_access_user_user_task', 'task_access_user', ['user_id', 'task_id'], {}),
+    ('ix_task_access_organization_task_org', 'task_access_organization', ['task_id', 'organization_id'], {}),
+    ('ix_task_access_organization_org_task', 'task_access_organization', ['organization_id', 'task_id'], {}),
+    ('ix_objective_task_active', 'objective', ['task_id', 'is_deleted', 'display_order'], ACTIVE_ROWS),
+    ('ix_progress_update_objective_active', 'progress_update', ['objective_id', 'is_deleted', 'report_date'], ACTIVE_ROWS),
+    ('ix_user_task_order_user_order', 'user_task_order', ['user_id', 'display_order'], {}),
+    ('ix_organization_parent_id', 'organization', ['parent_id'], {}),
+    ('ix_user_email', 'user', ['email'], {}),
+    ('ix_user_organization_id', 'user', ['organization_id'], {}),
+]
+
+
+def upgrade():
+    for name, table, columns, kwargs in INDEXES:
+        op.create_index(name, table, columns, unique=False, **kwargs)
+
+
+def downgrade():
+    for name, table, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,74 @@
+"""switch user_task_order.display_order to lexicographic ranks
+
+Revision ID: 9d4e2b7c1f36
+Revises: 3f8b6d2e9a17
+Create Date: 2026-10-17 18:00:00.000000
+
+既存の整数の表示順は、ユーザーごとの並びを保ったまま等間隔のランク（app/task_rank.py）に変換する。
+"""
+from itertools import groupby
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.task_rank import evenly_spaced_ranks
+
+
+# revision identifiers, used by Alembic.
+revision = '9d4e2b7c1f36'
+down_revision = '3f8b6d2e9a17'
+branch_labels = None
+depends_on = None
+
+
+user_task_order = sa.table(
+    'user_task_order',
+    sa.column('id', sa.Integer),
+    sa.column('user_id', sa.Integer),
+    sa.column('display_order', sa.String),
+)
+
+
+def _ordered_rows(connection, *order_by):
+    return connection.execute(
+        sa.select(user_task_order.c.id, user_task_order.c.user_id).order_by(user_task_order.c.user_id, *order_by)
+    ).all()
+
+
+def upgrade():
+    connection = op.get_bind()
+    # 型変換前に整数としての並びを確定させておく
+    rows = _ordered_rows(connection, sa.cast(user_task_order.c.display_order, sa.Integer), user_task_order.c.id)
+
+    with op.batch_alter_table('user_task_order') as batch_op:
+        batch_op.alter_column('display_order', existing_type=sa.Integer(), type_=sa.String(length=255),
+                              existing_nullable=False)
+
+    _write_orders(connection, rows, evenly_spaced_ranks)
+
+
+def downgrade():
+    connection = op.get_bind()
+    rows = _ordered_rows(connection, user_task_order.c.display_order, user_task_order.c.id)
+    _write_orders(connection, rows, lambda count: [str(i) for i in range(count)])
+
+    with op.batch_alter_table('user_task_order') as batch_op:
+        batch_op.alter_column('display_order', existing_type=sa.String(length=255), type_=sa.Integer(),
+                              existing_nullable=False, postgresql_using='display_order::integer')
+
+
+def _write_orders(connection, rows, make_orders):
+    updates = []
+    for _, user_rows in groupby(rows, key=lambda row: row.user_id):
+        user_rows = list(user_rows)
+        updates.extend(
+            {'order_id': row.id, 'order': order}
+            for row, order in zip(user_rows, make_orders(len(user_rows)))
+        )
+    if updates:
+        connection.execute(
+            user_task_order.update()
+            .where(user_task_order.c.id == sa.bindparam('order_id'))
+            .values(display_order=sa.bindparam('order')),
+            updates,
+        )
@@ -7,6 +7,7 @@ from app.models import User
 from config import Config as BaseConfig
 from werkzeug.security import generate_password_hash
 from dotenv import load_dotenv
+from tests.utils import RequestQueryRecorder, assert_query_budget
 
 DB_FILE = "test.db"
 env_file = ".env.test"
@@ -43,6 +44,46 @@ def client(app):
     return app.test_client()
 
 
+@pytest.fixture(scope="function")
+def query_budget(app):
+    """
+    テストクライアントのリクエストごとのSQL発行数の予算を宣言する
+    使い方: with query_budget(max_statements=10): client.get(...)
+    （同形SQL文の繰り返しは既定で1回まで＝N+1 を検出）
+    """
+    def _budget(max_statements=None, max_repeats=1):
+        return assert_query_budget(app, _db.engine, max_statements, max_repeats)
+    return _budget
+
+
+@pytest.fixture(scope="function")
+def query_recorder(app):
+    """
+    ブロック内で発行されたSQL文を記録する
+    使い方: with query_recorder() as recorder: ...; recorder.statements
+    """
+    return lambda: RequestQueryRecorder(app, _db.engine)
+
+
+def _reset_celery_backend(celery):
+    celery._backend_cache = None
+    celery._local.__dict__.pop("backend", None)
+
+
+@pytest.fixture(scope="function")
+def eager_celery(monkeypatch):
+    """Celery タスクを同期実行し、結果をメモリに保存する"""
+    from celery_app import celery
+
+    # CELERY_RESULT_BACKEND 環境変数は conf より優先されるため差し替える
+    monkeypatch.setenv("CELERY_RESULT_BACKEND", "cache+memory://")
+    monkeypatch.setitem(celery.conf, "task_always_eager", True)
+    monkeypatch.setitem(celery.conf, "task_store_eager_result", True)
+    _reset_celery_backend(celery)
+    yield celery
+    _reset_celery_backend(celery)
+
+
 @pytest.fixture(scope="session")
 def superuser(app):
     with app.app_context():
@@ -145,12 +186,15 @@ def task_access_users(client, systemadmin_user, root_org):
     return created_users
 
 @pytest.fixture(scope="session")
-def system_related_users(client, root_org):
+def system_related_users(client, root_org, superuser):
     """
     システム関連のユーザー（member, org_admin, system_admin）を作成して返す。
     戻り値: {"member": {...}, "org_admin": {...}, "system_admin": {...}}
     ※ {...} は userデータ + "password" を含む
     """
+    # スーパーユーザーでログイン（直前のテストでログアウトしている場合がある）
+    res = client.post("/progress/sessions", json={"email": superuser["email"], "password": superuser["password"]})
+    assert res.status_code == 200
     roles = ["member", "org_admin", "system_admin"]
     created_users = {}
 
@@ -0,0 +1,70 @@
+# tests/test_access_context.py
+
+import pytest
+
+from app import db
+from app.access_context import load_objective_context, load_progress_context, load_task_context
+from app.constants import TaskAccessLevelEnum
+from app.models import ProgressUpdate, User
+from app.service_errors import ServiceNotFoundError
+
+
+@pytest.fixture
+def shared_objective(system_admin_client, task_access_users, root_org):
+    """閲覧ユーザーに view、所属組織（root_org）に edit を付与したタスクとオブジェクティブ"""
+    client = system_admin_client
+    task_id = client.post("/progress/tasks", json={"title": "Access Context"}).get_json()["task"]["id"]
+    res = client.put(f"/progress/tasks/{task_id}/access_levels", json={
+        "user_access": [{"user_id": task_access_users["view"]["id"], "access_level": "view"}],
+        "organization_access": [{"organization_id": root_org["id"], "access_level": "edit"}],
+    })
+    assert res.status_code == 200
+    res = client.post("/progress/objectives", json={"task_id": task_id, "title": "obj"})
+    objective_id = res.get_json()["objective"]["id"]
+    res = client.post(f"/progress/updates/{objective_id}", json={"detail": "started", "report_date": "2025-01-01"})
+    assert res.status_code == 201
+    return {"task_id": task_id, "objective_id": objective_id}
+
+
+def test_objective_context_is_one_query(app, shared_objective, task_access_users, query_recorder):
+    user = db.session.get(User, task_access_users["view"]["id"])
+    with query_recorder() as recorder:
+        context = load_objective_context(shared_objective["objective_id"], user)
+    assert len(recorder.statements) == 1
+    assert context.objective.id == shared_objective["objective_id"]
+    assert context.task.id == shared_objective["task_id"]
+    # 本人への view と所属組織への edit のうち高い方
+    assert context.access_level == TaskAccessLevelEnum.EDIT
+    assert context.has_level("edit") and not context.has_level(TaskAccessLevelEnum.FULL)
+
+
+def test_task_and_progress_contexts(app, shared_objective, systemadmin_user, query_recorder):
+    owner = db.session.get(User, systemadmin_user["user"]["id"])
+    assert load_task_context(shared_objective["task_id"], owner).access_level == TaskAccessLevelEnum.OWNER
+
+    progress_id = db.session.query(ProgressUpdate.id).filter_by(
+        objective_id=shared_objective["objective_id"]).scalar()
+    with query_recorder() as recorder:
+        context = load_progress_context(progress_id, owner)
+    assert len(recorder.statements) == 1
+    assert context.progress.id == progress_id
+    assert context.objective.id == shared_objective["objective_id"]
+
+
+def test_missing_resources_raise_not_found(app, systemadmin_user):
+    user = db.session.get(User, systemadmin_user["user"]["id"])
+    with pytest.raises(ServiceNotFoundError):
+        load_task_context(999999, user)
+    with pytest.raises(ServiceNotFoundError):
+        load_objective_context(999999, user)
+    with pytest.raises(ServiceNotFoundError):
+        load_progress_context(999999, user)
+
+
+def test_objective_route_checks_access_with_one_query(system_admin_client, shared_objective, query_recorder):
+    with query_recorder() as recorder:
+        res = system_admin_client.get(f"/progress/objectives/{shared_objective['objective_id']}")
+    assert res.status_code == 200
+    auth_statements = [s for s in recorder.statements if "task_access_user" in s]
+    assert len(auth_statements) == 1
+    assert "FROM objective" in auth_statements[0]
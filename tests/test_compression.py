@@ -0,0 +1,115 @@
+# tests/test_compression.py
+
+import gzip
+import json
+import zlib
+
+from werkzeug.datastructures import Accept
+from werkzeug.http import parse_accept_header
+
+from app.compression import GzipEncoder, _compress_chunks, negotiate_encoding
+
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+def _create_tasks(client, count):
+    res = client.post("/progress/tasks/bulk", json={"tasks": [
+        {"title": f"Compression Task {i}", "description": "圧縮テスト " * 10} for i in range(count)
+    ]})
+    assert res.status_code == 201
+
+
+def test_large_json_is_gzipped(system_admin_client):
+    client = system_admin_client
+    _create_tasks(client, 20)
+
+    plain = client.get("/progress/tasks")
+    assert "Content-Encoding" not in plain.headers
+    assert "Accept-Encoding" in plain.headers["Vary"]
+
+    res = client.get("/progress/tasks", headers=GZIP)
+    assert res.status_code == 200
+    assert res.headers["Content-Encoding"] == "gzip"
+    assert int(res.headers["Content-Length"]) == len(res.data) < len(plain.data)
+    assert json.loads(gzip.decompress(res.data)) == plain.get_json()
+
+
+def test_small_or_refused_responses_are_not_compressed(system_admin_client):
+    client = system_admin_client
+    res = client.get("/progress/tasks/statuses", headers=GZIP)
+    assert res.status_code == 200
+    assert "Content-Encoding" not in res.headers
+
+    _create_tasks(client, 20)
+    res = client.get("/progress/tasks", headers={"Accept-Encoding": "gzip;q=0, identity"})
+    assert "Content-Encoding" not in res.headers
+
+
+def test_compressed_etag_is_weak_and_revalidates(system_admin_client):
+    client = system_admin_client
+    _create_tasks(client, 20)
+    res = client.get("/progress/tasks", headers=GZIP)
+    etag = res.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    res = client.get("/progress/tasks", headers={**GZIP, "If-None-Match": etag})
+    assert res.status_code == 304
+    assert res.headers["ETag"] == etag
+
+
+def test_uncompressed_small_body_keeps_the_same_etag_on_304(system_admin_client):
+    """圧縮しない小さい本文でも、200 と 304 で ETag の強弱が入れ替わらないこと"""
+    client = system_admin_client
+    task_id = client.post("/progress/tasks", json={"title": "Small ETag"}).get_json()["task"]["id"]
+    url = f"/progress/objectives/tasks/{task_id}"
+
+    res = client.get(url, headers=GZIP)
+    assert res.status_code == 200
+    assert "Content-Encoding" not in res.headers
+    etag = res.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    for headers in (GZIP, {"Accept-Encoding": "identity"}):
+        res = client.get(url, headers={**headers, "If-None-Match": etag})
+        assert res.status_code == 304
+        assert res.headers["ETag"] == etag
+        assert "Accept-Encoding" in res.headers["Vary"]
+
+
+def test_streaming_export_is_compressed_incrementally(system_admin_client):
+    client = system_admin_client
+    _create_tasks(client, 5)
+    plain = client.get("/progress/exports/stream?format=ndjson")
+    res = client.get("/progress/exports/stream?format=ndjson", headers=GZIP)
+    assert res.status_code == 200
+    assert res.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in res.headers
+    assert gzip.decompress(res.data) == plain.data
+
+
+def test_compress_chunks_flushes_before_stream_ends():
+    produced = []
+
+    def chunks():
+        for i in range(3):
+            produced.append(i)
+            yield f"line {i}\n" * 10
+
+    stream = _compress_chunks(chunks(), GzipEncoder(6), flush_bytes=1)
+    decompressor = zlib.decompressobj(31)
+    first = decompressor.decompress(next(stream))
+    # 1チャンク目を受け取った時点では、生成側は2チャンク目以降をまだ作っていない
+    assert produced == [0]
+    assert first == b"line 0\n" * 10
+    rest = b"".join(decompressor.decompress(data) for data in stream)
+    assert first + rest == b"".join(f"line {i}\n".encode() * 10 for i in range(3))
+
+
+def test_negotiate_encoding_uses_quality_and_preference():
+    def accept(value):
+        return parse_accept_header(value, Accept)
+
+    assert negotiate_encoding(accept("gzip, deflate"), ["br", "zstd", "gzip"]) == "gzip"
+    assert negotiate_encoding(accept("*"), ["gzip"]) == "gzip"
+    assert negotiate_encoding(accept("identity"), ["gzip"]) is None
+    assert negotiate_encoding(accept("gzip;q=0"), ["gzip"]) is None
@@ -0,0 +1,128 @@
+# tests/test_conditional_get.py
+
+
+def _get(client, url, etag=None):
+    headers = {"If-None-Match": etag} if etag else {}
+    return client.get(url, headers=headers)
+
+
+def test_task_list_etag_and_not_modified(system_admin_client, query_recorder):
+    client = system_admin_client
+    res = _get(client, "/progress/tasks")
+    assert res.status_code == 200
+    etag = res.headers["ETag"]
+    assert res.headers["Cache-Control"] == "private, no-cache"
+
+    with query_recorder() as recorder:
+        res = _get(client, "/progress/tasks", etag)
+    assert res.status_code == 304
+    assert res.headers["ETag"] == etag
+    assert not any("FROM task" in s for s in recorder.statements)
+
+    # 条件が異なる一覧は別の ETag
+    assert _get(client, "/progress/tasks?limit=1").headers["ETag"] != etag
+
+    res = client.post("/progress/tasks", json={"title": "ETag Task"})
+    assert res.status_code == 201
+    task_id = res.get_json()["task"]["id"]
+    res = _get(client, "/progress/tasks", etag)
+    assert res.status_code == 200
+    assert task_id in [t["id"] for t in res.get_json()["tasks"]]
+
+    etag = res.headers["ETag"]
+    res = client.put(f"/progress/tasks/{task_id}", json={"title": "ETag Task Renamed"})
+    assert res.status_code == 200
+    assert _get(client, "/progress/tasks", etag).status_code == 200
+
+
+def test_task_list_etag_changes_for_shared_user(system_admin_client, login_as_user, systemadmin_user,
+                                                task_access_users):
+    user = task_access_users["view"]
+    res = system_admin_client.post("/progress/tasks", json={"title": "Shared ETag Task"})
+    task_id = res.get_json()["task"]["id"]
+    res = system_admin_client.put(f"/progress/tasks/{task_id}/access_levels", json={
+        "user_access": [{"user_id": user["id"], "access_level": "view"}], "organization_access": [],
+    })
+    assert res.status_code == 200
+
+    client = login_as_user(user["email"], user["password"])
+    etag = _get(client, "/progress/tasks").headers["ETag"]
+    assert _get(client, "/progress/tasks", etag).status_code == 304
+
+    # 他ユーザーによるタスクの更新で、閲覧できるユーザーの一覧も変わる
+    client = login_as_user(systemadmin_user["user"]["email"], "adminpass")
+    res = client.put(f"/progress/tasks/{task_id}", json={"title": "Shared ETag Task Renamed"})
+    assert res.status_code == 200
+
+    client = login_as_user(user["email"], user["password"])
+    res = _get(client, "/progress/tasks", etag)
+    assert res.status_code == 200
+    assert "Shared ETag Task Renamed" in [t["title"] for t in res.get_json()["tasks"]]
+
+
+def test_objective_list_etag_follows_progress(system_admin_client, query_recorder):
+    client = system_admin_client
+    task_id = client.post("/progress/tasks", json={"title": "ETag Objectives"}).get_json()["task"]["id"]
+    res = client.post("/progress/objectives", json={"task_id": task_id, "title": "obj"})
+    assert res.status_code == 201
+    objective_id = res.get_json()["objective"]["id"]
+
+    url = f"/progress/objectives/tasks/{task_id}"
+    etag = _get(client, url).headers["ETag"]
+    with query_recorder() as recorder:
+        assert _get(client, url, etag).status_code == 304
+    assert not any("FROM objective" in s for s in recorder.statements)
+
+    res = client.post(f"/progress/updates/{objective_id}", json={"detail": "done", "report_date": "2025-01-01"})
+    assert res.status_code == 201
+    res = _get(client, url, etag)
+    assert res.status_code == 200
+    assert res.get_json()["objectives"][0]["latest_progress"] == "done"
+
+
+def test_objective_list_etag_still_checks_access(client, login_as_user, task_access_users, system_admin_client):
+    task_id = system_admin_client.post("/progress/tasks", json={"title": "Private"}).get_json()["task"]["id"]
+    etag = _get(system_admin_client, f"/progress/objectives/tasks/{task_id}").headers["ETag"]
+
+    other = task_access_users["view"]
+    client = login_as_user(other["email"], other["password"])
+    assert _get(client, f"/progress/objectives/tasks/{task_id}", etag).status_code == 403
+
+
+def test_organization_tree_etag(system_admin_client, root_org):
+    client = system_admin_client
+    etag = _get(client, "/progress/organizations/tree").headers["ETag"]
+    assert _get(client, "/progress/organizations/tree", etag).status_code == 304
+
+    res = client.post("/progress/organizations", json={
+        "name": "ETag Org", "org_code": "etag-org", "parent_id": root_org["id"],
+    })
+    assert res.status_code == 201
+    res = _get(client, "/progress/organizations/tree", etag)
+    assert res.status_code == 200
+    assert res.headers["ETag"] != etag
+
+
+def test_task_list_etag_changes_when_shared_task_is_deleted(system_admin_client, login_as_user, systemadmin_user,
+                                                           task_access_users):
+    user = task_access_users["edit"]
+    res = system_admin_client.post("/progress/tasks", json={"title": "Deleted ETag Task"})
+    task_id = res.get_json()["task"]["id"]
+    res = system_admin_client.put(f"/progress/tasks/{task_id}/access_levels", json={
+        "user_access": [{"user_id": user["id"], "access_level": "view"}], "organization_access": [],
+    })
+    assert res.status_code == 200
+
+    client = login_as_user(user["email"], user["password"])
+    res = _get(client, "/progress/tasks")
+    assert task_id in [t["id"] for t in res.get_json()["tasks"]]
+    etag = res.headers["ETag"]
+
+    # 作成者による削除（付与は一括削除される）で、閲覧ユーザーの一覧も変わる
+    client = login_as_user(systemadmin_user["user"]["email"], "adminpass")
+    assert client.delete(f"/progress/tasks/{task_id}").status_code == 200
+
+    client = login_as_user(user["email"], user["password"])
+    res = _get(client, "/progress/tasks", etag)
+    assert res.status_code == 200
+    assert task_id not in [t["id"] for t in res.get_json()["tasks"]]
@@ -127,3 +127,105 @@ def test_get_children(login_as_user, root_org, system_related_users):
     data = res.get_json()
     assert isinstance(data, list)
     assert any(org['name'] == '子組織' for org in data)
+
+
+def test_organization_closure_tracks_create_and_move(login_as_user, root_org, system_related_users):
+    from app.models import OrganizationClosure
+    from app.utils import get_all_child_organizations
+
+    system_admin = system_related_users['system_admin']
+    client = login_as_user(system_admin['email'], system_admin['password'])
+
+    res = client.post('/progress/organizations', json={
+        'name': '閉包テスト部', 'org_code': 'closure_dept', 'parent_id': root_org['id']
+    })
+    assert res.status_code == 201
+    dept = res.get_json()
+    res = client.post('/progress/organizations', json={
+        'name': '閉包テスト課', 'org_code': 'closure_section', 'parent_id': dept['id']
+    })
+    assert res.status_code == 201
+    section = res.get_json()
+
+    root_descendants = get_all_child_organizations(root_org['id'])
+    assert dept['id'] in root_descendants
+    assert section['id'] in root_descendants
+    assert sorted(get_all_child_organizations(dept['id'])) == sorted([dept['id'], section['id']])
+
+    depth = db.session.get(OrganizationClosure, (root_org['id'], section['id'])).depth
+    assert depth == 2
+
+    # 課をルート直下へ移動
+    res = client.put(f"/progress/organizations/{section['id']}", json={'parent_id': root_org['id']})
+    assert res.status_code == 200
+    assert get_all_child_organizations(dept['id']) == [dept['id']]
+    assert db.session.get(OrganizationClosure, (root_org['id'], section['id'])).depth == 1
+
+    # 自身の下位組織を親に指定することはできない
+    res = client.put(f"/progress/organizations/{root_org['id']}", json={'parent_id': dept['id']})
+    assert res.status_code == 400
+
+    # 削除で閉包行も消える
+    res = client.delete(f"/progress/organizations/{section['id']}")
+    assert res.status_code == 200
+    assert OrganizationClosure.query.filter_by(descendant_id=section['id']).count() == 0
+
+
+def test_rebuild_org_closure_command(app, root_org):
+    from app.models import OrganizationClosure
+
+    runner = app.test_cli_runner()
+    result = runner.invoke(args=['rebuild-org-closure'])
+    assert result.exit_code == 0
+
+    org_count = Organization.query.count()
+    self_paths = OrganizationClosure.query.filter_by(depth=0).count()
+    assert self_paths == org_count
+
+
+def test_organization_tree_index_intervals():
+    from app.org_tree import OrganizationTreeIndex
+
+    rows = [
+        {'id': 1, 'name': 'root', 'org_code': 'r', 'company_id': 1, 'company_name': 'c', 'parent_id': None, 'level': 1},
+        {'id': 2, 'name': 'a', 'org_code': 'a', 'company_id': 1, 'company_name': 'c', 'parent_id': 1, 'level': 2},
+        {'id': 3, 'name': 'a1', 'org_code': 'a1', 'company_id': 1, 'company_name': 'c', 'parent_id': 2, 'level': 3},
+        {'id': 4, 'name': 'b', 'org_code': 'b', 'company_id': 1, 'company_name': 'c', 'parent_id': 1, 'level': 2},
+    ]
+    index = OrganizationTreeIndex(rows, version=0)
+
+    assert index.subtree_ids(2) == [2, 3]
+    assert index.subtree_ids(1) == [1, 2, 3, 4]
+    assert index.is_descendant(3, 1) and index.is_descendant(3, 2)
+    assert not index.is_descendant(4, 2)
+    assert index.depth == {1: 0, 2: 1, 3: 2, 4: 1}
+
+    # 親がアクセス不可の組織はルートとして描画される
+    tree = index.render({2, 3, 4})
+    assert [node['id'] for node in tree] == [2, 4]
+    assert [child['id'] for child in tree[0]['children']] == [3]
+
+
+def test_organization_tree_is_served_from_cache(login_as_user, root_org, system_related_users, query_recorder):
+    org_admin = system_related_users['org_admin']
+    client = login_as_user(org_admin['email'], org_admin['password'])
+    url = f"/progress/organizations/tree?company_id={root_org['company_id']}"
+    assert client.get(url).status_code == 200
+
+    with query_recorder() as recorder:
+        res = client.get(url)
+    assert res.status_code == 200
+    assert not [s for s in recorder.statements if 'FROM organization' in s]
+    tree = res.get_json()
+    assert tree[0]['id'] == root_org['id']
+    assert tree[0]['company_name']
+
+    # 組織の追加はコミット時にキャッシュを無効化する
+    system_admin = system_related_users['system_admin']
+    client = login_as_user(system_admin['email'], system_admin['password'])
+    res = client.post('/progress/organizations', json={
+        'name': 'ツリーキャッシュ部', 'org_code': 'tree_cache_dept', 'parent_id': root_org['id']
+    })
+    assert res.status_code == 201
+    tree = client.get(url).get_json()
+    assert any(child['name'] == 'ツリーキャッシュ部' for child in tree[0]['children'])
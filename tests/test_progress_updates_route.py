@@ -1,5 +1,8 @@
 import pytest
 
+from app import db
+from app.models import Objective
+
 
 @pytest.fixture(scope="function")
 def valid_status_id(client):
@@ -123,3 +126,122 @@ def test_delete_progress_not_found(system_admin_client):
         "/progress/updates/99999"
     )
     assert res.status_code == 404
+
+
+@pytest.fixture(scope="function")
+def weekly_progress(system_admin_client, objective_for_progress, valid_status_id):
+    """報告日を登録順と逆にして6件の進捗を追加する"""
+    obj_id = objective_for_progress["objective_id"]
+    report_dates = ["2024-02-05", "2024-01-29", "2024-01-22", "2024-01-15", "2024-01-08", "2024-01-01"]
+    for report_date in report_dates:
+        res = system_admin_client.post(
+            f"/progress/updates/{obj_id}",
+            json={"status": valid_status_id, "detail": report_date, "report_date": report_date},
+        )
+        assert res.status_code == 201
+    return {"objective_id": obj_id, "report_dates": sorted(report_dates)}
+
+
+class TestProgressList:
+    def test_ordered_by_report_date(self, system_admin_client, weekly_progress):
+        res = system_admin_client.get(f"/progress/updates/{weekly_progress['objective_id']}")
+        assert res.status_code == 200
+        assert [p["report_date"] for p in res.get_json()] == weekly_progress["report_dates"]
+        assert "X-Next-Cursor" not in res.headers
+        assert all(p["status"] != "-" and p["updated_by"] for p in res.get_json())
+
+    def test_date_range_filter(self, system_admin_client, weekly_progress):
+        res = system_admin_client.get(
+            f"/progress/updates/{weekly_progress['objective_id']}?from=2024-01-08&to=2024-01-22"
+        )
+        assert res.status_code == 200
+        assert [p["report_date"] for p in res.get_json()] == ["2024-01-08", "2024-01-15", "2024-01-22"]
+
+    def test_invalid_date_range(self, system_admin_client, weekly_progress):
+        res = system_admin_client.get(
+            f"/progress/updates/{weekly_progress['objective_id']}?from=2024-02-01&to=2024-01-01"
+        )
+        assert res.status_code == 422
+
+    def test_cursor_pagination(self, system_admin_client, weekly_progress):
+        url = f"/progress/updates/{weekly_progress['objective_id']}?limit=4"
+        first = system_admin_client.get(url)
+        assert first.status_code == 200
+        assert len(first.get_json()) == 4
+        cursor = first.headers["X-Next-Cursor"]
+
+        second = system_admin_client.get(f"{url}&cursor={cursor}")
+        assert second.status_code == 200
+        assert "X-Next-Cursor" not in second.headers
+        pages = first.get_json() + second.get_json()
+        assert [p["report_date"] for p in pages] == weekly_progress["report_dates"]
+
+    def test_invalid_cursor(self, system_admin_client, weekly_progress):
+        res = system_admin_client.get(f"/progress/updates/{weekly_progress['objective_id']}?cursor=broken")
+        assert res.status_code == 400
+
+    def test_query_budget(self, system_admin_client, weekly_progress, query_budget):
+        """進捗件数に関わらずステータス・報告者の取得で N+1 が発生しないこと"""
+        with query_budget(max_statements=10):
+            res = system_admin_client.get(f"/progress/updates/{weekly_progress['objective_id']}")
+        assert res.status_code == 200
+        assert len(res.get_json()) == 6
+
+
+class TestLatestProgressPointer:
+    def _latest(self, client, objective):
+        res = client.get(f"/progress/objectives/tasks/{objective['task']['id']}")
+        assert res.status_code == 200
+        obj = next(o for o in res.get_json()["objectives"] if o["id"] == objective["objective_id"])
+        latest = client.get(f"/progress/updates/{objective['objective_id']}/latest-progress").get_json()
+        return obj, latest
+
+    def _add(self, client, objective_id, status, report_date):
+        res = client.post(
+            f"/progress/updates/{objective_id}",
+            json={"status": status, "detail": report_date, "report_date": report_date},
+        )
+        assert res.status_code == 201
+
+    def test_follows_report_date_not_insert_order(self, system_admin_client, objective_for_progress, valid_status_id):
+        obj_id = objective_for_progress["objective_id"]
+        self._add(system_admin_client, obj_id, valid_status_id, "2024-03-01")
+        self._add(system_admin_client, obj_id, valid_status_id, "2024-01-01")
+
+        obj, latest = self._latest(system_admin_client, objective_for_progress)
+        assert obj["latest_progress"] == "2024-03-01"
+        assert obj["latest_report_date"] == "2024-03-01"
+        assert latest["detail"] == "2024-03-01"
+
+    def test_delete_latest_falls_back(self, system_admin_client, objective_for_progress, valid_status_id):
+        obj_id = objective_for_progress["objective_id"]
+        self._add(system_admin_client, obj_id, valid_status_id, "2024-01-01")
+        self._add(system_admin_client, obj_id, valid_status_id, "2024-03-01")
+        latest_id = system_admin_client.get(f"/progress/updates/{obj_id}").get_json()[-1]["id"]
+
+        assert system_admin_client.delete(f"/progress/updates/{latest_id}").status_code == 200
+        obj, latest = self._latest(system_admin_client, objective_for_progress)
+        assert obj["latest_report_date"] == "2024-01-01"
+        assert latest["detail"] == "2024-01-01"
+
+        only_id = system_admin_client.get(f"/progress/updates/{obj_id}").get_json()[0]["id"]
+        assert system_admin_client.delete(f"/progress/updates/{only_id}").status_code == 200
+        obj, latest = self._latest(system_admin_client, objective_for_progress)
+        assert obj["latest_progress"] is None
+        assert obj["latest_report_date"] is None
+        assert latest["detail"] == "-"
+
+    def test_backfill_command(self, app, system_admin_client, objective_for_progress, valid_status_id):
+        obj_id = objective_for_progress["objective_id"]
+        self._add(system_admin_client, obj_id, valid_status_id, "2024-05-01")
+        with app.app_context():
+            objective = db.session.get(Objective, obj_id)
+            objective.latest_progress_id = None
+            objective.latest_report_date = None
+            db.session.commit()
+
+        result = app.test_cli_runner().invoke(args=["backfill-latest-progress"])
+        assert result.exit_code == 0, result.output
+        obj, _ = self._latest(system_admin_client, objective_for_progress)
+        assert obj["latest_report_date"] == "2024-05-01"
+        assert obj["latest_progress"] == "2024-05-01"
@@ -0,0 +1,57 @@
+# tests/test_query_plans.py
+
+import pytest
+from sqlalchemy import select, text
+
+from app import db
+from app.models import (
+    Objective,
+    Organization,
+    ProgressUpdate,
+    TaskAccessOrganization,
+    TaskAccessUser,
+    User,
+    UserTaskOrder,
+)
+
+# サービス層で頻繁に発行される絞り込み（インデックスで検索されること）
+HOT_QUERIES = {
+    "task_access_user_by_task_and_user":
+        select(TaskAccessUser.access_level).where(TaskAccessUser.task_id == 1, TaskAccessUser.user_id == 1),
+    "task_access_user_by_user":
+        select(TaskAccessUser.task_id, TaskAccessUser.access_level).where(TaskAccessUser.user_id == 1),
+    "task_access_organization_by_task_and_org":
+        select(TaskAccessOrganization.access_level)
+        .where(TaskAccessOrganization.task_id == 1, TaskAccessOrganization.organization_id == 1),
+    "task_access_organization_by_org":
+        select(TaskAccessOrganization.task_id).where(TaskAccessOrganization.organization_id == 1),
+    "active_objectives_by_task":
+        select(Objective).where(Objective.task_id == 1, Objective.is_deleted == False)
+        .order_by(Objective.display_order),
+    "active_objectives_by_tasks":
+        select(Objective).where(Objective.task_id.in_([1, 2, 3]), Objective.is_deleted == False),
+    "active_progress_by_objective":
+        select(ProgressUpdate).where(ProgressUpdate.objective_id == 1, ProgressUpdate.is_deleted == False)
+        .order_by(ProgressUpdate.report_date.desc()),
+    "user_task_order_by_user":
+        select(UserTaskOrder).where(UserTaskOrder.user_id == 1).order_by(UserTaskOrder.display_order),
+    "organization_children":
+        select(Organization).where(Organization.parent_id == 1),
+    "user_by_email":
+        select(User).where(User.email == "someone@example.com"),
+    "users_by_organization":
+        select(User).where(User.organization_id == 1),
+}
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_uses_index(app, name):
+    if db.engine.dialect.name != "sqlite":
+        pytest.skip("EXPLAIN QUERY PLAN は SQLite のみ")
+
+    sql = str(HOT_QUERIES[name].compile(db.engine, compile_kwargs={"literal_binds": True}))
+    plan = [row[-1] for row in db.session.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+
+    full_scans = [detail for detail in plan if detail.startswith("SCAN")]
+    assert not full_scans, f"{name}: {plan}"
+    assert any("USING" in detail and "INDEX" in detail for detail in plan), f"{name}: {plan}"
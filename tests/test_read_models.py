@@ -0,0 +1,88 @@
+# tests/test_read_models.py
+
+from collections import Counter
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app import db
+from app.models import Objective, Organization, Task, User
+
+
+@contextmanager
+def count_entity_loads(*models):
+    """ブロック内で ORM エンティティとして読み込まれた件数をモデルごとに数える"""
+    loads = Counter()
+    listeners = []
+    for model in models:
+        def on_load(target, context, name=model.__name__):
+            loads[name] += 1
+        event.listen(model, "load", on_load)
+        listeners.append((model, on_load))
+    try:
+        yield loads
+    finally:
+        for model, on_load in listeners:
+            event.remove(model, "load", on_load)
+
+
+@pytest.fixture(scope="function")
+def listed_task(system_admin_client):
+    res = system_admin_client.post("/progress/tasks", json={"title": "ReadModel Task"})
+    assert res.status_code == 201
+    task = res.get_json()["task"]
+    for i in range(3):
+        res = system_admin_client.post("/progress/objectives", json={"task_id": task["id"], "title": f"ReadModel obj{i}"})
+        assert res.status_code == 201
+    return task
+
+
+def test_task_list_does_not_load_entities(system_admin_client, listed_task):
+    with count_entity_loads(Task) as loads:
+        res = system_admin_client.get("/progress/tasks")
+    assert res.status_code == 200
+    tasks = res.get_json()["tasks"]
+    assert any(t["id"] == listed_task["id"] for t in tasks)
+    assert all(t["user_access_level"] for t in tasks)
+    assert loads["Task"] == 0
+
+
+def test_objective_list_does_not_load_entities(system_admin_client, listed_task):
+    with count_entity_loads(Objective) as loads:
+        res = system_admin_client.get(f"/progress/objectives/tasks/{listed_task['id']}")
+    assert res.status_code == 200
+    assert [o["title"] for o in res.get_json()["objectives"]] == [f"ReadModel obj{i}" for i in range(3)]
+    assert loads["Objective"] == 0
+
+
+def test_user_and_organization_lists_do_not_load_entities(system_admin_client, systemadmin_user, root_org):
+    with count_entity_loads(User, Organization) as loads:
+        users = system_admin_client.get("/progress/users")
+        orgs = system_admin_client.get("/progress/organizations")
+        children = system_admin_client.get(f"/progress/organizations/{root_org['id']}/children")
+    assert users.status_code == 200
+    assert orgs.status_code == 200
+    assert children.status_code == 200
+
+    # 組織名は他のテストで変更されうるため、一覧から現在の名前を取る
+    root = next(o for o in orgs.get_json() if o["id"] == root_org["id"])
+    admin = next(u for u in users.get_json() if u["id"] == systemadmin_user["user"]["id"])
+    assert admin["organization_name"] == root["name"]
+    assert admin["access_scopes"][0]["role"] == "system_admin"
+    # ログインユーザー自身（認証時に読み込まれる）以外はエンティティ化しない
+    assert loads["User"] <= 1
+    assert loads["Organization"] == 0
+
+
+def test_list_rows_do_not_touch_the_session(app, system_admin_client, listed_task):
+    """一覧取得でセッションに変更が積まれない（読み取り専用モデルを書き換えても永続化されない）"""
+    from app.services import task_core_service
+
+    with app.test_request_context():
+        user = db.session.get(User, listed_task["created_by"])
+        result = task_core_service.get_tasks(user)
+        row = next(t for t in result["tasks"] if t.id == listed_task["id"])
+        row.user_access_level = "changed"
+        assert not db.session.dirty
+        assert not any(isinstance(obj, Task) for obj in db.session.identity_map.values())
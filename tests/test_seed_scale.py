@@ -0,0 +1,71 @@
+# tests/test_seed_scale.py
+
+import pytest
+from sqlalchemy import select
+
+from app import create_app, db
+from app.models import Organization, OrganizationClosure, ProgressUpdate, Task, User
+from tests.conftest import TestConfig
+
+SEED_ARGS = [
+    "seed-scale", "--companies", "2", "--org-depth", "3", "--org-fanout", "2", "--users-per-org", "2",
+    "--tasks-per-user", "2", "--objectives-per-task", "2", "--progress-per-objective", "2",
+    "--acl-density", "0.5", "--seed", "7",
+]
+
+
+@pytest.fixture(scope="function")
+def seed_app_factory(tmp_path):
+    """seed-scale を独立したファイルDBに対して実行するためのアプリを作成する"""
+    apps = []
+
+    def _create(name):
+        class SeedConfig(TestConfig):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / name}"
+
+        app = create_app(SeedConfig)
+        with app.app_context():
+            db.create_all()
+        apps.append(app)
+        return app
+
+    yield _create
+    for app in apps:
+        with app.app_context():
+            db.engine.dispose()
+
+
+def _invoke_seed(app):
+    # with_appcontext は既に push 済みのアプリコンテキスト（テスト全体の app）を再利用するため、
+    # seed 用アプリのコンテキストを push してから実行し、書き込み先を seed 用DBにする
+    with app.app_context():
+        return app.test_cli_runner().invoke(args=SEED_ARGS)
+
+
+def _snapshot(app):
+    with app.app_context():
+        return {
+            "tasks": db.session.execute(select(Task.id, Task.title, Task.due_date, Task.status_id)).all(),
+            "progress": db.session.execute(select(ProgressUpdate.id, ProgressUpdate.status_id)).all(),
+        }
+
+
+def test_seed_scale_command_creates_requested_shape(seed_app_factory):
+    app = seed_app_factory("seed.db")
+    result = _invoke_seed(app)
+    assert result.exit_code == 0, result.output
+
+    with app.app_context():
+        org_count = 2 * (1 + 2 + 4)
+        assert Organization.query.count() == org_count
+        assert OrganizationClosure.query.count() == 2 * (1 + 2 * 2 + 4 * 3)
+        assert User.query.count() == org_count * 2
+        assert Task.query.count() == org_count * 2 * 2
+        assert ProgressUpdate.query.count() == org_count * 2 * 2 * 2 * 2
+
+
+def test_seed_scale_is_deterministic_by_seed(seed_app_factory):
+    first, second = seed_app_factory("first.db"), seed_app_factory("second.db")
+    for app in (first, second):
+        assert _invoke_seed(app).exit_code == 0
+    assert _snapshot(first) == _snapshot(second)
@@ -0,0 +1,125 @@
+# tests/test_serializers.py
+
+from datetime import date, datetime
+
+import pytest
+from flask import Flask
+from marshmallow import Schema, fields, post_dump
+
+from app.constants import OrgRoleEnum
+from app.json_provider import FastJSONProvider, init_json_provider, json_backend_name
+from app.read_models import AccessScopeRow, ObjectiveRow, OrganizationRow, TaskRow, UserRow
+from app.schemas import (
+    ObjectivesListSchema,
+    OrganizationSchema,
+    OrganizationTreeSchema,
+    ProgressSchema,
+    TaskSchema,
+    UserWithScopesSchema,
+)
+from app.serializers import dump, get_serializer
+
+
+def _task(i, **kwargs):
+    values = dict(
+        id=i, status_id=2, title=f"task{i}", description="", due_date=date(2025, 1, i % 28 + 1),
+        assigned_user_id=None, created_by=1, created_at=datetime(2025, 1, 1, 9, 30, i % 60, 123),
+        display_order=None, organization_id=1, user_access_level="full", user_rank="i", status_name="not_started",
+    )
+    values.update(kwargs)
+    return TaskRow(**values)
+
+
+def test_task_rows_match_marshmallow():
+    rows = [_task(1), _task(2, due_date=None, created_at=None, user_rank=None), _task(3, status_name=None)]
+    assert dump(TaskSchema, rows, many=True) == TaskSchema(many=True).dump(rows)
+
+
+def test_task_status_label_from_status_name():
+    data = dump(TaskSchema, _task(1, status_name="completed"))
+    assert data["status"] == "completed"
+    assert data["label"] == "完了"
+
+    data = dump(TaskSchema, _task(1, status_name=None))
+    assert "status" not in data
+    assert data["label"] is None
+
+
+def test_nested_list_schema_matches_marshmallow():
+    objectives = {"objectives": [
+        ObjectiveRow(id=1, task_id=1, title="obj", due_date=date(2025, 2, 1), assigned_user_id=3, display_order=1,
+                     status_id=1, created_by=1, created_at=datetime(2025, 1, 1), latest_report_date=None,
+                     assigned_user_name="user", latest_progress="detail"),
+    ]}
+    assert dump(ObjectivesListSchema, objectives) == ObjectivesListSchema().dump(objectives)
+
+
+def test_nested_many_and_method_fields_match_marshmallow():
+    user = UserRow(id=1, wp_user_id=None, name="user", email="u@example.com", is_superuser=False,
+                   organization_id=2, organization_name="org", company_id=1)
+    user.access_scopes = [AccessScopeRow(id=1, user_id=1, organization_id=2, role=OrgRoleEnum.ORG_ADMIN)]
+    empty = UserRow(id=2, wp_user_id=10, name="empty", email="e@example.com", is_superuser=True,
+                    organization_id=None, organization_name=None, company_id=None)
+    users = [user, empty]
+
+    assert dump(UserWithScopesSchema, users, many=True) == UserWithScopesSchema(many=True).dump(users)
+    assert dump(UserWithScopesSchema, user)["access_scopes"][0]["role"] == "org_admin"
+
+
+def test_mapping_and_recursive_schema_match_marshmallow():
+    tree = [{"id": 1, "name": "root", "org_code": "r", "company_id": 1, "company_name": "c", "parent_id": None,
+             "level": 1, "children": [
+                 {"id": 2, "name": "child", "org_code": "c1", "company_id": 1, "company_name": "c",
+                  "parent_id": 1, "level": 2, "children": []},
+             ]}]
+    assert dump(OrganizationTreeSchema, tree, many=True) == OrganizationTreeSchema(many=True).dump(tree)
+
+    updates = [{"id": 1, "status": "進行中", "detail": "d", "report_date": "2025-01-01", "updated_by": "u"}]
+    assert dump(ProgressSchema, updates, many=True) == ProgressSchema(many=True).dump(updates)
+
+    orgs = [OrganizationRow(id=1, name="root", company_id=1, org_code="r", parent_id=None, level=1)]
+    assert dump(OrganizationSchema, orgs, many=True) == OrganizationSchema(many=True).dump(orgs)
+
+
+def test_schema_with_dump_hooks_uses_marshmallow():
+    class HookedSchema(Schema):
+        id = fields.Int()
+
+        @post_dump
+        def add_flag(self, data, **kwargs):
+            data["hooked"] = True
+            return data
+
+    assert dump(HookedSchema, {"id": 1}) == {"id": 1, "hooked": True}
+
+
+def test_serializer_is_compiled_once_per_schema():
+    assert get_serializer(TaskSchema) is get_serializer(TaskSchema())
+    assert get_serializer(TaskSchema) is not get_serializer(TaskSchema(only=("id",)))
+    assert dump(TaskSchema(only=("id",)), _task(5)) == {"id": 5}
+
+
+@pytest.mark.parametrize("backend", ["stdlib", "flask"])
+def test_json_backend_selection(backend):
+    app = Flask(__name__)
+    app.config["JSON_BACKEND"] = backend
+    init_json_provider(app)
+    assert json_backend_name(app) == backend
+    with app.app_context():
+        payload = {"b": 1, "a": "日本語", "d": date(2025, 1, 2)}
+        assert app.json.loads(app.json.dumps(payload)) == {"b": 1, "a": "日本語", "d": "Thu, 02 Jan 2025 00:00:00 GMT"}
+
+
+def test_json_backend_stdlib_keeps_key_order_and_non_ascii():
+    app = Flask(__name__)
+    app.config["JSON_BACKEND"] = "stdlib"
+    init_json_provider(app)
+    assert isinstance(app.json, FastJSONProvider)
+    assert app.json.dumps({"b": 1, "a": "日本語"}) == '{"b": 1, "a": "日本語"}'
+
+
+def test_json_backend_rejects_unknown_value():
+    app = Flask(__name__)
+    app.config["JSON_BACKEND"] = "simplejson"
+    with pytest.raises(RuntimeError):
+        init_json_provider(app)
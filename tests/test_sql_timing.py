@@ -0,0 +1,38 @@
+# tests/test_sql_timing.py
+
+import json
+import logging
+import re
+
+import pytest
+
+
+@pytest.fixture(scope="function")
+def sql_timing_enabled(app, monkeypatch):
+    monkeypatch.setitem(app.config, "SQL_TIMING_SAMPLE_RATE", 1.0)
+
+
+def test_server_timing_reports_statement_count(system_admin_client, sql_timing_enabled, caplog):
+    assert system_admin_client.post("/progress/tasks", json={"title": "Timed"}).status_code == 201
+
+    with caplog.at_level(logging.INFO):
+        res = system_admin_client.get("/progress/tasks")
+    assert res.status_code == 200
+
+    match = re.fullmatch(r'sql;dur=([\d.]+);desc="(\d+) statements"', res.headers["Server-Timing"])
+    assert match
+    assert float(match.group(1)) >= 0
+    assert int(match.group(2)) > 0
+
+    records = [json.loads(r.getMessage()) for r in caplog.records if '"event": "sql_timing"' in r.getMessage()]
+    log = next(r for r in records if r["path"] == "/progress/tasks" and r["method"] == "GET")
+    assert log["blueprint"] == "Tasks"
+    assert log["endpoint"] == "Tasks.TaskListResource"
+    assert log["statements"] == int(match.group(2))
+
+
+def test_server_timing_is_not_emitted_when_sampling_is_disabled(app, system_admin_client, monkeypatch):
+    monkeypatch.setitem(app.config, "SQL_TIMING_SAMPLE_RATE", 0)
+    res = system_admin_client.get("/progress/tasks")
+    assert res.status_code == 200
+    assert "Server-Timing" not in res.headers
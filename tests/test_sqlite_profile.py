@@ -0,0 +1,50 @@
+# tests/test_sqlite_profile.py
+
+import pytest
+from sqlalchemy import text
+
+from app import create_app, db
+from tests.conftest import TestConfig
+
+
+@pytest.fixture(scope="function")
+def file_db_app(tmp_path):
+    """ファイルベースの SQLite を使うアプリ（WAL は :memory: では有効にならないため）"""
+    class FileDBConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'profile.db'}"
+
+    app = create_app(FileDBConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+def test_sqlite_profile_is_applied_on_connect(file_db_app):
+    with db.engine.connect() as conn:
+        def pragma(name):
+            return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+        assert pragma("journal_mode") == "wal"
+        assert pragma("synchronous") == 1  # NORMAL
+        assert pragma("temp_store") == 2  # MEMORY
+        assert pragma("busy_timeout") == 5000
+        assert pragma("cache_size") == -65536
+        assert pragma("foreign_keys") == 1
+
+
+def test_sqlite_profile_rejects_invalid_values(tmp_path):
+    class BrokenConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'broken.db'}"
+        SQLITE_PRAGMAS = {"journal_mode": "WAL; DROP TABLE user"}
+
+    with pytest.raises(ValueError):
+        create_app(BrokenConfig)
+
+
+def test_sqlite_maintenance_command(file_db_app):
+    runner = file_db_app.test_cli_runner()
+    result = runner.invoke(args=["sqlite-maintenance"])
+    assert result.exit_code == 0, result.output
+    assert "wal_checkpoint(TRUNCATE): busy=0" in result.output
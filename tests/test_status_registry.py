@@ -0,0 +1,54 @@
+# tests/test_status_registry.py
+
+from app import db
+from app.constants import StatusEnum, STATUS_LABELS
+from app.models import Status
+from app.status_registry import (
+    get_status_registry,
+    is_valid_status_id,
+    status_id_for,
+    status_label_for,
+)
+
+
+def test_registry_maps_id_enum_and_label(app):
+    registry = get_status_registry()
+    for status_enum in StatusEnum:
+        status_id = registry.id_for(status_enum)
+        assert status_id is not None
+        assert registry.enum_for(status_id) is status_enum
+        assert registry.label_for(status_id) == STATUS_LABELS[status_enum]
+    assert [item["enum"] for item in registry.items()] == [e.value for e in StatusEnum]
+
+
+def test_lookups_do_not_query_once_loaded(app, query_recorder):
+    get_status_registry()
+    with query_recorder() as recorder:
+        assert status_id_for(StatusEnum.COMPLETED) is not None
+        assert is_valid_status_id(status_id_for(StatusEnum.IN_PROGRESS))
+        assert status_label_for(status_id_for(StatusEnum.SAVED)) == "保存"
+    assert recorder.statements == []
+
+
+def test_status_change_commit_reloads_registry(app):
+    before = get_status_registry()
+    status = Status(name="on_hold")
+    db.session.add(status)
+    db.session.commit()
+    try:
+        assert get_status_registry() is not before
+        assert is_valid_status_id(status.id)
+        # StatusEnum に無いステータスは一覧には出さず、名前をラベルとして扱う
+        assert status_label_for(status.id) == "on_hold"
+        assert "on_hold" not in [item["enum"] for item in get_status_registry().items()]
+    finally:
+        db.session.delete(status)
+        db.session.commit()
+    assert not is_valid_status_id(status.id)
+
+
+def test_statuses_endpoint_is_cacheable(client):
+    res = client.get("/progress/tasks/statuses")
+    assert res.status_code == 200
+    assert "max-age=86400" in res.headers["Cache-Control"]
+    assert [item["enum"] for item in res.get_json()] == [e.value for e in StatusEnum]
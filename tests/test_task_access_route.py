@@ -195,4 +195,37 @@ class TestTaskAccessList:
             try:
                 enum_value = TaskAccessLevelEnum(item["access_level"])
             except ValueError:
-                assert False, f"Invalid access_level value: {item['access_level']}"
\ No newline at end of file
+                assert False, f"Invalid access_level value: {item['access_level']}"
+
+class TestPermissionResolver:
+    """PermissionResolver のテスト"""
+
+    def test_level_for_reflects_grants(self, app, task_access_users, setup_task_access):
+        from app import db
+        from app.models import Task, User
+        from app.permissions import PermissionResolver
+
+        task = db.session.get(Task, setup_task_access)
+        for level in ["view", "edit", "full", "owner"]:
+            user = db.session.get(User, task_access_users[level]["id"])
+            resolver = PermissionResolver(user)
+            assert resolver.level_for(task) == TaskAccessLevelEnum(level)
+            assert resolver.has_level(task, TaskAccessLevelEnum.VIEW)
+            assert resolver.has_level(task, TaskAccessLevelEnum.FULL) == (level in ("full", "owner"))
+
+        creator = db.session.get(User, task.created_by)
+        assert PermissionResolver(creator).level_for(task) == TaskAccessLevelEnum.OWNER
+
+    def test_grant_change_is_visible_on_next_request(self, system_admin_client, login_as_user,
+                                                     task_access_users, setup_task_access):
+        task_id = setup_task_access
+        user = task_access_users["view"]
+
+        res = system_admin_client.put(
+            f"/progress/tasks/{task_id}/access_levels",
+            json={"user_access": [{"user_id": user["id"], "access_level": "full"}], "organization_access": []}
+        )
+        assert res.status_code == 200
+
+        client = login_as_user(user["email"], "testpass")
+        assert client.put(f"/progress/tasks/{task_id}", json={"title": "granted"}).status_code == 200
@@ -5,6 +5,7 @@ from datetime import date, datetime
 import pytest
 
 from app.constants import StatusEnum
+from app import db
 from app.models import Objective, Status, Task
 from tests.utils import check_response_message
 
@@ -258,6 +259,200 @@ class TestTaskList:
         data = res.get_json()['tasks']
         assert isinstance(data, list)
 
+    def test_get_tasks_query_count_is_constant(self, system_admin_client, login_as_user,
+                                               systemadmin_user, task_access_users, query_recorder):
+        """タスク件数が増えても一覧取得のクエリ数が一定であること"""
+        user = task_access_users["edit"]
+
+        def create_shared_tasks(count):
+            ids = []
+            for i in range(count):
+                res = system_admin_client.post("/progress/tasks", json={"title": f"Shared {i}"})
+                assert res.status_code == 201
+                task_id = res.get_json()["task"]["id"]
+                res = system_admin_client.put(
+                    f"/progress/tasks/{task_id}/access_levels",
+                    json={"user_access": [{"user_id": user["id"], "access_level": "edit"}],
+                          "organization_access": []}
+                )
+                assert res.status_code == 200
+                ids.append(task_id)
+            return ids
+
+        def list_tasks():
+            client = login_as_user(user["email"], user["password"])
+            with query_recorder() as recorder:
+                res = client.get("/progress/tasks")
+            assert res.status_code == 200
+            return res.get_json()["tasks"], len(recorder.statements)
+
+        created = create_shared_tasks(2)
+        tasks, small_count = list_tasks()
+
+        login_as_user(systemadmin_user["user"]["email"], "adminpass")
+        created += create_shared_tasks(8)
+        tasks, large_count = list_tasks()
+
+        assert large_count == small_count
+        levels = {t["id"]: t["user_access_level"] for t in tasks}
+        assert all(levels[task_id] == "edit" for task_id in created)
+
+    def test_get_tasks_keyset_pagination(self, system_admin_client):
+        """limit/cursor で全件を重複・欠落なく辿れること"""
+        client = system_admin_client
+        for i in range(5):
+            assert client.post("/progress/tasks", json={"title": f"Paged {i}"}).status_code == 201
+
+        full = client.get("/progress/tasks").get_json()
+        assert full["next_cursor"] is None
+        expected_ids = [t["id"] for t in full["tasks"]]
+
+        paged_ids, cursor = [], None
+        while True:
+            url = "/progress/tasks?limit=2" + (f"&cursor={cursor}" if cursor else "")
+            res = client.get(url)
+            assert res.status_code == 200
+            page = res.get_json()
+            assert len(page["tasks"]) <= 2
+            paged_ids += [t["id"] for t in page["tasks"]]
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+
+        assert paged_ids == expected_ids
+
+    def test_get_tasks_with_duplicate_grants(self, system_admin_client, login_as_user, task_access_users, root_org):
+        """同じタスク・主体への付与が複数行あっても、一覧・ページングでタスクが1回ずつ返ること"""
+        user = task_access_users["full"]
+        created = []
+        for i in range(4):
+            res = system_admin_client.post("/progress/tasks", json={"title": f"Duplicate Grant {i}"})
+            assert res.status_code == 201
+            task_id = res.get_json()["task"]["id"]
+            res = system_admin_client.put(f"/progress/tasks/{task_id}/access_levels", json={
+                "user_access": [{"user_id": user["id"], "access_level": "view"}],
+                "organization_access": [
+                    {"organization_id": root_org["id"], "access_level": "view"},
+                    {"organization_id": root_org["id"], "access_level": "edit"},
+                ],
+            })
+            assert res.status_code == 200
+            created.append(task_id)
+
+        client = login_as_user(user["email"], user["password"])
+        tasks = client.get("/progress/tasks").get_json()["tasks"]
+        ids = [t["id"] for t in tasks]
+        assert len(ids) == len(set(ids))
+        levels = {t["id"]: t["user_access_level"] for t in tasks}
+        assert all(levels[task_id] == "edit" for task_id in created)
+
+        paged_ids, cursor = [], None
+        while True:
+            page = client.get("/progress/tasks?limit=2" + (f"&cursor={cursor}" if cursor else "")).get_json()
+            paged_ids += [t["id"] for t in page["tasks"]]
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+        assert paged_ids == ids
+
+    def test_get_tasks_field_projection(self, system_admin_client, created_task):
+        res = system_admin_client.get("/progress/tasks?fields=id,title,status_id")
+        assert res.status_code == 200
+        tasks = res.get_json()["tasks"]
+        assert tasks
+        assert all(set(t) <= {"id", "title", "status_id"} and "id" in t for t in tasks)
+
+    def test_get_tasks_includes_status_and_label(self, system_admin_client):
+        res = system_admin_client.post("/progress/tasks/bulk", json={"tasks": [
+            {"title": "Status Task", "status": "in_progress"},
+        ]})
+        assert res.status_code == 201
+        task_id = res.get_json()["task_ids"][0]
+
+        res = system_admin_client.get("/progress/tasks")
+        assert res.status_code == 200
+        task = next(t for t in res.get_json()["tasks"] if t["id"] == task_id)
+        assert task["status"] == "in_progress"
+        assert task["label"] == "進行中"
+
+    def test_get_tasks_invalid_paging_params(self, system_admin_client):
+        client = system_admin_client
+        assert client.get("/progress/tasks?cursor=not-a-cursor").status_code == 400
+        assert client.get("/progress/tasks?limit=0").status_code == 422
+        assert client.get("/progress/tasks?fields=password_hash").status_code == 422
+
+
+class TestBulkTasks:
+    """タスク一括作成・一括更新のテスト"""
+
+    def test_bulk_create_tasks(self, system_admin_client, query_recorder):
+        client = system_admin_client
+        assert client.post("/progress/tasks", json={"title": "Existing"}).status_code == 201
+
+        items = [{"title": f"Bulk {i}", "due_date": "2025-01-31"} for i in range(20)]
+        items[0]["status"] = "completed"
+        with query_recorder() as recorder:
+            res = client.post("/progress/tasks/bulk", json={"tasks": items})
+        assert res.status_code == 201
+        data = res.get_json()
+        assert data["count"] == 20
+
+        # 既存の表示順は書き換えない（先頭より前のランクを割り当てる）
+        assert not [s for s in recorder.statements if s.lstrip().upper().startswith("UPDATE USER_TASK_ORDER")]
+
+        tasks = client.get("/progress/tasks").get_json()["tasks"]
+        assert [t["title"] for t in tasks[:21]] == [f"Bulk {i}" for i in range(20)] + ["Existing"]
+        completed = db.session.query(Status).filter_by(name=StatusEnum.COMPLETED.value).first()
+        assert db.session.get(Task, data["task_ids"][0]).status_id == completed.id
+
+    def test_bulk_create_rejects_invalid_items(self, system_admin_client):
+        client = system_admin_client
+        assert client.post("/progress/tasks/bulk", json={"tasks": []}).status_code == 422
+        assert client.post("/progress/tasks/bulk", json={"tasks": [{"description": "no title"}]}).status_code == 422
+
+        before = Task.query.count()
+        res = client.post("/progress/tasks/bulk", json={"tasks": [
+            {"title": "ok"}, {"title": "ng", "due_date": "2025/01/31"}
+        ]})
+        assert res.status_code == 400
+        assert Task.query.count() == before
+
+    def test_bulk_update_tasks(self, system_admin_client):
+        client = system_admin_client
+        task_ids = client.post("/progress/tasks/bulk", json={
+            "tasks": [{"title": "Before A"}, {"title": "Before B"}]
+        }).get_json()["task_ids"]
+
+        res = client.patch("/progress/tasks/bulk", json={"tasks": [
+            {"id": task_ids[0], "title": "After A", "due_date": "2025-02-01"},
+            {"id": task_ids[1], "status": "in_progress"},
+        ]})
+        assert res.status_code == 200
+        assert res.get_json()["task_ids"] == task_ids
+
+        db.session.expire_all()
+        first, second = db.session.get(Task, task_ids[0]), db.session.get(Task, task_ids[1])
+        assert first.title == "After A"
+        assert first.due_date == date(2025, 2, 1)
+        assert second.title == "Before B"
+        in_progress = db.session.query(Status).filter_by(name=StatusEnum.IN_PROGRESS.value).first()
+        assert second.status_id == in_progress.id
+
+    def test_bulk_update_requires_existing_tasks_and_permission(self, system_admin_client, login_as_user,
+                                                                task_access_users):
+        client = system_admin_client
+        task_id = client.post("/progress/tasks/bulk", json={"tasks": [{"title": "Guarded"}]}).get_json()["task_ids"][0]
+
+        res = client.patch("/progress/tasks/bulk", json={"tasks": [{"id": task_id}, {"id": 999999}]})
+        assert res.status_code == 404
+        res = client.patch("/progress/tasks/bulk", json={"tasks": [{"id": task_id}, {"id": task_id}]})
+        assert res.status_code == 422
+
+        user = task_access_users["view"]
+        client = login_as_user(user["email"], user["password"])
+        res = client.patch("/progress/tasks/bulk", json={"tasks": [{"id": task_id, "title": "Hijacked"}]})
+        assert res.status_code == 403
+
 
 class TestObjectiveOrder:
     """オブジェクティブ順序更新のテスト"""
@@ -0,0 +1,234 @@
+# tests/test_task_export_route.py
+
+import datetime
+
+import pytest
+import yaml
+
+from app import db
+from app.models import ProgressUpdate
+
+
+@pytest.fixture(scope="function")
+def add_exportable_task(system_admin_client, systemadmin_user):
+    """オブジェクティブと進捗を持つタスクを作成する"""
+    def _add(title, objective_count=2, progress_count=2):
+        res = system_admin_client.post("/progress/tasks", json={"title": title, "due_date": "2025-03-31"})
+        assert res.status_code == 201
+        task_id = res.get_json()["task"]["id"]
+        for i in range(objective_count):
+            res = system_admin_client.post("/progress/objectives", json={"task_id": task_id, "title": f"{title}-obj{i}"})
+            assert res.status_code == 201
+            objective_id = res.get_json()["objective"]["id"]
+            for j in range(progress_count):
+                db.session.add(ProgressUpdate(
+                    objective_id=objective_id,
+                    status_id=1,
+                    detail=f"{title}-obj{i}-progress{j}",
+                    report_date=datetime.date(2025, 1, j + 1),
+                    updated_by=systemadmin_user["user"]["id"],
+                ))
+        db.session.commit()
+        return task_id
+    return _add
+
+
+def test_export_yaml_contains_nested_data(system_admin_client, add_exportable_task):
+    add_exportable_task("ExportTask")
+    res = system_admin_client.get("/progress/exports/yaml")
+    assert res.status_code == 200
+
+    data = yaml.safe_load(res.get_json()["yaml"])
+    task = next(t for t in data if t["タスク名"] == "ExportTask")
+    assert task["作成者"] == "SystemAdmin"
+    assert [o["オブジェクティブ名"] for o in task["objectives"]] == ["ExportTask-obj0", "ExportTask-obj1"]
+    assert [p["内容"] for p in task["objectives"][0]["progresses"]] == [
+        "ExportTask-obj0-progress0", "ExportTask-obj0-progress1"
+    ]
+    assert task["objectives"][0]["progresses"][0]["報告者"] == "SystemAdmin"
+
+
+def test_export_yaml_query_count_is_constant(system_admin_client, add_exportable_task, query_recorder):
+    """タスク・オブジェクティブ・進捗が増えてもエクスポートのクエリ数が一定であること"""
+    add_exportable_task("ExportSmall", objective_count=1, progress_count=1)
+    with query_recorder() as small:
+        assert system_admin_client.get("/progress/exports/yaml").status_code == 200
+
+    for i in range(3):
+        add_exportable_task(f"ExportLarge{i}", objective_count=3, progress_count=3)
+    with query_recorder() as large:
+        assert system_admin_client.get("/progress/exports/yaml").status_code == 200
+
+    assert len(large.statements) == len(small.statements)
+
+
+def test_export_excel_streams_styled_workbook(system_admin_client, add_exportable_task):
+    import io
+    from openpyxl import load_workbook
+
+    add_exportable_task("ExcelTask", objective_count=1, progress_count=3)
+    res = system_admin_client.get("/progress/exports/excel")
+    assert res.status_code == 200
+    assert res.mimetype == "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+    worksheet = load_workbook(io.BytesIO(res.data))["Tasks"]
+    assert worksheet.column_dimensions["A"].hidden
+    rows = list(worksheet.iter_rows(values_only=True))
+    assert rows[0][0] == "user"
+
+    task_row = next(i for i, row in enumerate(rows, start=1) if row[1] and str(row[1]).startswith("ExcelTask"))
+    assert worksheet.cell(row=task_row, column=2).font.bold
+    header = worksheet.cell(row=task_row + 1, column=2)
+    assert header.value == "オブジェクティブ名"
+    assert header.fill.start_color.rgb.endswith("F2F2F2")
+    objective = worksheet.cell(row=task_row + 2, column=2)
+    assert objective.value == "ExcelTask-obj0"
+    assert objective.border.left.style == "thin"
+    assert [worksheet.cell(row=task_row + 2 + i, column=6).value for i in range(3)] == [
+        f"ExcelTask-obj0-progress{i}" for i in range(3)
+    ]
+
+
+@pytest.fixture(scope="function")
+def eager_celery(eager_celery, app, tmp_path, monkeypatch):
+    """conftest の eager_celery に加え、成果物の保存先を一時ディレクトリにする"""
+    monkeypatch.setitem(app.config, "EXPORT_STORAGE_DIR", str(tmp_path))
+    return eager_celery
+
+
+@pytest.mark.parametrize("export_format, mimetype", [
+    ("csv", "text/csv"),
+    ("yaml", "application/x-yaml"),
+    ("excel", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+])
+def test_export_job_produces_downloadable_artifact(system_admin_client, add_exportable_task, eager_celery,
+                                                   export_format, mimetype):
+    add_exportable_task(f"JobTask-{export_format}", objective_count=1, progress_count=2)
+
+    res = system_admin_client.post("/progress/exports/jobs", json={"format": export_format})
+    assert res.status_code == 202
+    job_id = res.get_json()["job_id"]
+
+    res = system_admin_client.get(f"/progress/exports/jobs/{job_id}")
+    assert res.status_code == 200
+    job = res.get_json()
+    assert job["status"] == "success"
+    assert job["format"] == export_format
+
+    res = system_admin_client.get(job["download_url"])
+    assert res.status_code == 200
+    assert res.mimetype == mimetype
+    if export_format == "csv":
+        assert f"JobTask-{export_format}".encode("utf-8") in res.data
+
+
+def test_export_job_is_not_visible_to_other_users(app, system_admin_client, login_as_user, task_access_users,
+                                                  eager_celery):
+    res = system_admin_client.post("/progress/exports/jobs", json={"format": "csv"})
+    job_id = res.get_json()["job_id"]
+
+    client = login_as_user(task_access_users["view"]["email"], "testpass")
+    assert client.get(f"/progress/exports/jobs/{job_id}").status_code == 404
+    assert client.get(f"/progress/exports/jobs/{job_id}/download").status_code == 404
+
+
+def test_pending_export_job_is_not_visible_to_other_users(system_admin_client, login_as_user, task_access_users,
+                                                          systemadmin_user, eager_celery, monkeypatch):
+    from app.services import export_job_service
+
+    # ワーカーが取り出す前（PENDING）の状態を再現する
+    monkeypatch.setattr(export_job_service.run_task_export, "apply_async", lambda *args, **kwargs: None)
+    job_id = system_admin_client.post("/progress/exports/jobs", json={"format": "csv"}).get_json()["job_id"]
+
+    client = login_as_user(task_access_users["view"]["email"], "testpass")
+    assert client.get(f"/progress/exports/jobs/{job_id}").status_code == 404
+
+    client = login_as_user(systemadmin_user["user"]["email"], "adminpass")
+    res = client.get(f"/progress/exports/jobs/{job_id}")
+    assert res.status_code == 200
+    assert res.get_json()["status"] == "processing"
+
+
+def test_cleanup_exports_removes_expired_jobs(app, system_admin_client, add_exportable_task, eager_celery):
+    add_exportable_task("CleanupTask", objective_count=1, progress_count=1)
+    job_id = system_admin_client.post("/progress/exports/jobs", json={"format": "csv"}).get_json()["job_id"]
+    assert system_admin_client.get(f"/progress/exports/jobs/{job_id}/download").status_code == 200
+
+    runner = app.test_cli_runner()
+    result = runner.invoke(args=["cleanup-exports"])
+    assert result.exit_code == 0, result.output
+    assert system_admin_client.get(f"/progress/exports/jobs/{job_id}").status_code == 200
+
+    result = runner.invoke(args=["cleanup-exports", "--max-age", "-1"])
+    assert result.exit_code == 0, result.output
+    assert system_admin_client.get(f"/progress/exports/jobs/{job_id}").status_code == 404
+    assert system_admin_client.get(f"/progress/exports/jobs/{job_id}/download").status_code == 404
+
+
+def test_export_job_rejects_unknown_format(system_admin_client):
+    res = system_admin_client.post("/progress/exports/jobs", json={"format": "pdf"})
+    assert res.status_code == 422
+
+
+def test_export_stream_ndjson_yields_one_line_per_task(system_admin_client, add_exportable_task):
+    import json
+
+    add_exportable_task("StreamTaskA", objective_count=1, progress_count=1)
+    add_exportable_task("StreamTaskB", objective_count=2, progress_count=0)
+    res = system_admin_client.get("/progress/exports/stream")
+    assert res.status_code == 200
+    assert res.mimetype == "application/x-ndjson"
+    assert res.is_streamed
+
+    lines = [json.loads(line) for line in res.get_data(as_text=True).splitlines()]
+    by_title = {line["タスク名"]: line for line in lines}
+    assert by_title["StreamTaskA"]["objectives"][0]["progresses"][0]["内容"] == "StreamTaskA-obj0-progress0"
+    assert len(by_title["StreamTaskB"]["objectives"]) == 2
+
+
+def test_export_stream_yaml_is_multi_document(system_admin_client, add_exportable_task):
+    add_exportable_task("StreamYamlTask", objective_count=1, progress_count=1)
+    res = system_admin_client.get("/progress/exports/stream?format=yaml")
+    assert res.status_code == 200
+    assert res.mimetype == "application/x-yaml"
+
+    documents = list(yaml.safe_load_all(res.get_data(as_text=True)))
+    yaml_from_api = yaml.safe_load(system_admin_client.get("/progress/exports/yaml").get_json()["yaml"])
+    assert documents == yaml_from_api
+
+
+def test_export_rows_are_loaded_per_task_chunk(system_admin_client, systemadmin_user, add_exportable_task):
+    """配下データをタスクのチャンク単位・列の値のみで読み込んでも、出力が変わらないこと"""
+    from app.models import Objective
+    from app.services.task_export_service import TaskDataExporter
+
+    for i in range(3):
+        add_exportable_task(f"ChunkTask{i}", objective_count=2, progress_count=2)
+    user_id = systemadmin_user["user"]["id"]
+    db.session.expunge_all()
+
+    chunked = TaskDataExporter(user_id, db, chunk_size=1)
+    assert max(len(dataset.tasks) for dataset in chunked.iter_datasets()) == 1
+    assert list(chunked.iter_flat_rows_for_excel()) == list(TaskDataExporter(user_id, db).iter_flat_rows_for_excel())
+    assert list(chunked.iter_csv_rows()) == list(TaskDataExporter(user_id, db).iter_csv_rows())
+    assert not [obj for obj in db.session.identity_map.values() if isinstance(obj, (Objective, ProgressUpdate))]
+
+
+def test_export_stream_yields_before_later_chunks_are_loaded(system_admin_client, systemadmin_user,
+                                                             add_exportable_task, query_recorder):
+    """逐次エクスポートは最初のチャンクを読み込んだ時点で1件目を返し、後続チャンクはその後に読み込むこと"""
+    from app.services.task_export_service import TaskDataExporter
+
+    for i in range(3):
+        add_exportable_task(f"LazyStream{i}", objective_count=1, progress_count=1)
+    exporter = TaskDataExporter(systemadmin_user["user"]["id"], db, chunk_size=1)
+
+    lines = exporter.iter_ndjson_lines()
+    with query_recorder() as first:
+        next(lines)
+    with query_recorder() as rest:
+        remaining = list(lines)
+
+    assert len(remaining) >= 3
+    assert sum("FROM objective" in s for s in first.statements) == 1
+    assert sum("FROM objective" in s for s in rest.statements) == len(remaining)
@@ -2,6 +2,8 @@ import uuid
 
 import pytest
 
+from app import db
+from app.models import UserTaskOrder
 from tests.utils import check_response_message
 
 @pytest.fixture(scope="function")
@@ -74,3 +76,102 @@ class TestTaskOrderRoutes:
         res = client.post(f"/progress/task_orders", json={"task_ids": [t["id"] for t in order_user_tasks], "user_id": user_id})
         assert res.status_code == 401
 
+
+    def test_get_task_order_query_budget(self, order_user_client, order_user_tasks, order_user, query_budget):
+        """タスク数に関わらず並び順取得で N+1 が発生しないこと"""
+        with query_budget(max_statements=4):
+            res = order_user_client.get(f"/progress/task_orders?user_id={order_user['id']}")
+        assert res.status_code == 200
+        assert [item["title"] for item in res.get_json()] == [t["title"] for t in reversed(order_user_tasks)]
+
+
+def _order_ids(client, user_id):
+    res = client.get(f"/progress/task_orders?user_id={user_id}")
+    assert res.status_code == 200
+    return [item["task_id"] for item in res.get_json()]
+
+
+def _ranks(user_id):
+    db.session.expire_all()
+    return [
+        rank for rank, in db.session.query(UserTaskOrder.display_order)
+        .filter_by(user_id=user_id).order_by(UserTaskOrder.display_order)
+    ]
+
+
+class TestTaskOrderMove:
+    def test_move_between_writes_single_row(self, order_user_client, order_user_tasks, order_user, query_recorder):
+        first, second, third = _order_ids(order_user_client, order_user["id"])
+        with query_recorder() as recorder:
+            res = order_user_client.post("/progress/task_orders/move", json={
+                "task_id": third, "prev_task_id": first, "next_task_id": second,
+            })
+        assert res.status_code == 200
+        assert res.get_json()["message"] == "タスクを移動しました"
+        writes = [s for s in recorder.statements if s.lstrip().upper().startswith(("UPDATE", "INSERT", "DELETE"))]
+        # 並び順の書き込みは移動したタスクの1行のみ（残りは一覧の ETag 用バージョンの加算）
+        assert [s for s in writes if "user_task_order" in s] == writes[:1]
+        assert all("view_version" in s for s in writes[1:])
+        assert _order_ids(order_user_client, order_user["id"]) == [first, third, second]
+
+    def test_move_to_top_and_bottom(self, order_user_client, order_user_tasks, order_user):
+        first, second, third = _order_ids(order_user_client, order_user["id"])
+        res = order_user_client.post("/progress/task_orders/move", json={"task_id": third, "next_task_id": first})
+        assert res.status_code == 200
+        assert _order_ids(order_user_client, order_user["id"]) == [third, first, second]
+
+        res = order_user_client.post("/progress/task_orders/move", json={"task_id": third, "prev_task_id": second})
+        assert res.status_code == 200
+        assert _order_ids(order_user_client, order_user["id"]) == [first, second, third]
+
+        # 一覧（GET /tasks）も同じ並び（他のテストで作成されたタスクは除く）
+        tasks = order_user_client.get("/progress/tasks").get_json()["tasks"]
+        assert [t["id"] for t in tasks if t["id"] in (first, second, third)] == [first, second, third]
+
+    def test_move_invalid_requests(self, order_user_client, order_user_tasks, order_user):
+        first, second, third = _order_ids(order_user_client, order_user["id"])
+        assert order_user_client.post("/progress/task_orders/move", json={"task_id": first}).status_code == 400
+        assert order_user_client.post("/progress/task_orders/move", json={
+            "task_id": first, "prev_task_id": first,
+        }).status_code == 400
+        assert order_user_client.post("/progress/task_orders/move", json={
+            "task_id": first, "prev_task_id": third, "next_task_id": second,
+        }).status_code == 400
+        assert order_user_client.post("/progress/task_orders/move", json={
+            "task_id": first, "prev_task_id": 999999,
+        }).status_code == 404
+
+    def test_repeated_moves_keep_order(self, order_user_client, order_user_tasks, order_user):
+        """同じ位置への移動を繰り返してもランクの間に挿入でき、並びが崩れないこと"""
+        first, second, third = _order_ids(order_user_client, order_user["id"])
+        for _ in range(30):
+            res = order_user_client.post("/progress/task_orders/move", json={"task_id": third, "next_task_id": first})
+            assert res.status_code == 200
+            res = order_user_client.post("/progress/task_orders/move", json={"task_id": first, "next_task_id": third})
+            assert res.status_code == 200
+        assert _order_ids(order_user_client, order_user["id"]) == [first, third, second]
+
+    def test_long_rank_triggers_rebalance(self, app, order_user_client, order_user_tasks, order_user,
+                                          eager_celery, monkeypatch):
+        monkeypatch.setitem(app.config, "TASK_RANK_REBALANCE_LENGTH", 1)
+        first, second, third = _order_ids(order_user_client, order_user["id"])
+        for _ in range(3):
+            res = order_user_client.post("/progress/task_orders/move", json={"task_id": third, "next_task_id": second})
+            assert res.status_code == 200
+            res = order_user_client.post("/progress/task_orders/move", json={"task_id": second, "next_task_id": third})
+            assert res.status_code == 200
+
+        assert _order_ids(order_user_client, order_user["id"]) == [first, second, third]
+        assert len({len(rank) for rank in _ranks(order_user["id"])}) == 1
+
+    def test_rebalance_command(self, app, order_user_client, order_user_tasks, order_user):
+        for _ in range(20):
+            first, second, third = _order_ids(order_user_client, order_user["id"])
+            order_user_client.post("/progress/task_orders/move", json={"task_id": third, "next_task_id": first})
+        before = _order_ids(order_user_client, order_user["id"])
+        assert max(len(rank) for rank in _ranks(order_user["id"])) > 2
+
+        result = app.test_cli_runner().invoke(args=["rebalance-task-ranks", "--min-length", "2"])
+        assert result.exit_code == 0, result.output
+        assert _order_ids(order_user_client, order_user["id"]) == before
+        assert max(len(rank) for rank in _ranks(order_user["id"])) <= 2
@@ -141,6 +141,19 @@ class TestUserRetrieval:
         users = res.get_json()
         assert isinstance(users, list)
 
+    def test_get_users_query_budget(self, login_as_user, system_related_users, root_org, query_budget):
+        """ユーザー数に関わらず一覧取得で access_scopes 等の N+1 が発生しないこと"""
+        system_admin = system_related_users['system_admin']
+        client = login_as_user(system_admin['email'], system_admin['password'])
+        with query_budget(max_statements=8):
+            res_list = client.get('/progress/users')
+            res_tree = client.get(f'/progress/users/by-org-tree/{root_org["id"]}')
+        assert res_list.status_code == 200
+        assert res_tree.status_code == 200
+        users = res_list.get_json()
+        assert len(users) >= 3
+        assert all('access_scopes' in u for u in users)
+
 class TestUserModification:
     """ユーザー更新・削除に関するテスト"""
     
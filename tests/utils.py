@@ -1,5 +1,12 @@
+import re
+from collections import Counter
+from contextlib import contextmanager
 from typing import Optional
 
+import pytest
+from flask import request, request_finished, request_started
+from sqlalchemy import event
+
 def check_response_message(expected: str, response: dict, key: Optional[str] = None) -> bool:
     """
     エラーレスポンス内に期待する文字列が含まれているかチェックする関数
@@ -29,3 +36,96 @@ def check_response_message(expected: str, response: dict, key: Optional[str] = N
             if expected in value:
                 return True
     return False
+
+
+_IN_LIST = re.compile(r"\(\s*(?:\?|%s|:\w+)(?:\s*,\s*(?:\?|%s|:\w+))*\s*\)")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    SQL文から値・IN句の要素数の違いを取り除いた「形」を返す（同形クエリの繰り返し検出用）
+    """
+    shape = _IN_LIST.sub("(?)", statement)
+    shape = _STRING_LITERAL.sub("?", shape)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    return " ".join(shape.split())
+
+
+class RequestQueryRecorder:
+    """
+    ブロック内で発行されたSQL文を記録する
+
+    statements にはブロック内のすべてのSQL文（リクエスト外のサービス呼び出しを含む）、
+    requests にはテストクライアントのリクエストごとのSQL文が入る。
+
+    :param app: 対象の Flask アプリ
+    :param engine: 対象の SQLAlchemy Engine
+    """
+
+    def __init__(self, app, engine):
+        self.app = app
+        self.engine = engine
+        self.statements = []
+        self.requests = []
+        self._current = None
+
+    def __enter__(self):
+        request_started.connect(self._on_request_started, self.app)
+        request_finished.connect(self._on_request_finished, self.app)
+        event.listen(self.engine, "before_cursor_execute", self._before_cursor_execute)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, "before_cursor_execute", self._before_cursor_execute)
+        request_finished.disconnect(self._on_request_finished, self.app)
+        request_started.disconnect(self._on_request_started, self.app)
+        self._current = None
+
+    def _on_request_started(self, sender, **extra):
+        self._current = {"request": f"{request.method} {request.path}", "statements": []}
+        self.requests.append(self._current)
+
+    def _on_request_finished(self, sender, **extra):
+        self._current = None
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+        if self._current is not None:
+            self._current["statements"].append(statement)
+
+    def violations(self, max_statements=None, max_repeats=None):
+        """
+        予算超過したリクエストの説明を返す
+
+        :param max_statements: 1リクエストあたりのSQL文の上限
+        :param max_repeats: 同形SQL文の1リクエスト内での出現回数の上限（N+1 検出）
+        """
+        problems = []
+        for recorded in self.requests:
+            statements = recorded["statements"]
+            if max_statements is not None and len(statements) > max_statements:
+                problems.append(
+                    f"{recorded['request']}: {len(statements)} statements (budget {max_statements})"
+                )
+            if max_repeats is not None:
+                for shape, count in Counter(map(statement_shape, statements)).items():
+                    if count > max_repeats:
+                        problems.append(
+                            f"{recorded['request']}: repeated {count} times (budget {max_repeats}): {shape}"
+                        )
+        return problems
+
+
+@contextmanager
+def assert_query_budget(app, engine, max_statements=None, max_repeats=1):
+    """
+    ブロック内のテストクライアントのリクエストごとにSQL発行数を検査し、
+    上限超過または同形SQL文の繰り返し（N+1）があればテストを失敗させる
+    """
+    with RequestQueryRecorder(app, engine) as recorder:
+        yield recorder
+    problems = recorder.violations(max_statements, max_repeats)
+    if problems:
+        pytest.fail("query budget exceeded:\n" + "\n".join(problems), pytrace=False)